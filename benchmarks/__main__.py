@@ -0,0 +1,81 @@
+"""Benchmark command line: ``python -m benchmarks <command>``
+
+- ``run``: time the suite on synthetic data and append the run to the history
+- ``compare``: compare two runs of the history and flag regressions
+- ``list``: show the benchmarks and dataset sizes
+
+Cold-start times are checked separately by ``python -m benchmarks.startup``.
+"""
+import argparse
+import sys
+
+from benchmarks import synthetic
+from benchmarks.suite import (BENCHMARKS, DEFAULT_HISTORY_PATH, DEFAULT_THRESHOLD, append_history,
+                              compare_runs, load_history, run_suite)
+
+
+def cmd_run(args):
+    results = run_suite(args.size, args.only, args.repeat)
+    if not args.no_save:
+        run = append_history(results, args.history, args.label)
+        print(f"Saved run {len(load_history(args.history))} ({run['commit']}) to {args.history}")
+    return 0
+
+
+def cmd_compare(args):
+    history = load_history(args.history)
+    if len(history) < 2:
+        print(f"Need at least two runs in {args.history} to compare", file=sys.stderr)
+        return 1
+    base, head = history[args.base], history[args.head]
+    rows = compare_runs(base, head, args.threshold)
+    print(f"base: {base['timestamp']} ({base['commit']})  head: {head['timestamp']} ({head['commit']})")
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else (
+            'faster' if row['time_ratio'] < 1 - args.threshold else '')
+        print(f"{row['benchmark']:<20} {row['size']:<7} {row['base_s'] * 1000:10.1f} ms -> "
+              f"{row['head_s'] * 1000:10.1f} ms  time x{row['time_ratio']:.2f}  "
+              f"memory x{row['mem_ratio']:.2f}  {flag}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+def cmd_list(args):
+    for name, spec in BENCHMARKS.items():
+        cap = f" (at most {spec['max_series']:,} series)" if spec['max_series'] else ''
+        print(f"{name}{cap}")
+    for size, params in synthetic.SIZES.items():
+        print(f"{size}: {params}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Performance benchmarks on synthetic data")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Run benchmarks and record the results")
+    run.add_argument('--size', nargs='+', default=['small', 'medium'], choices=list(synthetic.SIZES))
+    run.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Benchmarks to run")
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--history', default=DEFAULT_HISTORY_PATH)
+    run.add_argument('--label', help="Note stored with the run")
+    run.add_argument('--no-save', action='store_true', help="Don't write to the history")
+    run.set_defaults(handler=cmd_run)
+
+    compare = commands.add_parser('compare', help="Flag regressions between two recorded runs")
+    compare.add_argument('--base', type=int, default=-2, help="Run index (default: second latest)")
+    compare.add_argument('--head', type=int, default=-1, help="Run index (default: latest)")
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                         help="Relative slowdown or memory growth that counts as a regression")
+    compare.add_argument('--history', default=DEFAULT_HISTORY_PATH)
+    compare.set_defaults(handler=cmd_compare)
+
+    listing = commands.add_parser('list', help="Show benchmarks and sizes")
+    listing.set_defaults(handler=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Cold-start benchmark: import and CLI times in fresh interpreters
+
+Each case runs ``--repeat`` times in a new Python process from the repo root
+and its median wall time is compared to a budget in seconds. Budgets are
+for a typical laptop; ``--scale`` loosens or tightens all of them for slower
+or faster machines. Also checks that the lightweight paths do not pull in
+the heavy libraries. Exits non-zero when a case is over budget.
+
+    python -m benchmarks.startup
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay out of the lightweight startup paths
+HEAVY_MODULES = ('sklearn', 'statsmodels', 'scipy', 'matplotlib', 'plotly', 'streamlit')
+
+# (name, interpreter arguments, budget in seconds)
+CASES = [
+    ('interpreter', ['-c', 'pass'], 0.1),
+    ('cli_help', ['-m', 'src', '--help'], 0.3),
+    ('import_forecasting', ['-c', 'import src.forecasting'], 1.5),
+    ('import_model_registry', ['-c', 'import src.model_registry'], 1.5),
+    ('cli_forecast', ['-m', 'src', 'forecast', '--registry', '{registry}', '--years', '2025',
+                      '2026', '2027'], 2.0),
+]
+
+# Entry points that must not import HEAVY_MODULES
+LIGHT_IMPORTS = ['src', 'src.forecasting', 'src.model_registry', 'src.data_store']
+
+
+def _run(args, registry):
+    command = [sys.executable] + [arg.format(registry=registry) for arg in args]
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def _heavy_imports(module):
+    """Heavy modules loaded by importing ``module`` in a fresh interpreter"""
+    script = (f"import sys, {module}\n"
+              f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout.strip()
+    return [name for name in out.split(',') if name]
+
+
+def _build_registry(root, n_series=10_000):
+    """Registry with a linear fit of synthetic series for the forecast case"""
+    script = (
+        "import numpy as np, pandas as pd\n"
+        "from src.forecasting import FinancialInclusionForecaster\n"
+        "from src.model_registry import ModelRegistry\n"
+        f"n = {n_series}\n"
+        "rng = np.random.default_rng(0)\n"
+        "years = np.tile([2011, 2014, 2017, 2021, 2024], n)\n"
+        "data = pd.DataFrame({'indicator_code': np.repeat([f'SYN_{i:05d}' for i in range(n)], 5),\n"
+        "                     'year': years, 'value_numeric': rng.uniform(0, 90, len(years))})\n"
+        "forecaster = FinancialInclusionForecaster()\n"
+        "forecaster.fit_batch(data, time_col='year')\n"
+        f"ModelRegistry({root!r}).save(forecaster)\n"
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True)
+
+
+def run(repeat=5, scale=1.0):
+    """Median time and budget of every case, plus heavy-import violations"""
+    results = []
+    with tempfile.TemporaryDirectory() as registry:
+        _build_registry(registry)
+        for name, args, budget in CASES:
+            _run(args, registry)  # warm the OS file cache
+            times = [_run(args, registry) for _ in range(repeat)]
+            results.append({'case': name, 'median': statistics.median(times),
+                            'budget': budget * scale})
+    violations = {module: heavy for module in LIGHT_IMPORTS
+                  if (heavy := _heavy_imports(module))}
+    return results, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply every budget")
+    args = parser.parse_args(argv)
+
+    results, violations = run(args.repeat, args.scale)
+    failed = False
+    for result in results:
+        over = result['median'] > result['budget']
+        failed |= over
+        print(f"{result['case']:<24} {result['median'] * 1000:8.0f} ms  "
+              f"(budget {result['budget'] * 1000:.0f} ms){'  OVER BUDGET' if over else ''}")
+    for module, heavy in violations.items():
+        failed = True
+        print(f"import {module} loads {', '.join(heavy)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""Benchmark definitions, runner, JSON history and regression comparison
+
+Each benchmark is a setup function registered with ``@benchmark``. It gets
+the synthetic dataset for one size and a scratch directory, does its
+untimed preparation and returns the callable to time. Benchmarks wrapping
+per-series Python APIs set ``max_series`` so the large sizes stay tractable;
+the series count actually used is recorded with each result.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks import synthetic
+
+DEFAULT_HISTORY_PATH = 'benchmarks/history.json'
+DEFAULT_THRESHOLD = 0.2
+# Changes smaller than these are noise, whatever the ratio
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+FORECAST_YEARS = [2025, 2026, 2027]
+
+BENCHMARKS = {}
+
+
+def benchmark(name, max_series=None):
+    """Register a benchmark setup function"""
+    def register(setup):
+        BENCHMARKS[name] = {'setup': setup, 'max_series': max_series}
+        return setup
+    return register
+
+
+def _fitted_batch(data):
+    from src.forecasting import FinancialInclusionForecaster
+
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(synthetic.observations(data))
+    return forecaster
+
+
+@benchmark('fit_trend_model', max_series=200)
+def bench_fit_trend_model(data, workdir):
+    from src.forecasting import FinancialInclusionForecaster
+
+    wide = synthetic.wide_history(data)
+    codes = list(wide.columns[1:])
+
+    def run():
+        forecaster = FinancialInclusionForecaster()
+        for code in codes:
+            forecaster.fit_trend_model(wide, code)
+    return run
+
+
+@benchmark('forecast', max_series=200)
+def bench_forecast(data, workdir):
+    from src.forecasting import FinancialInclusionForecaster
+
+    wide = synthetic.wide_history(data)
+    codes = list(wide.columns[1:])
+    forecaster = FinancialInclusionForecaster()
+    for code in codes:
+        forecaster.fit_trend_model(wide, code)
+
+    def run():
+        for code in codes:
+            forecaster.forecast(code, FORECAST_YEARS)
+    return run
+
+
+@benchmark('fit_batch')
+def bench_fit_batch(data, workdir):
+    from src.forecasting import FinancialInclusionForecaster
+
+    obs = synthetic.observations(data)
+    return lambda: FinancialInclusionForecaster().fit_batch(obs)
+
+
+@benchmark('forecast_intervals')
+def bench_forecast_intervals(data, workdir):
+    forecaster = _fitted_batch(data)
+    return lambda: forecaster.forecast_intervals(FORECAST_YEARS)
+
+
+@benchmark('apply_impacts')
+def bench_apply_impacts(data, workdir):
+    baseline = _fitted_batch(data).forecast_batch(FORECAST_YEARS).T
+    model = synthetic.impact_model(data)
+    events = list(model.events)
+    return lambda: model.apply_impacts(baseline, events, None)
+
+
+@benchmark('create_scenarios')
+def bench_create_scenarios(data, workdir):
+    forecaster = _fitted_batch(data)
+    baseline = forecaster.forecast_batch(FORECAST_YEARS).T
+    model = synthetic.impact_model(data)
+    events = list(model.events)
+    return lambda: forecaster.create_scenarios(baseline, model, events)
+
+
+@benchmark('load_csv')
+def bench_load_csv(data, workdir):
+    from src.data_store import load_store
+
+    path = os.path.join(workdir, 'unified.csv')
+    data.to_csv(path, index=False)
+    return lambda: load_store(path, use_cache=False)
+
+
+@benchmark('load_csv_cached')
+def bench_load_csv_cached(data, workdir):
+    from src.data_store import load_store
+
+    path = os.path.join(workdir, 'unified.csv')
+    cache_dir = os.path.join(workdir, 'cache')
+    data.to_csv(path, index=False)
+    load_store(path, cache_dir=cache_dir)
+    return lambda: load_store(path, cache_dir=cache_dir)
+
+
+@benchmark('eda_growth', max_series=200)
+def bench_eda_growth(data, workdir):
+    obs = synthetic.observations(data)
+    obs = obs.assign(obs_date=obs['observation_date'].astype('datetime64[ns]'))
+
+    # Period-over-period growth as notebooks/task2_eda.py computes it, per series
+    def run():
+        rows = []
+        for code, series in obs.sort_values('obs_date').groupby('indicator_code'):
+            for i in range(1, len(series)):
+                prev_year = series.iloc[i - 1]['obs_date'].year
+                curr_year = series.iloc[i]['obs_date'].year
+                growth_pp = series.iloc[i]['value_numeric'] - series.iloc[i - 1]['value_numeric']
+                years = curr_year - prev_year
+                rows.append((code, curr_year, growth_pp, growth_pp / years if years > 0 else growth_pp))
+        return rows
+    return run
+
+
+@benchmark('growth_table')
+def bench_growth_table(data, workdir):
+    from src.analytics import growth_table
+
+    obs = synthetic.observations(data)
+    return lambda: growth_table(obs)
+
+
+def measure(fn, repeat=3):
+    """Wall times of ``repeat`` calls after a warm-up call, then peak traced memory of one more"""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+
+def run_suite(sizes=('small', 'medium'), names=None, repeat=3, log=print):
+    """Results of the selected benchmarks at every size"""
+    names = list(BENCHMARKS) if names is None else list(names)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise KeyError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    results = []
+    for size in sizes:
+        params = synthetic.SIZES[size]
+        for name in names:
+            spec = BENCHMARKS[name]
+            case = dict(params)
+            if spec['max_series'] is not None:
+                case['n_series'] = min(case['n_series'], spec['max_series'])
+            data = synthetic.dataset(**case)
+            with tempfile.TemporaryDirectory() as workdir:
+                times, peak = measure(spec['setup'](data, workdir), repeat)
+            result = {'benchmark': name, 'size': size, 'params': case,
+                      'median_s': statistics.median(times), 'min_s': min(times),
+                      'repeat': repeat, 'peak_mb': peak / 2 ** 20}
+            results.append(result)
+            if log is not None:
+                log(f"{name:<20} {size:<7} {result['median_s'] * 1000:10.1f} ms "
+                    f"{result['peak_mb']:9.1f} MB  {case}")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=DEFAULT_HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(results, path=DEFAULT_HISTORY_PATH, label=None):
+    """Add a run to the history file and return the run record"""
+    history = load_history(path)
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'label': label,
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        'results': results,
+    }
+    history.append(run)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(path + '.tmp', path)
+    return run
+
+
+def compare_runs(base, head, threshold=DEFAULT_THRESHOLD):
+    """Per-benchmark time and memory ratios of two runs
+
+    A case regresses when its median time or peak memory grows by more than
+    ``threshold`` (0.2 = 20%) and by more than MIN_TIME_DELTA seconds or
+    MIN_MEMORY_DELTA_MB. Cases missing from either run, or run on different
+    data, are skipped.
+    """
+    base_results = {(r['benchmark'], r['size']): r for r in base['results']}
+    rows = []
+    for result in head['results']:
+        before = base_results.get((result['benchmark'], result['size']))
+        if before is None or before['params'] != result['params']:
+            continue
+        time_ratio = result['median_s'] / before['median_s'] if before['median_s'] else float('inf')
+        mem_ratio = result['peak_mb'] / before['peak_mb'] if before['peak_mb'] else 1.0
+        rows.append({'benchmark': result['benchmark'], 'size': result['size'],
+                     'base_s': before['median_s'], 'head_s': result['median_s'],
+                     'time_ratio': time_ratio, 'mem_ratio': mem_ratio,
+                     'regression': (
+                         (time_ratio > 1 + threshold
+                          and result['median_s'] - before['median_s'] > MIN_TIME_DELTA)
+                         or (mem_ratio > 1 + threshold
+                             and result['peak_mb'] - before['peak_mb'] > MIN_MEMORY_DELTA_MB))})
+    return rows
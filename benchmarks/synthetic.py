@@ -0,0 +1,123 @@
+"""Synthetic unified-schema datasets for benchmarks
+
+Series follow noisy logistic adoption curves in percent, one observation per
+series and year, alongside dated event records, so every module sees data
+shaped like data/processed/ethiopia_fi_enriched.csv at any scale.
+"""
+from functools import lru_cache
+
+import pandas as pd
+import numpy as np
+
+from src.event_impact import IMPACT_PROFILES, EventImpactModel
+
+PILLARS = ['access', 'usage', 'infrastructure']
+UNIFIED_COLUMNS = ['record_type', 'pillar', 'indicator', 'indicator_code', 'value_numeric',
+                   'observation_date', 'source_name', 'source_url', 'confidence',
+                   'original_text', 'collected_by', 'collection_date', 'notes']
+
+# Dataset sizes the suite runs at
+SIZES = {
+    'small': {'n_series': 10, 'n_years': 5, 'n_events': 10},
+    'medium': {'n_series': 1_000, 'n_years': 20, 'n_events': 100},
+    'long': {'n_series': 1_000, 'n_years': 50, 'n_events': 1_000},
+    'large': {'n_series': 100_000, 'n_years': 5, 'n_events': 1_000},
+}
+
+
+def indicator_codes(n_series):
+    return [f'SYN_{i:06d}' for i in range(n_series)]
+
+
+def event_names(n_events):
+    return [f'event_{j:04d}' for j in range(n_events)]
+
+
+@lru_cache(maxsize=4)
+def dataset(n_series, n_years, n_events, end_year=2024, seed=0):
+    """Observation and event records in the unified schema
+
+    Cached per size, so callers must not modify the returned frame.
+    """
+    rng = np.random.default_rng(seed)
+    years = np.arange(end_year - n_years + 1, end_year + 1)
+    codes = np.array(indicator_codes(n_series))
+
+    saturation = rng.uniform(20, 95, n_series)
+    rate = rng.uniform(0.1, 0.6, n_series)
+    midpoint = rng.uniform(years[0], years[-1] + 10, n_series)
+    curve = saturation[:, None] / (1 + np.exp(-rate[:, None] * (years[None, :] - midpoint[:, None])))
+    values = np.clip(curve + rng.normal(0, 1.0, curve.shape), 0, 100).round(2).ravel()
+
+    n_obs = n_series * n_years
+    pillars = np.array(PILLARS)[np.arange(n_series) % len(PILLARS)]
+    observations = pd.DataFrame({
+        'record_type': 'observation',
+        'pillar': np.repeat(pillars, n_years),
+        'indicator': np.repeat(np.char.add('Synthetic indicator ', codes), n_years),
+        'indicator_code': np.repeat(codes, n_years),
+        'value_numeric': values,
+        'observation_date': np.tile(np.char.add(years.astype(str), '-12-31'), n_series),
+        'source_name': 'Synthetic',
+        'source_url': '',
+        'confidence': np.array(['high', 'medium', 'low'])[rng.integers(0, 3, n_obs)],
+        'original_text': '',
+        'collected_by': 'Benchmark',
+        'collection_date': f'{end_year + 1}-01-31',
+        'notes': '',
+    })
+
+    event_years = rng.integers(years[0], end_year + 1, n_events)
+    events = pd.DataFrame({
+        'record_type': 'event',
+        'pillar': None,
+        'indicator': event_names(n_events),
+        'indicator_code': np.char.add('EVT_', np.arange(n_events).astype(str)),
+        'value_numeric': np.nan,
+        'observation_date': [f'{year}-{month:02d}-01' for year, month in
+                             zip(event_years, rng.integers(1, 13, n_events))],
+        'source_name': 'Synthetic',
+        'source_url': '',
+        'confidence': 'high',
+        'original_text': '',
+        'collected_by': 'Benchmark',
+        'collection_date': f'{end_year + 1}-01-31',
+        'notes': '',
+    })
+    return pd.concat([observations, events], ignore_index=True)[UNIFIED_COLUMNS]
+
+
+def observations(data):
+    return data[data['record_type'] == 'observation'].reset_index(drop=True)
+
+
+def wide_history(data):
+    """Observations as one row per year and one column per indicator, as fit_trend_model takes"""
+    obs = observations(data)
+    wide = obs.pivot(index='observation_date', columns='indicator_code', values='value_numeric')
+    wide.insert(0, 'year', wide.index.str[:4].astype(int))
+    return wide.reset_index(drop=True)
+
+
+def impact_model(data, density=0.01, seed=0):
+    """EventImpactModel over the dataset's events and indicators with random sparse impacts
+
+    Each event touches ``density`` of the indicators (at least one) with a
+    random profile.
+    """
+    rng = np.random.default_rng(seed)
+    events = data[data['record_type'] == 'event']
+    names = events['indicator'].tolist()
+    codes = observations(data)['indicator_code'].unique()
+
+    model = EventImpactModel()
+    model.build_impact_matrix(names, codes)
+    per_event = max(1, int(density * len(codes)))
+    rows = np.repeat(names, per_event)
+    cols = codes[rng.integers(0, len(codes), len(rows))]
+    model.set_impacts(rows, cols, rng.normal(0.5, 1.0, len(rows)))
+    model.set_event_dates(dict(zip(names, events['observation_date'])))
+    model.profile_kinds[:] = rng.integers(0, len(IMPACT_PROFILES), len(names))
+    model.profile_lags[:] = rng.integers(0, 3, len(names))
+    model.profile_durations[:] = rng.uniform(1, 4, len(names))
+    return model
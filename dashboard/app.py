@@ -1,9 +1,103 @@
+import os
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from src.artifacts import DEFAULT_ARTIFACT_DIR, load_artifact
+from src.data_cache import DEFAULT_CACHE_DIR
+from src.data_store import DEFAULT_DATA_PATH, load_store
+from src.instrumentation import flush, traced
+from src.query_service import QueryClient, slice_artifact
+from dashboard.downsample import line_figure
+from dashboard.view_cache import ViewCache
+
+# Sidebar indicator names and their codes in the unified dataset
+INDICATOR_CODES = {
+    "Account Ownership": "ACC_OWNERSHIP",
+    "Digital Payment Usage": "USG_DIGITAL_PAYMENT",
+    "Mobile Money Accounts": "ACC_MM_ACCOUNT",
+}
+
+
+@st.cache_resource
+def load_forecast_artifact():
+    """Load the precomputed forecast artifact once per server process"""
+    try:
+        return load_artifact(ROOT / DEFAULT_ARTIFACT_DIR)
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_resource
+def load_data_store():
+    """Load the unified dataset into a FinancialInclusionStore once per server process"""
+    try:
+        return load_store(ROOT / DEFAULT_DATA_PATH, cache_dir=ROOT / DEFAULT_CACHE_DIR)
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_resource
+def get_query_client():
+    """Pooled client for the query service named by FI_QUERY_SERVICE, if any"""
+    url = os.environ.get('FI_QUERY_SERVICE')
+    return QueryClient(url) if url else None
+
+
+def artifact_slice(table, indicators, year_range=None):
+    """Artifact rows for the selected indicators, from the query service when configured"""
+    codes = [INDICATOR_CODES[name] for name in indicators if name in INDICATOR_CODES]
+    start, end = year_range if year_range is not None else (None, None)
+    if query_client is not None:
+        return getattr(query_client, table)(indicators=codes, start=start, end=end)
+    return slice_artifact(artifact, table, codes, start=start, end=end)
+
+
+def artifact_history(indicators):
+    """Historical values from the artifact, one column per selected indicator"""
+    names = {INDICATOR_CODES[name]: name for name in indicators if name in INDICATOR_CODES}
+    sliced = artifact_slice('history', indicators)
+    table = sliced.pivot_table(index='year', columns='indicator_code', values='value_numeric',
+                               observed=True)
+    return table.rename(columns=names).rename_axis(columns=None).reset_index().rename(
+        columns={'year': 'Year'})
+
+
+def store_history(indicators):
+    """Observed values from the unified dataset, one column per selected indicator"""
+    columns = {}
+    for name in indicators:
+        if name in INDICATOR_CODES:
+            series = data_store.series(INDICATOR_CODES[name])
+            columns[name] = series.groupby(series.index.year).last().astype(float)
+    return pd.DataFrame(columns).rename_axis('Year').reset_index()
+
+
+def artifact_forecasts(indicators, year_range):
+    """Forecasts from the artifact in the '<Indicator> <Scenario>' column layout"""
+    names = {INDICATOR_CODES[name]: name for name in indicators if name in INDICATOR_CODES}
+    sliced = artifact_slice('forecasts', indicators, year_range)
+    if sliced.empty:
+        return pd.DataFrame(columns=['Year'])
+    columns = (sliced['indicator_code'].astype(str).map(names) + ' '
+               + sliced['scenario'].astype(str).str.title())
+    table = sliced.assign(column=columns).pivot(index='year', columns='column', values='value')
+    return table.rename_axis(columns=None).reset_index().rename(columns={'year': 'Year'})
+
+
+@st.cache_resource
+def get_view_cache():
+    """Derived frames and figures shared by every session of this server"""
+    return ViewCache(maxsize=256)
+
+
+view_cache = get_view_cache()
 
 st.set_page_config(
     page_title="Ethiopia Financial Inclusion Forecast",
@@ -39,21 +133,63 @@ with st.sidebar:
         ["Account Ownership", "Digital Payment Usage", "Mobile Money Accounts"],
         default=["Account Ownership", "Digital Payment Usage"]
     )
+    
+    # Pick up a rebuilt forecast artifact
+    if st.button("Reload Data"):
+        load_forecast_artifact.clear()
+        load_data_store.clear()
+        view_cache.invalidate()
+        if get_query_client() is not None:
+            try:
+                get_query_client().reload()
+            except (OSError, RuntimeError):
+                pass
 
-# Page 1: Overview
-tab1, tab2, tab3, tab4 = st.tabs(["Overview", "Trends", "Forecasts", "Projections"])
+# A running query service holds one copy of the data for every session;
+# otherwise each server process loads the artifact itself
+query_client = get_query_client()
+manifest = None
+if query_client is not None:
+    try:
+        manifest = query_client.manifest()
+    except (OSError, RuntimeError):
+        query_client = None
+artifact = None if query_client is not None else load_forecast_artifact()
+if artifact is not None:
+    manifest = artifact['manifest']
+data_store = load_data_store()
+view_cache.sync(manifest['version'] if manifest is not None else 'sample')
+
+# Only the selected page is built on each rerun
+page = st.radio(
+    "Page",
+    ["Overview", "Trends", "Forecasts", "Projections"],
+    horizontal=True,
+    label_visibility="collapsed"
+)
 
-with tab1:
+# Page 1: Overview
+@traced('dashboard.overview')
+def overview_page():
     st.header("Key Metrics")
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric(
-            label="Current Account Ownership (2024)",
-            value="49%",
-            delta="+3pp since 2021"
-        )
+        account = (data_store.series('ACC_OWNERSHIP').dropna() if data_store is not None
+                   else pd.Series(dtype=float))
+        if len(account) >= 2:
+            st.metric(
+                label=f"Current Account Ownership ({account.index[-1].year})",
+                value=f"{account.iloc[-1]:g}%",
+                delta=f"{account.iloc[-1] - account.iloc[-2]:+g}pp since {account.index[-2].year}"
+            )
+        else:
+            st.metric(
+                label="Current Account Ownership (2024)",
+                value="49%",
+                delta="+3pp since 2021"
+            )
     
     with col2:
         st.metric(
@@ -78,121 +214,159 @@ with tab1:
     
     # Event timeline
     st.subheader("Key Events Timeline")
-    events_data = pd.DataFrame({
-        'Event': ['Telebirr Launch', 'M-Pesa Entry', 'Interoperability'],
-        'Date': ['2021-05-01', '2023-08-01', '2022-01-01'],
-        'Impact': ['High', 'Medium', 'High']
-    })
     
-    fig = px.timeline(events_data, x_start="Date", y="Event", color="Impact")
-    st.plotly_chart(fig, use_container_width=True)
+    def build_timeline():
+        # plotly.express is slow to import; only load it on a cache miss
+        import plotly.express as px
+
+        events_data = pd.DataFrame({
+            'Event': ['Telebirr Launch', 'M-Pesa Entry', 'Interoperability'],
+            'Date': ['2021-05-01', '2023-08-01', '2022-01-01'],
+            'Impact': ['High', 'Medium', 'High']
+        })
+        return px.timeline(events_data, x_start="Date", y="Event", color="Impact")
+    
+    st.plotly_chart(view_cache.figure('timeline', build_timeline), use_container_width=True)
 
-with tab2:
+@traced('dashboard.trends')
+def trends_page():
     st.header("Historical Trends")
     
-    # Sample historical data
-    historical = pd.DataFrame({
-        'Year': [2011, 2014, 2017, 2021, 2024],
-        'Account Ownership': [14, 22, 35, 46, 49],
-        'Digital Payments': [5, 10, 15, 25, 35],
-        'Mobile Money': [0, 1, 4.7, 9.45, 9.45]
-    })
-    
-    # Interactive chart
-    fig = px.line(
-        historical, 
-        x='Year', 
-        y=indicators,
-        title="Financial Inclusion Trends 2011-2024"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def build_historical():
+        if manifest is not None:
+            return artifact_history(indicators)
+        if data_store is not None:
+            observed = store_history(indicators)
+            if len(observed):
+                return observed
+        # Sample historical data
+        return pd.DataFrame({
+            'Year': [2011, 2014, 2017, 2021, 2024],
+            'Account Ownership': [14, 22, 35, 46, 49],
+            'Digital Payments': [5, 10, 15, 25, 35],
+            'Mobile Money': [0, 1, 4.7, 9.45, 9.45]
+        })
+    
+    historical = view_cache.frame('historical', build_historical, indicators=indicators)
+    
+    # Zooming re-downsamples the window, so detail grows as the range narrows
+    first, last = historical['Year'].min(), historical['Year'].max()
+    zoom = st.slider("Zoom", first, last, (first, last)) if first < last else None
+    
+    # Interactive chart, downsampled to a fixed point budget
+    def build_trends():
+        return line_figure(
+            historical,
+            'Year',
+            [name for name in indicators if name in historical.columns],
+            title="Financial Inclusion Trends 2011-2024",
+            x_range=zoom
+        )
+    
+    st.plotly_chart(view_cache.figure('trends', build_trends, year_range=zoom, indicators=indicators),
+                    use_container_width=True)
     
     # Gender gap if available
     st.subheader("Gender Analysis")
-    gender_data = pd.DataFrame({
-        'Year': [2021, 2024],
-        'Male': [48, 51],
-        'Female': [44, 47],
-        'Gap': [4, 4]
-    })
-    
-    fig = px.bar(
-        gender_data,
-        x='Year',
-        y=['Male', 'Female'],
-        barmode='group',
-        title="Account Ownership by Gender"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    
+    def build_gender():
+        import plotly.express as px
 
-with tab3:
+        gender_data = pd.DataFrame({
+            'Year': [2021, 2024],
+            'Male': [48, 51],
+            'Female': [44, 47],
+            'Gap': [4, 4]
+        })
+        return px.bar(
+            gender_data,
+            x='Year',
+            y=['Male', 'Female'],
+            barmode='group',
+            title="Account Ownership by Gender"
+        )
+    
+    st.plotly_chart(view_cache.figure('gender', build_gender), use_container_width=True)
+
+@traced('dashboard.forecasts')
+def forecasts_page():
     st.header("Forecasts 2025-2027")
     
-    # Sample forecast data
-    forecast_data = pd.DataFrame({
-        'Year': [2025, 2026, 2027],
-        'Account Ownership Baseline': [51.5, 53.8, 56.0],
-        'Account Ownership Optimistic': [53.0, 56.5, 60.0],
-        'Account Ownership Pessimistic': [50.0, 51.0, 52.0],
-        'Digital Payments Baseline': [38.0, 41.0, 44.0],
-        'Digital Payments Optimistic': [40.0, 45.0, 50.0],
-        'Digital Payments Pessimistic': [36.0, 37.0, 38.0]
-    })
+    def build_forecast_data():
+        if manifest is not None:
+            return artifact_forecasts(indicators, year_range)
+        # Sample forecast data
+        return pd.DataFrame({
+            'Year': [2025, 2026, 2027],
+            'Account Ownership Baseline': [51.5, 53.8, 56.0],
+            'Account Ownership Optimistic': [53.0, 56.5, 60.0],
+            'Account Ownership Pessimistic': [50.0, 51.0, 52.0],
+            'Digital Payments Baseline': [38.0, 41.0, 44.0],
+            'Digital Payments Optimistic': [40.0, 45.0, 50.0],
+            'Digital Payments Pessimistic': [36.0, 37.0, 38.0]
+        })
+    
+    forecast_data = view_cache.frame('forecast_data', build_forecast_data,
+                                     year_range=year_range, indicators=indicators)
     
     # Scenario-based chart
-    if scenario == "Baseline":
-        cols = ['Account Ownership Baseline', 'Digital Payments Baseline']
-    elif scenario == "Optimistic":
-        cols = ['Account Ownership Optimistic', 'Digital Payments Optimistic']
-    else:
-        cols = ['Account Ownership Pessimistic', 'Digital Payments Pessimistic']
-    
-    fig = go.Figure()
-    
-    for col in cols:
-        if col in forecast_data.columns:
-            fig.add_trace(go.Scatter(
-                x=forecast_data['Year'],
-                y=forecast_data[col],
-                name=col.replace(scenario.lower(), '').strip(),
-                mode='lines+markers'
-            ))
-    
-    fig.update_layout(
-        title=f"{scenario} Scenario Forecasts",
-        xaxis_title="Year",
-        yaxis_title="Percentage (%)"
-    )
+    def build_forecast_chart():
+        cols = [col for col in forecast_data.columns if col.endswith(scenario)]
+        
+        fig = go.Figure()
+        
+        for col in cols:
+            if col in forecast_data.columns:
+                fig.add_trace(go.Scatter(
+                    x=forecast_data['Year'],
+                    y=forecast_data[col],
+                    name=col.replace(scenario.lower(), '').strip(),
+                    mode='lines+markers'
+                ))
+        
+        fig.update_layout(
+            title=f"{scenario} Scenario Forecasts",
+            xaxis_title="Year",
+            yaxis_title="Percentage (%)"
+        )
+        return fig
     
+    fig = view_cache.figure('forecast_chart', build_forecast_chart, scenario=scenario,
+                            year_range=year_range, indicators=indicators)
     st.plotly_chart(fig, use_container_width=True)
     
     # Display forecast table
     st.subheader("Forecast Table")
     st.dataframe(forecast_data.style.format("{:.1f}%"), use_container_width=True)
 
-with tab4:
+@traced('dashboard.projections')
+def projections_page():
     st.header("Inclusion Projections")
     
     # Progress toward 60% target
     st.subheader("Progress Toward NFIS-II Target (60% by 2027)")
     
-    progress_data = pd.DataFrame({
-        'Year': [2021, 2024, 2025, 2026, 2027],
-        'Actual/Forecast': [46, 49, 52, 55, 58],
-        'Target': [46, 50, 54, 57, 60]
-    })
-    
-    fig = px.line(
-        progress_data,
-        x='Year',
-        y=['Actual/Forecast', 'Target'],
-        title="Progress Toward 60% Financial Inclusion Target"
-    )
-    
-    # Add shaded area for target achievement
-    fig.add_hrect(y0=0, y1=60, line_width=0, fillcolor="green", opacity=0.1)
+    def build_progress():
+        import plotly.express as px
+
+        progress_data = pd.DataFrame({
+            'Year': [2021, 2024, 2025, 2026, 2027],
+            'Actual/Forecast': [46, 49, 52, 55, 58],
+            'Target': [46, 50, 54, 57, 60]
+        })
+        
+        fig = px.line(
+            progress_data,
+            x='Year',
+            y=['Actual/Forecast', 'Target'],
+            title="Progress Toward 60% Financial Inclusion Target"
+        )
+        
+        # Add shaded area for target achievement
+        fig.add_hrect(y0=0, y1=60, line_width=0, fillcolor="green", opacity=0.1)
+        return fig
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(view_cache.figure('progress', build_progress), use_container_width=True)
     
     # Answer key questions
     st.subheader("Answers to Consortium Questions")
@@ -219,6 +393,18 @@ with tab4:
         - **2027**: Potential to reach 58-60% inclusion with continued growth
         """)
 
+
+# Each page render is a span when instrumentation is on (FI_TRACE)
+PAGES = {
+    "Overview": overview_page,
+    "Trends": trends_page,
+    "Forecasts": forecasts_page,
+    "Projections": projections_page,
+}
+PAGES[page]()
+
 # Footer
 st.markdown("---")
 st.caption("Ethiopia Financial Inclusion Forecasting System | Selam Analytics Challenge 2026")
+
+flush()
@@ -0,0 +1,104 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Points sent to the browser per chart, shared between its series
+MAX_POINTS_PER_CHART = 4000
+# Above this many raw points a chart is drawn with WebGL
+WEBGL_THRESHOLD = 1000
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def lttb(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. Every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the mean of the next bucket, which preserves peaks and turning points.
+    """
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[stop:edges[i + 2]].mean()
+            next_y = y[stop:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[a] - next_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_series(x, y, n_out, x_range=None):
+    """Sort, drop missing values, crop to ``x_range`` and apply LTTB
+
+    Cropping keeps one point either side of the window so lines run to
+    the plot edges.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    order = np.argsort(x, kind='stable')
+    x, y = x[order], y[order]
+    if x_range is not None:
+        bounds = np.asarray(x_range, dtype=x.dtype)
+        lo = max(np.searchsorted(x, bounds[0], side='left') - 1, 0)
+        hi = min(np.searchsorted(x, bounds[1], side='right') + 1, len(x))
+        x, y = x[lo:hi], y[lo:hi]
+    raw = len(x)
+    idx = lttb(x, y, n_out)
+    return x[idx], y[idx], raw
+
+
+def line_figure(frame, x, columns, title=None, x_range=None,
+                max_points=MAX_POINTS_PER_CHART, webgl_threshold=WEBGL_THRESHOLD):
+    """Line chart of ``columns`` against ``x`` within a fixed point budget
+
+    Each series gets an equal share of ``max_points``. When the series in
+    the window hold more than ``webgl_threshold`` points in total the
+    traces use Scattergl instead of SVG.
+    """
+    columns = list(columns)
+    per_series = max(max_points // max(len(columns), 1), 3)
+    series = [downsample_series(frame[x], frame[col], per_series, x_range) for col in columns]
+    trace = go.Scattergl if sum(raw for _, _, raw in series) > webgl_threshold else go.Scatter
+
+    fig = go.Figure()
+    for col, (xs, ys, _) in zip(columns, series):
+        fig.add_trace(trace(x=xs, y=ys, name=col, mode='lines'))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title='value', legend_title='variable')
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    return fig
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    dates = pd.date_range('2011-01-01', periods=2_000_000, freq='min')
+    walk = np.cumsum(np.random.default_rng(0).normal(size=len(dates)))
+    frame = pd.DataFrame({'date': dates, 'Mobile Money': walk})
+
+    start = time.perf_counter()
+    fig = line_figure(frame, 'date', ['Mobile Money'])
+    print(f"{len(frame)} points -> {len(fig.data[0].x)} {type(fig.data[0]).__name__} "
+          f"points in {time.perf_counter() - start:.3f}s")
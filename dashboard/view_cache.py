@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from threading import Lock
+
+import pandas as pd
+
+
+class ViewCache:
+    """LRU cache of derived frames and figure specs for dashboard views
+
+    Entries are keyed on the view name, the data version and the widget
+    state (scenario, year_range, indicators), so a rerun with a state seen
+    before skips rebuilding. Changing the data version drops every entry.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.data_version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def sync(self, data_version):
+        """Invalidate everything if the underlying data changed"""
+        if data_version != self.data_version:
+            self.invalidate(data_version)
+
+    def invalidate(self, data_version=None):
+        with self._lock:
+            self._entries.clear()
+            self.data_version = data_version
+
+    def _key(self, name, scenario, year_range, indicators):
+        return (name, self.data_version, scenario,
+                None if year_range is None else tuple(year_range),
+                None if indicators is None else tuple(indicators))
+
+    def get_or_build(self, name, builder, scenario=None, year_range=None, indicators=None):
+        """Cached result of ``builder()`` for this view and widget state"""
+        key = self._key(name, scenario, year_range, indicators)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = builder()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def frame(self, name, builder, **state):
+        """Cached DataFrame; callers get a copy so cached frames stay unchanged"""
+        frame = self.get_or_build(name, builder, **state)
+        return frame.copy() if isinstance(frame, pd.DataFrame) else frame
+
+    def figure(self, name, builder, **state):
+        """Cached plotly Figure; st.plotly_chart only reads it"""
+        return self.get_or_build(name, builder, **state)
@@ -9,17 +9,22 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, '..')
+from src.data_store import load_reference_codes, load_store
+
 print("=" * 60)
 print("TASK 1: DATA EXPLORATION AND ENRICHMENT")
 print("=" * 60)
 
 # Load data
 print("\nLoading datasets...")
-df_unified = pd.read_csv('../data/raw/ethiopia_fi_unified_data.csv')
-df_ref = pd.read_csv('../data/raw/reference_codes.csv')
+store = load_store('../data/raw/ethiopia_fi_unified_data.csv', cache_dir='../data/cache')
+df_unified = store.data
+df_ref = load_reference_codes('../data/raw/reference_codes.csv', cache_dir='../data/cache')
 
 print(f"✓ Unified data: {df_unified.shape[0]} rows, {df_unified.shape[1]} columns")
 print(f"✓ Reference codes: {df_ref.shape[0]} rows")
@@ -31,14 +36,10 @@ print("Columns:", df_unified.columns.tolist())
 print("\nRecord types:")
 print(df_unified['record_type'].value_counts())
 
-# Convert dates
-df_unified['observation_date'] = pd.to_datetime(df_unified['observation_date'])
-df_unified['collection_date'] = pd.to_datetime(df_unified['collection_date'])
-
 # Show account ownership trend
 print("\nACCOUNT OWNERSHIP TREND (2011-2024)")
 print("-" * 40)
-acc_data = df_unified[df_unified['indicator_code'] == 'ACC_OWNERSHIP']
+acc_data = store.observations('ACC_OWNERSHIP')
 for _, row in acc_data.iterrows():
     print(f"{row['observation_date'].year}: {row['value_numeric']}%")
 
@@ -5,9 +5,13 @@ Task 1: Simple Data Exploration and Enrichment
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime
 import os
+import sys
+
+sys.path.insert(0, '..')
+from src.enrichment import EnrichmentPipeline
+from src.figures import eda_jobs, render_figures
 
 print("=" * 60)
 print("TASK 1: DATA EXPLORATION AND ENRICHMENT")
@@ -69,40 +73,45 @@ new_rows = [
      'source_name': 'NBE', 'confidence': 'medium', 'notes': 'Fayda ID system'}
 ]
 
-# Convert to DataFrame and combine
-df_new = pd.DataFrame(new_rows)
-df_enriched = pd.concat([df_unified, df_new], ignore_index=True)
-
-print(f"Added {len(new_rows)} new records")
+# Append the new records as a partition; existing ones are skipped
+pipeline = EnrichmentPipeline('../data/processed/enriched')
+if not pipeline.partitions():
+    seeded = pipeline.append(df_unified)
+    for reason, n in seeded['rejections'].items():
+        print(f"Original data: {n} records rejected ({reason})")
+result = pipeline.append(pd.DataFrame(new_rows))
+
+print(f"Added {result['appended']} new records "
+      f"({result['duplicates']} duplicates, {result['rejected']} rejected)")
+for reason, n in result['rejections'].items():
+    print(f"  {n} rejected: {reason}")
+
+# Rewriting the flat CSV used by the EDA scripts costs a pass over every
+# record, so it only happens with --export, or --compact to merge the
+# partitions too; otherwise the partitions are read as they are
+enriched_path = '../data/processed/ethiopia_fi_enriched.csv'
+if '--compact' in sys.argv:
+    df_enriched = pipeline.compact(output=enriched_path)
+elif '--export' in sys.argv:
+    df_enriched = pipeline.export(enriched_path)
+else:
+    df_enriched = pipeline.read()
 print(f"Total records now: {len(df_enriched)}")
-
-# Save enriched data
-df_enriched.to_csv('../data/processed/ethiopia_fi_enriched.csv', index=False)
-print("Saved: ../data/processed/ethiopia_fi_enriched.csv")
+if '--compact' in sys.argv or '--export' in sys.argv:
+    print(f"Saved: {enriched_path}")
+else:
+    print(f"Pass --export to rewrite {enriched_path}")
 
 # Create simple visualization
 print("\n=== CREATING VISUALIZATION ===")
 try:
-    # Get account ownership data for plotting
-    plot_data = df_enriched[df_enriched['indicator'].str.contains('Account', na=False)].copy()
-    plot_data = plot_data[plot_data['value_numeric'].notna()]
-    
-    if not plot_data.empty:
-        # Convert dates
-        plot_data['date'] = pd.to_datetime(plot_data['observation_date'])
-        plot_data = plot_data.sort_values('date')
-        
-        plt.figure(figsize=(10, 6))
-        plt.plot(plot_data['date'].dt.year, plot_data['value_numeric'], 'o-', linewidth=2, markersize=8)
-        plt.title('Account Ownership in Ethiopia', fontsize=14, fontweight='bold')
-        plt.xlabel('Year', fontsize=12)
-        plt.ylabel('Account Ownership (%)', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('../reports/figures/account_ownership.png', dpi=300)
-        print("Saved: ../reports/figures/account_ownership.png")
-    else:
-        print("No numeric data available for visualization")
+    # Skipped when the account ownership series hasn't changed since the last run
+    figures = render_figures(eda_jobs(df_enriched, '../reports/figures',
+                                      only=['account_ownership.png']))
+    for path in figures['rendered']:
+        print(f"Saved: {path}")
+    for path in figures['skipped']:
+        print(f"Up to date: {path}")
 except Exception as e:
     print(f"Could not create visualization: {e}")
 
@@ -115,7 +124,7 @@ log_content = f"""# Data Enrichment Log
 ## Summary
 - Original dataset: {len(df_unified)} records
 - Enriched dataset: {len(df_enriched)} records  
-- New records added: {len(new_rows)}
+- New records added: {result['appended']}
 
 ## Data Sources
 1. ethiopia_fi_unified_data.csv - Main dataset
@@ -6,12 +6,16 @@ Financial Inclusion in Ethiopia
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, '..')
+from src.analytics import growth_summary, growth_table
+from src.data_store import FinancialInclusionStore, load_store
+from src.figures import eda_jobs, render_figures
+
 print("=" * 70)
 print("TASK 2: EXPLORATORY DATA ANALYSIS")
 print("=" * 70)
@@ -19,21 +23,26 @@ print("=" * 70)
 # Load enriched data
 print("\n📁 LOADING ENRICHED DATASET...")
 try:
-    df = pd.read_csv('../data/processed/ethiopia_fi_enriched.csv')
-    print(f"✓ Loaded: {len(df)} records")
+    store = load_store('../data/processed/ethiopia_fi_enriched.csv', cache_dir='../data/cache')
+    print(f"✓ Loaded: {len(store.data)} records")
 except:
     print("✗ Could not load enriched data, using sample data")
-    df = pd.DataFrame({
+    store = FinancialInclusionStore(pd.DataFrame({
         'record_type': ['observation', 'observation', 'observation', 'event', 'observation'],
         'pillar': ['access', 'access', 'usage', None, 'access'],
         'indicator': ['Account Ownership', 'Account Ownership', 'Digital Payment', 'Telebirr Launch', 'Account Ownership Projection'],
+        'indicator_code': ['ACC_OWNERSHIP', 'ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT', 'EVENT_TELEBIRR', 'ACC_OWNERSHIP_PROJECTION'],
         'value_numeric': [14, 22, 9.45, None, 52.5],
         'observation_date': ['2011-12-31', '2014-12-31', '2024-12-31', '2021-05-01', '2025-12-31'],
         'confidence': ['high', 'high', 'high', 'high', 'low']
-    })
+    }))
+df = store.data
 
-# Convert dates
-df['obs_date'] = pd.to_datetime(df['observation_date'], errors='coerce')
+# Period change, annualized change, CAGR, acceleration and gap to target for
+# every indicator in one pass
+growth = growth_table(df)
+GROWTH_VIEW = ['indicator_code', 'prev_year', 'year', 'change_pp', 'annualized_pp', 'cagr',
+               'acceleration', 'gap_to_target']
 
 print("\n" + "=" * 70)
 print("1. DATASET OVERVIEW")
@@ -49,54 +58,49 @@ print("\n📊 Confidence Levels:")
 print(df['confidence'].value_counts(dropna=False))
 
 print("\n📅 Temporal Range:")
-print(f"Earliest: {df['obs_date'].min().date()}")
-print(f"Latest: {df['obs_date'].max().date()}")
-print(f"Time span: {(df['obs_date'].max() - df['obs_date'].min()).days / 365:.1f} years")
+print(f"Earliest: {df['observation_date'].min().date()}")
+print(f"Latest: {df['observation_date'].max().date()}")
+print(f"Time span: {(df['observation_date'].max() - df['observation_date'].min()).days / 365:.1f} years")
 
 print("\n" + "=" * 70)
 print("2. ACCESS ANALYSIS - ACCOUNT OWNERSHIP")
 print("=" * 70)
 
-# Get account ownership data
-acc_mask = df['indicator'].str.contains('Account', case=False, na=False)
-acc_data = df[acc_mask & df['value_numeric'].notna()].copy()
-acc_data = acc_data.sort_values('obs_date')
+# Account ownership rows, already sorted by date in the store
+acc_data = store.observations('ACC_OWNERSHIP').dropna(subset=['value_numeric'])
+acc_growth = growth[(growth['indicator_code'] == 'ACC_OWNERSHIP') & growth['change_pp'].notna()]
 
 if not acc_data.empty:
     print("\n📈 Account Ownership Trend:")
     for idx, row in acc_data.iterrows():
-        year = row['obs_date'].year
+        year = row['observation_date'].year
         value = row['value_numeric']
         source = row.get('source_name', 'Unknown')
         print(f"  {year}: {value}% ({source})")
     
-    # Calculate growth
-    if len(acc_data) > 1:
+    # Period growth of the account indicators, from the growth table
+    if not acc_growth.empty:
         print("\n📈 Growth Analysis:")
-        for i in range(1, len(acc_data)):
-            prev_year = acc_data.iloc[i-1]['obs_date'].year
-            curr_year = acc_data.iloc[i]['obs_date'].year
-            prev_val = acc_data.iloc[i-1]['value_numeric']
-            curr_val = acc_data.iloc[i]['value_numeric']
-            growth_pp = curr_val - prev_val
-            years = curr_year - prev_year
-            annual_growth = growth_pp / years if years > 0 else growth_pp
-            print(f"  {prev_year}-{curr_year}: +{growth_pp:.1f}pp ({annual_growth:.1f}pp per year)")
+        print(acc_growth[GROWTH_VIEW].round(3).to_string(index=False))
 else:
     print("✗ No account ownership data found")
 
+print("\n📈 Growth Summary (all indicators):")
+print(growth_summary(growth)[['indicator_code', 'first_year', 'latest_year', 'latest_value',
+                              'avg_pp_per_year', 'cagr', 'gap_to_target',
+                              'required_pp_per_year']].round(3).to_string(index=False))
+
 print("\n" + "=" * 70)
 print("3. USAGE ANALYSIS - DIGITAL PAYMENTS")
 print("=" * 70)
 
-usage_mask = df['indicator'].str.contains('Digital|Payment', case=False, na=False)
-usage_data = df[usage_mask & df['value_numeric'].notna()]
+usage_data = store.observations(pillar='usage').dropna(subset=['value_numeric'])
 
 if not usage_data.empty:
     print("\n💳 Digital Payment Indicators:")
     for idx, row in usage_data.iterrows():
-        year = row['obs_date'].year if pd.notna(row['obs_date']) else 'N/A'
-        print(f"  {row['indicator']}: {row['value_numeric']}% ({year})")
+        year = row['observation_date'].year if pd.notna(row['observation_date']) else 'N/A'
+        print(f"  {row['indicator']}: {row['value_numeric']:g}% ({year})")
 else:
     print("✗ No digital payment data found")
 
@@ -104,11 +108,11 @@ print("\n" + "=" * 70)
 print("4. EVENT ANALYSIS")
 print("=" * 70)
 
-events = df[df['record_type'] == 'event']
+events = store.events()
 if not events.empty:
     print("\n📅 Cataloged Events:")
     for idx, row in events.iterrows():
-        date_str = row['obs_date'].strftime('%b %Y') if pd.notna(row['obs_date']) else 'Unknown'
+        date_str = row['observation_date'].strftime('%b %Y') if pd.notna(row['observation_date']) else 'Unknown'
         print(f"  • {row.get('indicator', 'Event')} - {date_str}")
 else:
     print("✗ No events found")
@@ -117,88 +121,14 @@ print("\n" + "=" * 70)
 print("5. CREATING VISUALIZATIONS")
 print("=" * 70)
 
-# Create figure with 3 subplots
-fig = plt.figure(figsize=(15, 12))
-
-# Plot 1: Account ownership trend
-ax1 = plt.subplot(3, 1, 1)
-if not acc_data.empty:
-    ax1.plot(acc_data['obs_date'].dt.year, acc_data['value_numeric'], 
-             marker='o', linewidth=2, markersize=8, color='#2E86AB')
-    ax1.fill_between(acc_data['obs_date'].dt.year, 0, acc_data['value_numeric'], 
-                     alpha=0.2, color='#2E86AB')
-    ax1.set_title('Account Ownership in Ethiopia (2011-2025)', fontsize=14, fontweight='bold')
-    ax1.set_xlabel('Year', fontsize=12)
-    ax1.set_ylabel('Account Ownership (%)', fontsize=12)
-    ax1.grid(True, alpha=0.3)
-    
-    # Add event markers
-    event_years = events['obs_date'].dt.year.dropna()
-    for year in event_years:
-        ax1.axvline(x=year, color='red', linestyle='--', alpha=0.5, linewidth=1)
-        ax1.text(year, ax1.get_ylim()[1]*0.95, f'Event', rotation=90, 
-                verticalalignment='top', fontsize=8, color='red')
-
-# Plot 2: Growth rate analysis
-ax2 = plt.subplot(3, 1, 2)
-if len(acc_data) > 1:
-    years = acc_data['obs_date'].dt.year.values[1:]
-    growth_rates = np.diff(acc_data['value_numeric'].values)
-    
-    colors = ['green' if g > 5 else 'orange' if g > 2 else 'red' for g in growth_rates]
-    bars = ax2.bar(years.astype(str), growth_rates, color=colors, alpha=0.7)
-    ax2.set_title('Annual Growth in Account Ownership (Percentage Points)', fontsize=14, fontweight='bold')
-    ax2.set_xlabel('Period', fontsize=12)
-    ax2.set_ylabel('Growth (pp)', fontsize=12)
-    ax2.grid(True, alpha=0.3, axis='y')
-    
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:+.1f}', ha='center', va='bottom', fontsize=9)
-
-# Plot 3: Data composition
-ax3 = plt.subplot(3, 1, 3)
-# Record type distribution
-record_counts = df['record_type'].value_counts()
-wedges, texts, autotexts = ax3.pie(record_counts.values, labels=record_counts.index, 
-                                   autopct='%1.1f%%', startangle=90, colors=['#4ECDC4', '#FF6B6B', '#FFE66D'])
-ax3.set_title('Data Composition by Record Type', fontsize=14, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('../reports/figures/eda_comprehensive.png', dpi=300, bbox_inches='tight')
-print("✓ Visualization saved: ../reports/figures/eda_comprehensive.png")
-
-# Create second figure for data quality
-fig2, (ax4, ax5) = plt.subplots(1, 2, figsize=(12, 5))
-
-# Confidence distribution
-if 'confidence' in df.columns:
-    conf_counts = df['confidence'].value_counts()
-    colors = {'high': 'green', 'medium': 'orange', 'low': 'red'}
-    conf_colors = [colors.get(c, 'gray') for c in conf_counts.index]
-    ax4.bar(conf_counts.index, conf_counts.values, color=conf_colors, alpha=0.7)
-    ax4.set_title('Data Confidence Levels', fontsize=12, fontweight='bold')
-    ax4.set_xlabel('Confidence', fontsize=11)
-    ax4.set_ylabel('Count', fontsize=11)
-    
-    # Add count labels
-    for i, v in enumerate(conf_counts.values):
-        ax4.text(i, v + 0.1, str(v), ha='center', fontsize=10)
-
-# Temporal coverage
-if 'obs_date' in df.columns:
-    yearly_counts = df['obs_date'].dt.year.value_counts().sort_index()
-    ax5.bar(yearly_counts.index.astype(str), yearly_counts.values, color='#6A4C93', alpha=0.7)
-    ax5.set_title('Data Points by Year', fontsize=12, fontweight='bold')
-    ax5.set_xlabel('Year', fontsize=11)
-    ax5.set_ylabel('Number of Records', fontsize=11)
-    plt.setp(ax5.xaxis.get_majorticklabels(), rotation=45)
-
-plt.tight_layout()
-plt.savefig('../reports/figures/eda_data_quality.png', dpi=300, bbox_inches='tight')
-print("✓ Data quality visualization saved: ../reports/figures/eda_data_quality.png")
+# Each figure is a job keyed by its input slice; unchanged figures are skipped
+# and the rest render in parallel
+figures = render_figures(eda_jobs(df, '../reports/figures',
+                                  only=['eda_comprehensive.png', 'eda_data_quality.png']))
+for path in figures['rendered']:
+    print(f"✓ Visualization saved: {path}")
+for path in figures['skipped']:
+    print(f"✓ Visualization up to date: {path}")
 
 print("\n" + "=" * 70)
 print("6. KEY INSIGHTS & ANALYSIS")
@@ -251,7 +181,7 @@ This EDA examines Ethiopia's financial inclusion trajectory using enriched datas
 
 ## Dataset Statistics
 - **Total Records**: {len(df)}
-- **Time Coverage**: {df['obs_date'].min().date()} to {df['obs_date'].max().date()}
+- **Time Coverage**: {df['observation_date'].min().date()} to {df['observation_date'].max().date()}
 - **Record Types**: {dict(df['record_type'].value_counts())}
 - **Confidence Levels**: {dict(df['confidence'].value_counts()) if 'confidence' in df.columns else 'Not available'}
 
@@ -259,7 +189,7 @@ This EDA examines Ethiopia's financial inclusion trajectory using enriched datas
 
 ### 1. Account Ownership (Access)
 **Historical Trend**:
-{chr(10).join([f"- {row['obs_date'].year}: {row['value_numeric']}%" for idx, row in acc_data.iterrows()]) if not acc_data.empty else "- No data available"}
+{chr(10).join([f"- {row['observation_date'].year}: {row['value_numeric']}%" for idx, row in acc_data.iterrows()]) if not acc_data.empty else "- No data available"}
 
 **Growth Analysis**:
 - **2011-2014**: +8pp (rapid initial growth)
@@ -275,7 +205,7 @@ This EDA examines Ethiopia's financial inclusion trajectory using enriched datas
 
 ### 3. Event Context
 **Major Milestones**:
-{chr(10).join([f"- {row.get('indicator', 'Event')} ({row['obs_date'].strftime('%b %Y') if pd.notna(row['obs_date']) else 'Unknown date'})" for idx, row in events.iterrows()]) if not events.empty else "- No events cataloged"}
+{chr(10).join([f"- {row.get('indicator', 'Event')} ({row['observation_date'].strftime('%b %Y') if pd.notna(row['observation_date']) else 'Unknown date'})" for idx, row in events.iterrows()]) if not events.empty else "- No events cataloged"}
 
 ### 4. Data Quality Assessment
 
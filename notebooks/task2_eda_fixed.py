@@ -6,12 +6,15 @@ Financial Inclusion in Ethiopia
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, '..')
+from src.analytics import growth_summary, growth_table
+from src.figures import FigureJob, plot_trend, render_figures
+
 print("=" * 70)
 print("TASK 2: EXPLORATORY DATA ANALYSIS")
 print("=" * 70)
@@ -28,6 +31,7 @@ except Exception as e:
         'record_type': ['observation', 'observation', 'observation', 'event', 'observation'],
         'pillar': ['access', 'access', 'usage', None, 'access'],
         'indicator': ['Account Ownership', 'Account Ownership', 'Digital Payment', 'Telebirr Launch', 'Account Ownership Projection'],
+        'indicator_code': ['ACC_OWNERSHIP', 'ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT', 'EVENT_TELEBIRR', 'ACC_OWNERSHIP_PROJECTION'],
         'value_numeric': [14, 22, 9.45, None, 52.5],
         'observation_date': ['2011-12-31', '2014-12-31', '2024-12-31', '2021-05-01', '2025-12-31'],
         'confidence': ['high', 'high', 'high', 'high', 'low']
@@ -36,6 +40,12 @@ except Exception as e:
 # Convert dates
 df['obs_date'] = pd.to_datetime(df['observation_date'], errors='coerce')
 
+# Period change, annualized change, CAGR, acceleration and gap to target for
+# every indicator in one pass
+growth = growth_table(df)
+GROWTH_VIEW = ['indicator_code', 'prev_year', 'year', 'change_pp', 'annualized_pp', 'cagr',
+               'acceleration', 'gap_to_target']
+
 print("\n" + "=" * 70)
 print("1. DATASET OVERVIEW")
 print("=" * 70)
@@ -62,6 +72,8 @@ print("=" * 70)
 acc_mask = df['indicator'].str.contains('Account', case=False, na=False)
 acc_data = df[acc_mask & df['value_numeric'].notna()].copy()
 acc_data = acc_data.sort_values('obs_date')
+acc_growth = growth[growth['indicator_code'].isin(acc_data['indicator_code'].unique())
+                    & growth['change_pp'].notna()]
 
 if not acc_data.empty:
     print("\nAccount Ownership Trend:")
@@ -70,18 +82,15 @@ if not acc_data.empty:
         value = row['value_numeric']
         print(f"  {year}: {value}%")
     
-    # Calculate growth
-    if len(acc_data) > 1:
+    # Period growth of the account indicators, from the growth table
+    if not acc_growth.empty:
         print("\nGrowth Analysis:")
-        for i in range(1, len(acc_data)):
-            prev_year = acc_data.iloc[i-1]['obs_date'].year
-            curr_year = acc_data.iloc[i]['obs_date'].year
-            prev_val = acc_data.iloc[i-1]['value_numeric']
-            curr_val = acc_data.iloc[i]['value_numeric']
-            growth_pp = curr_val - prev_val
-            years = curr_year - prev_year
-            annual_growth = growth_pp / years if years > 0 else growth_pp
-            print(f"  {prev_year}-{curr_year}: +{growth_pp:.1f}pp ({annual_growth:.1f}pp per year)")
+        print(acc_growth[GROWTH_VIEW].round(3).to_string(index=False))
+
+print("\nGrowth Summary (all indicators):")
+print(growth_summary(growth)[['indicator_code', 'first_year', 'latest_year', 'latest_value',
+                              'avg_pp_per_year', 'cagr', 'gap_to_target',
+                              'required_pp_per_year']].round(3).to_string(index=False))
 
 print("\n" + "=" * 70)
 print("3. KEY INSIGHTS")
@@ -95,15 +104,16 @@ print("4. Data limitations: Sparse time series, limited disaggregation")
 print("5. Forecasting challenge: Recent slowdown creates uncertainty")
 
 # Create simple visualization
-plt.figure(figsize=(10, 6))
 if not acc_data.empty:
-    plt.plot(acc_data['obs_date'].dt.year, acc_data['value_numeric'], 'o-', linewidth=2, markersize=8)
-    plt.title('Account Ownership in Ethiopia', fontsize=14, fontweight='bold')
-    plt.xlabel('Year', fontsize=12)
-    plt.ylabel('Account Ownership (%)', fontsize=12)
-    plt.grid(True, alpha=0.3)
-    plt.savefig('../reports/figures/eda_simple.png', dpi=300)
-    print("\nVisualization saved: ../reports/figures/eda_simple.png")
+    trend = pd.DataFrame({'year': acc_data['obs_date'].dt.year.to_numpy(),
+                          'value': acc_data['value_numeric'].to_numpy(dtype=float)})
+    figures = render_figures([FigureJob('../reports/figures/eda_simple.png', plot_trend, trend,
+                                        title='Account Ownership in Ethiopia',
+                                        ylabel='Account Ownership (%)')])
+    if figures['rendered']:
+        print("\nVisualization saved: ../reports/figures/eda_simple.png")
+    else:
+        print("\nVisualization up to date: ../reports/figures/eda_simple.png")
 
 print("\n" + "=" * 70)
 print("TASK 2 COMPLETED")
@@ -0,0 +1,245 @@
+"""Command line entry point: ``python -m src <command>``
+
+Commands:
+
+- ``fit``: fit every indicator in the unified dataset and save a registry version
+- ``forecast``: print forecasts served from the model registry
+- ``scenarios``: build a forecast artifact with its event scenarios
+- ``enrich``: append CSV batches of records to the enrichment pipeline
+- ``report``: write a markdown summary of a forecast artifact
+- ``figures``: render the report figures whose input data changed
+- ``notebook``: build a notebook from its template, rerunning only changed cells
+
+Only argparse is imported up front; each command imports what it needs when
+it runs, so ``--help`` and registry-served forecasts start quickly.
+"""
+import argparse
+import sys
+
+DEFAULT_YEARS = [2025, 2026, 2027]
+
+
+def _markdown_table(frame, float_format='{:.1f}'):
+    columns = [str(frame.index.name or '')] + [str(col) for col in frame.columns]
+    lines = ['| ' + ' | '.join(columns) + ' |', '|' + '---|' * len(columns)]
+    for index, row in frame.iterrows():
+        cells = [float_format.format(value) if isinstance(value, float) else str(value)
+                 for value in row]
+        lines.append('| ' + ' | '.join([str(index)] + cells) + ' |')
+    return '\n'.join(lines)
+
+
+def cmd_fit(args):
+    from src.data_store import DEFAULT_DATA_PATH, load_store
+    from src.forecasting import FinancialInclusionForecaster
+    from src.model_registry import DEFAULT_REGISTRY_DIR, ModelRegistry
+
+    store = load_store(args.data or DEFAULT_DATA_PATH)
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_store(store)
+    for curve in args.diffusion:
+        forecaster.fit_diffusion(store.observations(), curve=curve)
+    registry = ModelRegistry(args.registry or DEFAULT_REGISTRY_DIR)
+    version = registry.save(forecaster, tags=args.tag or ['latest'])
+    print(f"Saved model version {version} ({len(forecaster.series_index)} series) "
+          f"to {registry.root}")
+
+
+def cmd_forecast(args):
+    from src.model_registry import DEFAULT_REGISTRY_DIR, ModelRegistry
+
+    families = ModelRegistry(args.registry or DEFAULT_REGISTRY_DIR).load(args.version)
+    if args.family not in families:
+        raise KeyError(f"Version {args.version} has no {args.family} models; "
+                       f"fitted families: {', '.join(families)}")
+    family = families[args.family]
+    forecasts = family.forecast(args.years, keys=args.indicator)
+    if args.intervals:
+        widths = family.intervals(args.years, keys=args.indicator, level=args.level)
+        forecasts = forecasts.stack().rename('prediction').to_frame()
+        forecasts['lower_bound'] = forecasts['prediction'] - widths.stack()
+        forecasts['upper_bound'] = forecasts['prediction'] + widths.stack()
+        forecasts.index = forecasts.index.set_names('year', level=-1)
+    print(forecasts.to_csv() if args.csv else forecasts.round(2).to_string())
+
+
+def cmd_scenarios(args):
+    from src.artifacts import DEFAULT_ARTIFACT_DIR, DEFAULT_EVENTS, build_forecast_artifacts
+    from src.data_store import load_store
+
+    store = load_store(args.data) if args.data else None
+    manifest = build_forecast_artifacts(store=store, years=args.years,
+                                        events_list=args.events or DEFAULT_EVENTS,
+                                        out_dir=args.out_dir or DEFAULT_ARTIFACT_DIR,
+                                        simulate_paths=args.simulate)
+    print(f"Wrote forecast artifact {manifest['version']} "
+          f"({len(manifest['indicators'])} indicators, scenarios: "
+          f"{', '.join(manifest['scenarios'])})")
+
+
+def cmd_enrich(args):
+    import pandas as pd
+
+    from src.enrichment import DEFAULT_PIPELINE_DIR, EnrichmentPipeline
+
+    pipeline = EnrichmentPipeline(args.pipeline_dir or DEFAULT_PIPELINE_DIR)
+    for path in args.files:
+        counts = pipeline.append(pd.read_csv(path))
+        print(f"{path}: {counts['appended']} appended, {counts['duplicates']} duplicates, "
+              f"{counts['rejected']} rejected")
+        for reason, n in counts['rejections'].items():
+            print(f"  {n} rejected: {reason}")
+    if args.compact:
+        compacted = pipeline.compact(args.compact)
+        print(f"Compacted {len(compacted)} records to {args.compact}")
+    elif args.export:
+        exported = pipeline.export(args.export)
+        print(f"Exported {len(exported)} records to {args.export}")
+
+
+def cmd_report(args):
+    from src.artifacts import DEFAULT_ARTIFACT_DIR, load_artifact
+
+    artifact = load_artifact(args.artifact_dir or DEFAULT_ARTIFACT_DIR, args.version)
+    manifest, forecasts = artifact['manifest'], artifact['forecasts']
+    forecasts = forecasts.astype({'indicator_code': str, 'scenario': str, 'value': float})
+    sections = [
+        "# Financial Inclusion Forecast Report",
+        "",
+        f"- Artifact version: `{manifest['version']}`",
+        f"- Created: {manifest['created_at']}",
+        f"- Data hash: `{manifest['data_hash'][:12]}`",
+        f"- Events: {', '.join(manifest['events'])}",
+    ]
+    for code, rows in forecasts.groupby('indicator_code', sort=True):
+        table = rows.pivot(index='year', columns='scenario', values='value')
+        sections += ["", f"## {code}", "", _markdown_table(table[sorted(table.columns)])]
+    report = '\n'.join(sections) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+        print(f"Wrote report for {manifest['version']} to {args.output}")
+    else:
+        print(report, end='')
+
+
+def cmd_figures(args):
+    import os
+
+    from src.data_store import DEFAULT_DATA_PATH, load_store
+    from src.figures import DEFAULT_FIGURE_DIR, eda_jobs, indicator_jobs, render_figures
+
+    data = load_store(args.data or DEFAULT_DATA_PATH).data
+    out_dir = args.out_dir or DEFAULT_FIGURE_DIR
+    jobs = eda_jobs(data, out_dir, dpi=args.dpi)
+    if args.by:
+        jobs += indicator_jobs(data, os.path.join(out_dir, 'indicators'), group_cols=args.by,
+                               dpi=args.series_dpi)
+    result = render_figures(jobs, workers=args.workers, force=args.force)
+    print(f"Rendered {len(result['rendered'])} figures, {len(result['skipped'])} up to date "
+          f"in {out_dir}")
+
+
+def cmd_notebook(args):
+    from src.notebook_builder import DEFAULT_CACHE_DIR, build_notebook, verify_notebook
+
+    params = dict(param.split('=', 1) for param in args.param)
+    stats = build_notebook(args.template, args.output, params, execute=not args.no_execute,
+                           cache_dir=args.cache_dir or DEFAULT_CACHE_DIR, force=args.force)
+    if args.no_execute:
+        print(f"Wrote {stats['output']} without executing it")
+        return
+    print(f"Wrote {stats['output']}: executed {len(stats['executed'])} cells "
+          f"({len(stats['changed'])} changed), {len(stats['cached'])} from cache")
+    problems = verify_notebook(stats['output'])
+    if problems:
+        raise ValueError("Missing charts: " + '; '.join(
+            f"{chart} ({problem})" for chart, problem in problems.items()))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src',
+                                     description="Ethiopia financial inclusion forecasting")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fit = commands.add_parser('fit', help="Fit trend models and save them to the registry")
+    fit.add_argument('--data', help="Unified dataset CSV")
+    fit.add_argument('--registry', help="Model registry directory")
+    fit.add_argument('--tag', action='append', help="Tag for the new version (repeatable)")
+    fit.add_argument('--diffusion', action='append', default=[], choices=['logistic', 'bass'],
+                     help="Also fit a diffusion curve (repeatable)")
+    fit.set_defaults(handler=cmd_fit)
+
+    forecast = commands.add_parser('forecast', help="Forecast from a saved registry version")
+    forecast.add_argument('--years', type=int, nargs='+', default=DEFAULT_YEARS)
+    forecast.add_argument('--indicator', nargs='+', help="Indicator codes (default: all)")
+    forecast.add_argument('--family', default='linear',
+                          choices=['linear', 'trend', 'logistic', 'bass'])
+    forecast.add_argument('--version', default='latest', help="Version id or tag")
+    forecast.add_argument('--registry', help="Model registry directory")
+    forecast.add_argument('--intervals', action='store_true', help="Add prediction intervals")
+    forecast.add_argument('--level', type=float, default=0.95)
+    forecast.add_argument('--csv', action='store_true', help="Print CSV instead of a table")
+    forecast.set_defaults(handler=cmd_forecast)
+
+    scenarios = commands.add_parser('scenarios', help="Build a forecast artifact with scenarios")
+    scenarios.add_argument('--data', help="Unified dataset CSV")
+    scenarios.add_argument('--years', type=int, nargs='+', default=DEFAULT_YEARS)
+    scenarios.add_argument('--events', nargs='+', help="Events applied in the optimistic scenario")
+    scenarios.add_argument('--out-dir', help="Artifact directory")
+    scenarios.add_argument('--simulate', type=int, metavar='PATHS',
+                           help="Use quantiles of this many Monte Carlo paths as the scenarios")
+    scenarios.set_defaults(handler=cmd_scenarios)
+
+    enrich = commands.add_parser('enrich', help="Append record batches to the enrichment pipeline")
+    enrich.add_argument('files', nargs='+', help="CSV files of unified records")
+    enrich.add_argument('--pipeline-dir', help="Enrichment pipeline directory")
+    enrich.add_argument('--compact', metavar='OUTPUT',
+                        help="Merge partitions and write the flat dataset to OUTPUT")
+    enrich.add_argument('--export', metavar='OUTPUT',
+                        help="Write the flat dataset to OUTPUT, keeping the partitions")
+    enrich.set_defaults(handler=cmd_enrich)
+
+    report = commands.add_parser('report', help="Markdown summary of a forecast artifact")
+    report.add_argument('--artifact-dir', help="Artifact directory")
+    report.add_argument('--version', help="Artifact version (default: latest)")
+    report.add_argument('--output', help="Write to a file instead of stdout")
+    report.set_defaults(handler=cmd_report)
+
+    figures = commands.add_parser('figures', help="Render report figures whose inputs changed")
+    figures.add_argument('--data', help="Unified dataset CSV")
+    figures.add_argument('--out-dir', help="Figure directory")
+    figures.add_argument('--by', nargs='+',
+                         help="Also draw one figure per series of these columns, "
+                              "e.g. indicator_code region")
+    figures.add_argument('--dpi', type=int, default=300)
+    figures.add_argument('--series-dpi', type=int, default=150)
+    figures.add_argument('--workers', type=int, help="Render processes (default: CPU count)")
+    figures.add_argument('--force', action='store_true', help="Re-render unchanged figures")
+    figures.set_defaults(handler=cmd_figures)
+
+    notebook = commands.add_parser('notebook', help="Build, execute and verify a notebook")
+    notebook.add_argument('--template', default='eda')
+    notebook.add_argument('--output', help="Notebook path (default: notebooks/<template>.ipynb)")
+    notebook.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                          help="Template parameter (repeatable)")
+    notebook.add_argument('--cache-dir', help="Cell output cache directory")
+    notebook.add_argument('--no-execute', action='store_true', help="Only render the template")
+    notebook.add_argument('--force', action='store_true', help="Re-execute every cell")
+    notebook.set_defaults(handler=cmd_notebook)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    except (FileNotFoundError, KeyError, ValueError) as exc:
+        message = exc.args[0] if isinstance(exc, KeyError) and exc.args else exc
+        print(f"error: {message}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
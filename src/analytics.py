@@ -0,0 +1,140 @@
+import pandas as pd
+import numpy as np
+
+from src.forecasting import _series_codes, _to_year
+
+# Target records name the indicator they set a target for with this prefix,
+# e.g. TARGET_ACC_OWNERSHIP for ACC_OWNERSHIP
+TARGET_PREFIX = 'TARGET_'
+
+GROWTH_COLUMNS = ['year', 'value', 'prev_year', 'prev_value', 'years_elapsed', 'change_pp',
+                  'annualized_pp', 'cagr', 'acceleration', 'target', 'target_year',
+                  'gap_to_target', 'required_pp_per_year']
+
+
+def targets_from_records(data, time_col='observation_date', value_col='value_numeric'):
+    """Latest target per indicator from the target records of the unified data
+
+    Returns a frame indexed by indicator_code with ``target`` and ``target_year``.
+    """
+    rows = data[(data['record_type'] == 'target') & data[value_col].notna()]
+    targets = pd.DataFrame({
+        'indicator_code': rows['indicator_code'].astype(str).str.removeprefix(TARGET_PREFIX).to_numpy(),
+        'target': rows[value_col].to_numpy(dtype=float),
+        'target_year': _to_year(rows[time_col]),
+    })
+    targets = targets.sort_values('target_year', kind='mergesort')
+    return targets.drop_duplicates('indicator_code', keep='last').set_index('indicator_code')
+
+
+def growth_table(data, group_cols=('indicator_code',), time_col='observation_date',
+                 value_col='value_numeric', targets=None):
+    """Period growth of every series in one vectorized pass
+
+    Each series is one combination of ``group_cols`` (add breakdown columns
+    such as gender or region to split them). Returns one row per observation,
+    sorted by series then year. Each row has the change from the series'
+    previous observation in percentage points, the change per year, the CAGR
+    over the period, and the acceleration, which is the change per year
+    minus the previous period's. A series' first row has NaN changes.
+
+    ``targets`` is a frame indexed by indicator_code with ``target`` and
+    ``target_year``. It defaults to the target records in ``data``. Each row
+    then gets its gap to target and the change per year needed to close it
+    by the target year.
+    """
+    group_cols = list(group_cols)
+    if targets is None and 'record_type' in data.columns:
+        targets = targets_from_records(data, time_col, value_col)
+    obs = data
+    if 'record_type' in obs.columns:
+        obs = obs[obs['record_type'] == 'observation']
+    obs = obs[obs[value_col].notna()]
+    years = _to_year(obs[time_col])
+    valid = ~np.isnan(years)
+    obs, years = obs[valid], years[valid]
+
+    codes, keys = _series_codes(obs, group_cols)
+    order = np.lexsort((years, codes))
+    codes, years = codes[order], years[order]
+    values = obs[value_col].to_numpy(dtype=float)[order]
+
+    # Previous observation of the same series, from the row above in sorted order
+    has_prev = np.zeros(len(codes), dtype=bool)
+    has_prev[1:] = codes[1:] == codes[:-1]
+    prev_year = np.full(len(codes), np.nan)
+    prev_value = np.full(len(codes), np.nan)
+    prev_year[1:] = np.where(has_prev[1:], years[:-1], np.nan)
+    prev_value[1:] = np.where(has_prev[1:], values[:-1], np.nan)
+    elapsed = years - prev_year
+    change = values - prev_value
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annualized = np.where(elapsed > 0, change / elapsed, np.nan)
+        cagr = np.where((elapsed > 0) & (prev_value > 0) & (values >= 0),
+                        (values / prev_value) ** (1 / elapsed) - 1, np.nan)
+    # A series' first row has no annualized change, so differences across
+    # series boundaries come out NaN without a mask
+    acceleration = np.full(len(codes), np.nan)
+    acceleration[1:] = annualized[1:] - annualized[:-1]
+
+    target = np.full(len(codes), np.nan)
+    target_year = np.full(len(codes), np.nan)
+    if targets is not None and len(targets) and 'indicator_code' in group_cols:
+        level = group_cols.index('indicator_code')
+        series_codes = keys.get_level_values(level) if len(group_cols) > 1 else keys
+        matched = targets.reindex(series_codes.astype(str))
+        target = matched['target'].to_numpy(dtype=float)[codes]
+        target_year = matched['target_year'].to_numpy(dtype=float)[codes]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        required = np.where(target_year > years, (target - values) / (target_year - years), np.nan)
+
+    measures = pd.DataFrame(dict(zip(GROWTH_COLUMNS, [
+        years.astype(int), values, prev_year, prev_value, elapsed, change, annualized, cagr,
+        acceleration, target, target_year, target - values, required,
+    ])))
+    series = keys.to_frame(index=False).take(codes).reset_index(drop=True)
+    return pd.concat([series, measures], axis=1)
+
+
+def growth_summary(table, group_cols=('indicator_code',)):
+    """One row per series: first and latest observation, overall CAGR and average change per year"""
+    group_cols = list(group_cols)
+    grouped = table.groupby(group_cols, sort=True, observed=True)
+    summary = grouped.agg(first_year=('year', 'first'), first_value=('value', 'first'),
+                          latest_year=('year', 'last'), latest_value=('value', 'last'),
+                          n_obs=('value', 'size'), target=('target', 'last'),
+                          target_year=('target_year', 'last'),
+                          required_pp_per_year=('required_pp_per_year', 'last'))
+    span = summary['latest_year'] - summary['first_year']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        summary['avg_pp_per_year'] = np.where(
+            span > 0, (summary['latest_value'] - summary['first_value']) / span, np.nan)
+        summary['cagr'] = np.where(
+            (span > 0) & (summary['first_value'] > 0),
+            (summary['latest_value'] / summary['first_value']) ** (1 / span) - 1, np.nan)
+    summary['gap_to_target'] = summary['target'] - summary['latest_value']
+    return summary.reset_index()
+
+
+if __name__ == "__main__":
+    import time
+
+    from src.data_store import load_store
+
+    data = load_store().data
+    table = growth_table(data)
+    print(table[table['indicator_code'] == 'ACC_OWNERSHIP'][
+        ['indicator_code', 'year', 'value', 'change_pp', 'annualized_pp', 'cagr', 'acceleration',
+         'gap_to_target', 'required_pp_per_year']].round(3).to_string(index=False))
+
+    rng = np.random.default_rng(0)
+    n_series, n_years = 200_000, 10
+    synthetic = pd.DataFrame({
+        'indicator_code': np.repeat(np.arange(n_series), n_years),
+        'gender': np.tile(['male', 'female'], n_series * n_years // 2),
+        'year': np.tile(np.arange(2015, 2015 + n_years), n_series),
+        'value_numeric': rng.uniform(1, 90, n_series * n_years),
+    })
+    start = time.perf_counter()
+    growth_table(synthetic, group_cols=('indicator_code', 'gender'), time_col='year')
+    print(f"\n{len(synthetic):,} rows in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import numpy as np
+
+from src.data_store import load_store
+from src.event_impact import EventImpactModel
+from src.forecasting import FinancialInclusionForecaster
+from src.instrumentation import traced
+
+DEFAULT_ARTIFACT_DIR = 'artifacts/forecasts'
+DEFAULT_EVENTS = ['telebirr_launch', 'mpesa_entry']
+ARTIFACT_FORMAT = 1
+
+
+def frame_hash(data):
+    """Stable content hash of a frame"""
+    hashed = pd.util.hash_pandas_object(data.reset_index(drop=True), index=True)
+    return hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+
+
+@traced('artifacts.build')
+def build_forecast_artifacts(observations=None, years=(2025, 2026, 2027), events_list=None,
+                             out_dir=DEFAULT_ARTIFACT_DIR, impact_scale=100.0, version=None,
+                             simulate_paths=None, seed=0, store=None):
+    """Fit, forecast and run scenarios for every indicator and write an artifact
+
+    Writes ``<out_dir>/<version>/forecasts.parquet`` (one row per indicator,
+    scenario and year), ``history.parquet`` (the observations it was fitted
+    on) and ``manifest.json``, then points ``<out_dir>/latest.json`` at the
+    new version. ``impact_scale`` converts the event model's fractional
+    impacts to the percentage units of the unified data.
+
+    Without ``observations`` the fit reads every observation of ``store``
+    (by default the unified dataset loaded with ``load_store``).
+
+    By default the scenarios are the deterministic ones of
+    ``create_scenarios``. With ``simulate_paths`` they are instead the
+    quantiles of that many Monte Carlo paths (see ``src.simulation``).
+    """
+    events_list = DEFAULT_EVENTS if events_list is None else events_list
+    years = list(years)
+
+    forecaster = FinancialInclusionForecaster()
+    if observations is None:
+        store = store if store is not None else load_store()
+        observations = store.observations()
+        forecaster.fit_store(store)
+    else:
+        forecaster.fit_batch(observations)
+    intervals = forecaster.forecast_intervals(years)
+    codes = list(forecaster.series_index)
+
+    events_model = EventImpactModel()
+    events_model.build_impact_matrix(events_list, codes)
+    events_model.impact_values = events_model.impact_values * impact_scale
+
+    baseline = forecaster.forecast_batch(years).T
+    if simulate_paths:
+        from src.simulation import simulate_scenarios
+
+        simulated = simulate_scenarios(forecaster, events_model, events_list, years,
+                                       n_paths=simulate_paths, seed=seed)
+        scenarios = {name: simulated.pivot(index='year', columns='indicator_code', values=name)
+                     .reindex(index=years, columns=baseline.columns)
+                     for name in ('baseline', 'optimistic', 'pessimistic')}
+    else:
+        scenarios = forecaster.create_scenarios(baseline, events_model, events_list)
+
+    frames = []
+    for name, values in scenarios.items():
+        long = values.rename_axis(index='year', columns='indicator_code').stack().rename('value')
+        frames.append(long.reset_index().assign(scenario=name))
+    forecasts = pd.concat(frames, ignore_index=True).merge(
+        intervals[['indicator_code', 'year', 'prediction', 'lower_bound', 'upper_bound']],
+        on=['indicator_code', 'year'], how='left'
+    )
+    # Intervals describe trend uncertainty; centre them on each scenario's value
+    shift = forecasts['value'] - forecasts['prediction']
+    forecasts['lower_bound'] += shift
+    forecasts['upper_bound'] += shift
+    forecasts = forecasts[['indicator_code', 'scenario', 'year', 'value', 'lower_bound', 'upper_bound']]
+    forecasts = forecasts.astype({'indicator_code': 'category', 'scenario': 'category',
+                                  'year': np.int16, 'value': np.float32,
+                                  'lower_bound': np.float32, 'upper_bound': np.float32})
+
+    history = observations[['indicator_code', 'observation_date', 'value_numeric']].copy()
+    history['indicator_code'] = history['indicator_code'].astype('category')
+    history['year'] = pd.to_datetime(history['observation_date']).dt.year.astype(np.int16)
+
+    data_hash = frame_hash(observations[['indicator_code', 'observation_date', 'value_numeric']])
+    created = datetime.now(timezone.utc)
+    version = version or f"{created.strftime('%Y%m%dT%H%M%S')}-{data_hash[:8]}"
+    version_dir = os.path.join(out_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    forecasts.to_parquet(os.path.join(version_dir, 'forecasts.parquet'), index=False)
+    history.to_parquet(os.path.join(version_dir, 'history.parquet'), index=False)
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'version': version,
+        'created_at': created.isoformat(),
+        'data_hash': data_hash,
+        'indicators': codes,
+        'scenarios': list(scenarios),
+        'years': years,
+        'events': list(events_list),
+        'scenario_method': f'simulated ({simulate_paths} paths)' if simulate_paths else 'deterministic',
+        'files': {'forecasts': 'forecasts.parquet', 'history': 'history.parquet'},
+    }
+    with open(os.path.join(version_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    latest = os.path.join(out_dir, 'latest.json')
+    with open(latest + '.tmp', 'w') as f:
+        json.dump({'version': version}, f)
+    os.replace(latest + '.tmp', latest)
+    return manifest
+
+
+def load_artifact(out_dir=DEFAULT_ARTIFACT_DIR, version=None):
+    """Load a forecast artifact: its manifest plus forecasts and history frames"""
+    if version is None:
+        with open(os.path.join(out_dir, 'latest.json')) as f:
+            version = json.load(f)['version']
+    version_dir = os.path.join(out_dir, version)
+    with open(os.path.join(version_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    return {
+        'manifest': manifest,
+        'forecasts': pd.read_parquet(os.path.join(version_dir, manifest['files']['forecasts'])),
+        'history': pd.read_parquet(os.path.join(version_dir, manifest['files']['history'])),
+    }
+
+
+if __name__ == "__main__":
+    manifest = build_forecast_artifacts()
+    print(f"Wrote forecast artifact {manifest['version']} "
+          f"({len(manifest['indicators'])} indicators, {len(manifest['scenarios'])} scenarios)")
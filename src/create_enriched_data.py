@@ -1,9 +1,27 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-# Load original data (adjust path as needed)
-original = pd.read_csv('data/raw/ethiopia_fi_unified_data.csv')
+# Run as ``python src/create_enriched_data.py`` from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.enrichment import EnrichmentPipeline
+
+
+def report(name, result):
+    print(f"{name}: appended {result['appended']} records "
+          f"({result['duplicates']} duplicates, {result['rejected']} rejected)")
+    for reason, n in result['rejections'].items():
+        print(f"  {n} rejected: {reason}")
+
+
+# Enrichment batches are appended to a partitioned store; the original
+# data is loaded into it once as the first partition
+pipeline = EnrichmentPipeline('data/processed/enriched')
+if not pipeline.partitions():
+    report('Original data', pipeline.append(pd.read_csv('data/raw/ethiopia_fi_unified_data.csv')))
 
 # Create enriched version with additional records
 # This is a simplified example - adjust based on your actual enrichments
@@ -24,9 +42,18 @@ infra_data = {
 
 infra_df = pd.DataFrame(infra_data)
 
-# Combine with original
-enriched = pd.concat([original, infra_df], ignore_index=True)
+# Append only the new records; already-stored ones are skipped
+report('Infrastructure records', pipeline.append(infra_df))
 
-# Save enriched dataset
-enriched.to_csv('data/processed/ethiopia_fi_enriched.csv', index=False)
-print(f"Enriched dataset saved with {len(enriched)} records")
+# Rewriting the flat CSV the notebooks read costs a pass over every record,
+# so it only happens with --export, or --compact to merge the partitions too
+output = 'data/processed/ethiopia_fi_enriched.csv'
+if '--compact' in sys.argv:
+    enriched = pipeline.compact(output=output)
+    print(f"Enriched dataset compacted and saved with {len(enriched)} records")
+elif '--export' in sys.argv:
+    enriched = pipeline.export(output)
+    print(f"Enriched dataset saved with {len(enriched)} records")
+else:
+    print(f"Pipeline holds {len(pipeline)} records in {len(pipeline.partitions())} partitions; "
+          f"pass --export to rewrite {output}")
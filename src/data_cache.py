@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = 'data/cache'
+MANIFEST_NAME = 'manifest.json'
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("The columnar cache requires pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_manifest(cache_dir):
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(cache_dir, manifest):
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _write_cache(frame, path, fmt):
+    pa = _pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    tmp = path + '.tmp'
+    if fmt == 'parquet':
+        pa.parquet.write_table(table, tmp, compression='zstd')
+    else:
+        # Uncompressed so the file can be memory-mapped without a copy
+        with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _read_cache(path, fmt, memory_map, as_arrow):
+    pa = _pyarrow()
+    if fmt == 'parquet':
+        table = pa.parquet.read_table(path, memory_map=memory_map)
+    else:
+        source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+        table = pa.ipc.open_file(source).read_all()
+    return table if as_arrow else table.to_pandas()
+
+
+def cache_path(path, cache_dir=DEFAULT_CACHE_DIR, fmt='parquet', **read_csv_kwargs):
+    """Columnar cache file for a CSV, building or rebuilding it when stale
+
+    Cache files are named by the CSV's content hash, and the manifest records
+    the size and mtime seen when it was hashed, so unchanged files are not
+    re-hashed on every load. When the CSV changes the cache is rebuilt and the
+    superseded file removed. Different ``read_csv_kwargs`` get separate caches.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown cache format: {fmt}")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    source = os.path.abspath(path)
+    stat = os.stat(source)
+    manifest = _read_manifest(cache_dir)
+    options = json.dumps(read_csv_kwargs, sort_keys=True, default=str)
+    options_hash = hashlib.sha256(options.encode()).hexdigest()[:8]
+    key = f'{source}:{fmt}:{options_hash}'
+    entry = manifest.get(key)
+
+    if (entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+            and os.path.exists(entry['cache_file'])):
+        return entry['cache_file']
+
+    content_hash = file_hash(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    target = os.path.join(cache_dir, f'{stem}-{content_hash[:16]}-{options_hash}{FORMATS[fmt]}')
+    if not os.path.exists(target):
+        _write_cache(pd.read_csv(source, **read_csv_kwargs), target, fmt)
+    if entry and entry['cache_file'] != target and os.path.exists(entry['cache_file']):
+        os.remove(entry['cache_file'])
+
+    manifest[key] = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': content_hash,
+        'cache_file': target,
+    }
+    _write_manifest(cache_dir, manifest)
+    return target
+
+
+def load_csv_cached(path, cache_dir=DEFAULT_CACHE_DIR, fmt='parquet', memory_map=True,
+                    as_arrow=False, **read_csv_kwargs):
+    """Load a CSV through its columnar cache
+
+    ``read_csv_kwargs`` (dtype, parse_dates, ...) are applied once when the
+    cache is built. With ``fmt='arrow'`` and ``as_arrow=True`` the returned
+    pyarrow Table reads straight from the memory-mapped file.
+    """
+    target = cache_path(path, cache_dir, fmt, **read_csv_kwargs)
+    return _read_cache(target, fmt, memory_map, as_arrow)
+
+
+def clear_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Remove every cached file and the manifest"""
+    manifest = _read_manifest(cache_dir)
+    for entry in manifest.values():
+        if os.path.exists(entry['cache_file']):
+            os.remove(entry['cache_file'])
+    manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    data = load_csv_cached('data/processed/ethiopia_fi_enriched.csv')
+    print(f"Loaded {len(data)} records in {time.perf_counter() - start:.4f}s")
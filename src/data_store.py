@@ -0,0 +1,172 @@
+import pandas as pd
+import numpy as np
+
+from src.data_cache import DEFAULT_CACHE_DIR, load_csv_cached
+from src.instrumentation import count, traced
+
+DEFAULT_DATA_PATH = 'data/processed/ethiopia_fi_enriched.csv'
+REFERENCE_CODES_PATH = 'data/raw/reference_codes.csv'
+
+# Column types of the unified financial-inclusion schema
+UNIFIED_DTYPES = {
+    'record_type': 'category',
+    'pillar': 'category',
+    'indicator': 'object',
+    'indicator_code': 'category',
+    'value_numeric': 'float32',
+    'source_name': 'category',
+    'source_url': 'object',
+    'confidence': 'category',
+    'original_text': 'object',
+    'collected_by': 'category',
+    'notes': 'object',
+}
+UNIFIED_DATE_COLUMNS = ['observation_date', 'collection_date']
+
+
+def to_unified_types(data):
+    """Cast a raw unified-schema frame to its typed representation"""
+    typed = data.copy()
+    for col, dtype in UNIFIED_DTYPES.items():
+        if col in typed.columns and typed[col].dtype != dtype:
+            typed[col] = typed[col].astype(dtype)
+    for col in UNIFIED_DATE_COLUMNS:
+        if col in typed.columns and not pd.api.types.is_datetime64_any_dtype(typed[col]):
+            typed[col] = pd.to_datetime(typed[col], errors='coerce')
+    return typed
+
+
+class FinancialInclusionStore:
+    """Typed, sorted copy of the unified dataset with an (indicator_code, date) index
+
+    Rows are sorted by indicator_code then observation_date, so every lookup
+    by code and date is a pair of binary searches instead of a table scan.
+    """
+
+    def __init__(self, data):
+        typed = to_unified_types(data)
+        typed['indicator_code'] = typed['indicator_code'].cat.as_ordered()
+        self.data = typed.sort_values(
+            ['indicator_code', 'observation_date'], kind='mergesort', na_position='last'
+        ).reset_index(drop=True)
+
+        # Index arrays: category code and datetime of every row. Rows without
+        # an indicator_code sort last, so give them a code past the last category.
+        self._categories = self.data['indicator_code'].cat.categories
+        codes = self.data['indicator_code'].cat.codes.to_numpy()
+        self._codes = np.where(codes < 0, len(self._categories), codes)
+        self._dates = self.data['observation_date'].to_numpy(dtype='datetime64[ns]')
+        self._record_types = self.data['record_type'].cat.categories
+        self._types = self.data['record_type'].cat.codes.to_numpy()
+        count('rows_loaded', len(self.data))
+
+    @classmethod
+    def from_csv(cls, path=DEFAULT_DATA_PATH):
+        """Parse a unified-schema CSV once into a store"""
+        return cls(pd.read_csv(path, dtype=UNIFIED_DTYPES, parse_dates=UNIFIED_DATE_COLUMNS))
+
+    @property
+    def indicator_codes(self):
+        return list(self._categories)
+
+    def _code_range(self, indicator_code):
+        """Row slice holding one indicator_code"""
+        code = self._categories.get_indexer([indicator_code])[0]
+        if code < 0:
+            return slice(0, 0)
+        start = np.searchsorted(self._codes, code, side='left')
+        stop = np.searchsorted(self._codes, code, side='right')
+        return slice(start, stop)
+
+    def _rows(self, indicator_code=None, start=None, end=None):
+        """Row positions for a code and inclusive date range"""
+        if indicator_code is None:
+            rows = np.arange(len(self.data))
+            if start is not None:
+                rows = rows[self._dates >= np.datetime64(pd.Timestamp(start))]
+            if end is not None:
+                rows = rows[self._dates[rows] <= np.datetime64(pd.Timestamp(end))]
+            return rows
+
+        span = self._code_range(indicator_code)
+        dates = self._dates[span]
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), 'left')
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), 'right')
+        return np.arange(span.start + lo, span.start + hi)
+
+    def _select(self, record_type, indicator_code=None, start=None, end=None, pillar=None):
+        rows = self._rows(indicator_code, start, end)
+        type_code = self._record_types.get_indexer([record_type])[0]
+        rows = rows[self._types[rows] == type_code] if type_code >= 0 else rows[:0]
+        selected = self.data.iloc[rows]
+        if pillar is not None:
+            selected = selected[selected['pillar'] == pillar]
+        return selected
+
+    def observations(self, indicator_code=None, start=None, end=None, pillar=None):
+        """Observation records, optionally for one indicator and date range"""
+        return self._select('observation', indicator_code, start, end, pillar)
+
+    def events(self, start=None, end=None):
+        """Event records, ordered by date"""
+        return self._select('event', start=start, end=end).sort_values('observation_date')
+
+    def targets(self, indicator_code=None):
+        """Policy target records"""
+        return self._select('target', indicator_code)
+
+    def series(self, indicator_code, start=None, end=None):
+        """Observed values of one indicator indexed by observation_date"""
+        obs = self.observations(indicator_code, start, end)
+        return pd.Series(obs['value_numeric'].to_numpy(), index=obs['observation_date'].to_numpy(),
+                         name=indicator_code)
+
+    def value(self, indicator_code, date):
+        """Value of an indicator at an exact observation date"""
+        rows = self._rows(indicator_code, date, date)
+        if not len(rows):
+            raise KeyError((indicator_code, date))
+        return float(self.data['value_numeric'].iloc[rows[-1]])
+
+    def latest(self, indicator_code):
+        """Most recent observed value of an indicator"""
+        obs = self.observations(indicator_code)
+        if obs.empty:
+            raise KeyError(indicator_code)
+        return float(obs['value_numeric'].iloc[-1])
+
+
+@traced('data.load_store')
+def load_store(path=DEFAULT_DATA_PATH, use_cache=True, cache_dir=DEFAULT_CACHE_DIR):
+    """Load the unified dataset into a FinancialInclusionStore
+
+    With ``use_cache`` the CSV is read through its Parquet cache, which is
+    rebuilt whenever the CSV changes; without pyarrow the CSV is read directly.
+    """
+    if use_cache:
+        try:
+            data = load_csv_cached(path, cache_dir, dtype=UNIFIED_DTYPES,
+                                   parse_dates=UNIFIED_DATE_COLUMNS)
+            return FinancialInclusionStore(data)
+        except ImportError:
+            pass
+    return FinancialInclusionStore.from_csv(path)
+
+
+def load_reference_codes(path=REFERENCE_CODES_PATH, use_cache=True, cache_dir=DEFAULT_CACHE_DIR):
+    """Load reference_codes.csv, through the columnar cache when available"""
+    if use_cache:
+        try:
+            return load_csv_cached(path, cache_dir)
+        except ImportError:
+            pass
+    return pd.read_csv(path)
+
+
+if __name__ == "__main__":
+    store = load_store()
+    print(f"Loaded {len(store.data)} records, {len(store.indicator_codes)} indicators")
+    print("\nAccount ownership:")
+    print(store.series('ACC_OWNERSHIP'))
+    print("\nEvents:")
+    print(store.events()[['indicator', 'observation_date']])
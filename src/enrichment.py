@@ -0,0 +1,219 @@
+import glob
+import os
+
+import pandas as pd
+import numpy as np
+
+from src.instrumentation import count, traced
+
+DEFAULT_PIPELINE_DIR = 'data/processed/enriched'
+
+# Records are duplicates when these columns match
+KEY_COLUMNS = ['indicator_code', 'observation_date', 'source_name']
+REQUIRED_COLUMNS = ['record_type', 'indicator', 'observation_date']
+RECORD_TYPES = {'observation', 'event', 'target'}
+CONFIDENCE_LEVELS = {'high', 'medium', 'low'}
+
+
+def record_keys(records):
+    """64-bit hash of each record's (indicator_code, observation_date, source_name)
+
+    Records without an indicator_code are keyed by their indicator name.
+    """
+    keys = pd.DataFrame(index=records.index)
+    for col in KEY_COLUMNS:
+        values = records[col] if col in records.columns else pd.Series(np.nan, index=records.index)
+        if col == 'indicator_code' and 'indicator' in records.columns:
+            # Events often carry only a name
+            values = values.fillna(records['indicator'])
+        if col == 'observation_date':
+            values = pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m-%d')
+        keys[col] = values.astype(str).str.strip()
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+
+def validate(records):
+    """Split a batch into valid records and rejected ones with a reason"""
+    missing = [col for col in REQUIRED_COLUMNS if col not in records.columns]
+    if missing:
+        raise ValueError(f"Records are missing required columns: {missing}")
+
+    reasons = pd.Series('', index=records.index)
+    dates = pd.to_datetime(records['observation_date'], errors='coerce')
+    reasons[dates.isna()] = 'unparseable observation_date'
+    reasons[~records['record_type'].isin(RECORD_TYPES)] = 'unknown record_type'
+    if 'confidence' in records.columns:
+        bad_confidence = records['confidence'].notna() & ~records['confidence'].isin(CONFIDENCE_LEVELS)
+        reasons[bad_confidence] = 'unknown confidence level'
+    values = (pd.to_numeric(records['value_numeric'], errors='coerce')
+              if 'value_numeric' in records.columns else pd.Series(np.nan, index=records.index))
+    needs_value = records['record_type'].isin(['observation', 'target'])
+    reasons[needs_value & values.isna()] = 'missing value_numeric'
+
+    rejected = records[reasons != ''].assign(reason=reasons[reasons != ''])
+    return records[reasons == ''], rejected
+
+
+def rejection_summary(rejected):
+    """Rejected record counts by reason, e.g. ``{'unknown record_type': 3}``"""
+    return {reason: int(n) for reason, n in rejected['reason'].value_counts(sort=False).items()}
+
+
+class EnrichmentPipeline:
+    """Append-only store of enrichment batches
+
+    Each accepted batch becomes a new CSV partition with a sorted array of
+    its record-key hashes next to it. One merged, sorted index of every
+    stored key is checked by binary search on append and has the new keys
+    merged in, so dedup cost doesn't grow with the number of partitions and
+    no stored record is rewritten. ``export`` writes the flat CSV without
+    touching the partitions; ``compact`` merges them back into one. Both
+    read every record, so they only run when asked to.
+    """
+
+    def __init__(self, root=DEFAULT_PIPELINE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def partitions(self):
+        """Partition ids in append order"""
+        paths = glob.glob(os.path.join(self.root, 'part-*.csv'))
+        return sorted(int(os.path.basename(p)[5:-4]) for p in paths)
+
+    def _data_path(self, part):
+        return os.path.join(self.root, f'part-{part:05d}.csv')
+
+    def _keys_path(self, part):
+        return os.path.join(self.root, f'part-{part:05d}.keys.npy')
+
+    def _index_path(self, part):
+        # Named after the last partition it covers, so a stale index is never read
+        return os.path.join(self.root, f'index-{part:05d}.npy')
+
+    @staticmethod
+    def _save_keys(path, keys):
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, keys)
+        os.replace(path + '.tmp', path)
+
+    def _write_partition(self, part, records, keys):
+        data_path = self._data_path(part)
+        records.to_csv(data_path + '.tmp', index=False)
+        self._save_keys(self._keys_path(part), np.sort(keys))
+        os.replace(data_path + '.tmp', data_path)
+
+    def _write_index(self, part, keys):
+        path = self._index_path(part)
+        self._save_keys(path, keys)
+        for old in glob.glob(os.path.join(self.root, 'index-*.npy')):
+            if old != path:
+                os.remove(old)
+
+    def key_index(self):
+        """Sorted hashes of every stored record's key
+
+        Rebuilt from the partitions' key files when missing or stale.
+        """
+        parts = self.partitions()
+        if not parts:
+            return np.empty(0, dtype=np.uint64)
+        path = self._index_path(parts[-1])
+        if os.path.exists(path):
+            return np.load(path, mmap_mode='r')
+        keys = np.sort(np.concatenate([np.load(self._keys_path(part)) for part in parts]))
+        self._write_index(parts[-1], keys)
+        return keys
+
+    def __len__(self):
+        """Number of stored records"""
+        return len(self.key_index())
+
+    def contains(self, keys, index=None):
+        """Which of the given key hashes are already stored"""
+        stored = self.key_index() if index is None else index
+        if not len(stored):
+            return np.zeros(len(keys), dtype=bool)
+        pos = np.searchsorted(stored, keys)
+        return stored[np.minimum(pos, len(stored) - 1)] == keys
+
+    @traced('enrichment.append')
+    def append(self, records, strict=False):
+        """Validate, deduplicate and store a batch as a new partition
+
+        Returns counts of appended, duplicate and rejected records, with the
+        rejections by reason. With ``strict`` a batch containing any invalid
+        record raises ValueError and nothing is stored.
+        """
+        valid, rejected = validate(records)
+        reasons = rejection_summary(rejected)
+        if strict and reasons:
+            raise ValueError("Batch has invalid records: " + ', '.join(
+                f"{n} with {reason}" for reason, n in reasons.items()))
+        keys = record_keys(valid)
+        # Duplicates within the batch and against stored partitions
+        _, first = np.unique(keys, return_index=True)
+        fresh = np.zeros(len(keys), dtype=bool)
+        fresh[first] = True
+        index = self.key_index()
+        fresh &= ~self.contains(keys, index)
+
+        new_records = valid[fresh]
+        if len(new_records):
+            part = (self.partitions() or [-1])[-1] + 1
+            new_keys = np.sort(keys[fresh])
+            self._write_partition(part, new_records, new_keys)
+            self._write_index(part, np.insert(index, np.searchsorted(index, new_keys), new_keys))
+        count('rows_scanned', len(records))
+        count('records_appended', int(fresh.sum()))
+        count('records_rejected', len(rejected))
+
+        return {
+            'appended': int(fresh.sum()),
+            'duplicates': int(len(valid) - fresh.sum()),
+            'rejected': len(rejected),
+            'rejections': reasons,
+        }
+
+    def read(self):
+        """All stored records in append order"""
+        parts = [pd.read_csv(self._data_path(part)) for part in self.partitions()]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    def export(self, output):
+        """Write every stored record to one flat CSV, leaving the partitions as they are"""
+        data = self.read()
+        data.to_csv(output + '.tmp', index=False)
+        os.replace(output + '.tmp', output)
+        return data
+
+    def compact(self, output=None):
+        """Merge every partition into one and optionally write a flat CSV"""
+        parts = self.partitions()
+        data = self.read()
+        if len(parts) > 1:
+            keys = record_keys(data)
+            self._write_partition(parts[0], data, keys)
+            for part in parts[1:]:
+                os.remove(self._data_path(part))
+                os.remove(self._keys_path(part))
+            self._write_index(parts[0], np.sort(keys))
+        if output is not None:
+            data.to_csv(output + '.tmp', index=False)
+            os.replace(output + '.tmp', output)
+        return data
+
+
+if __name__ == "__main__":
+    pipeline = EnrichmentPipeline()
+    batch = pd.DataFrame({
+        'record_type': ['observation'],
+        'pillar': ['infrastructure'],
+        'indicator': ['4G Coverage (%)'],
+        'indicator_code': ['INF_4G_COVERAGE'],
+        'value_numeric': [45.0],
+        'observation_date': ['2024-12-01'],
+        'source_name': ['GSMA'],
+        'confidence': ['high']
+    })
+    print(pipeline.append(batch))
+    print(f"Partitions: {pipeline.partitions()}")
@@ -1,43 +1,227 @@
 import pandas as pd
 import numpy as np
 
+from src.instrumentation import traced
+
+# Impact profiles: share of an event's full impact realized t years after it
+# happens. ``lag`` delays the start of ramps, decays and steps; ``duration``
+# is the ramp length or the decay time constant in years.
+IMPACT_PROFILES = ('immediate', 'linear_ramp', 'exponential_decay', 'delayed_step')
+
+# Above this share of non-zero event/indicator pairs a dense product is cheaper
+DENSE_THRESHOLD = 0.05
+
 class EventImpactModel:
     def __init__(self):
-        self.impact_matrix = None
-        
+        # Sparse impact store in coordinate form: impact_values[k] is the
+        # effect of event impact_rows[k] on indicator impact_cols[k], kept
+        # sorted by indicator so impacts can be summed per column with reduceat.
+        self.events = pd.Index([])
+        self.indicators = pd.Index([])
+        self.impact_rows = np.empty(0, dtype=np.int64)
+        self.impact_cols = np.empty(0, dtype=np.int64)
+        self.impact_values = np.empty(0)
+        # Per-event timing: year the event happens (NaN if unknown) and its profile
+        self.event_years = np.empty(0)
+        self.profile_kinds = np.empty(0, dtype=np.int64)
+        self.profile_lags = np.empty(0)
+        self.profile_durations = np.empty(0)
+
     def build_impact_matrix(self, events, indicators):
         """Create event-indicator impact matrix"""
-        # Initialize matrix
-        self.impact_matrix = pd.DataFrame(
-            0.0, 
-            index=events, 
-            columns=indicators
-        )
-        
+        self.events = pd.Index(events)
+        self.indicators = pd.Index(indicators)
+        self.impact_rows = np.empty(0, dtype=np.int64)
+        self.impact_cols = np.empty(0, dtype=np.int64)
+        self.impact_values = np.empty(0)
+        self.event_years = np.full(len(self.events), np.nan)
+        self.profile_kinds = np.zeros(len(self.events), dtype=np.int64)
+        self.profile_lags = np.zeros(len(self.events))
+        self.profile_durations = np.ones(len(self.events))
+
         # Define impacts based on research
-        # Telebirr launch impact
-        if 'telebirr_launch' in events:
-            self.impact_matrix.loc['telebirr_launch', 'ACC_MM_ACCOUNT'] = 0.05  # +5pp
-            self.impact_matrix.loc['telebirr_launch', 'USG_DIGITAL_PAYMENT'] = 0.03
-            
-        # M-Pesa entry impact
-        if 'mpesa_entry' in events:
-            self.impact_matrix.loc['mpesa_entry', 'ACC_MM_ACCOUNT'] = 0.02
-            self.impact_matrix.loc['mpesa_entry', 'ACC_OWNERSHIP'] = 0.01
-            
+        self.set_impacts(
+            ['telebirr_launch', 'telebirr_launch', 'mpesa_entry', 'mpesa_entry'],
+            ['ACC_MM_ACCOUNT', 'USG_DIGITAL_PAYMENT', 'ACC_MM_ACCOUNT', 'ACC_OWNERSHIP'],
+            [0.05, 0.03, 0.02, 0.01]  # Telebirr +5pp mobile money, M-Pesa +2pp
+        )
+
+        # Launches phase in as agent networks and merchants catch up
+        self.set_event_dates({'telebirr_launch': '2021-05-01', 'mpesa_entry': '2023-08-01'})
+        for event, ramp_years in [('telebirr_launch', 3), ('mpesa_entry', 2)]:
+            if event in self.events:
+                self.set_event_profile(event, 'linear_ramp', duration=ramp_years)
+
         return self.impact_matrix
-    
+
+    def set_event_dates(self, dates):
+        """Record when events happen from a mapping of event -> date or year"""
+        dates = pd.Series(dates)
+        idx = self.events.get_indexer(dates.index)
+        if pd.api.types.is_numeric_dtype(dates):
+            years = dates.to_numpy(dtype=float)
+        else:
+            years = pd.to_datetime(dates).dt.year.to_numpy(dtype=float)
+        self.event_years[idx[idx >= 0]] = years[idx >= 0]
+
+    def set_event_profile(self, event, kind='immediate', lag=0, duration=1):
+        """Set how an event's impact is distributed over the following years"""
+        if kind not in IMPACT_PROFILES:
+            raise ValueError(f"Unknown impact profile: {kind}")
+        if event not in self.events:
+            raise KeyError(event)
+        i = self.events.get_loc(event)
+        self.profile_kinds[i] = IMPACT_PROFILES.index(kind)
+        self.profile_lags[i] = lag
+        self.profile_durations[i] = duration
+
+    def profile_weights(self, offsets):
+        """Share of each event's impact realized at the given year offsets
+
+        ``offsets`` broadcasts against an events axis in position -2, e.g.
+        shape (1, horizon), (events, horizon) or (paths, events, horizon).
+        """
+        offsets = np.asarray(offsets, dtype=float)
+        kinds = self.profile_kinds[:, None]
+        lags = self.profile_lags[:, None]
+        durations = np.maximum(self.profile_durations, 1e-9)[:, None]
+
+        since = offsets - lags
+        with np.errstate(over='ignore'):
+            weights = np.select(
+                [kinds == 0, kinds == 1, kinds == 2],
+                [(offsets >= 0).astype(float),
+                 np.clip((since + 1) / durations, 0.0, 1.0),
+                 np.exp(-np.maximum(since, 0.0) / durations) * (since >= 0)],
+                default=(since >= 0).astype(float)
+            )
+        return weights
+
+    def impact_paths(self, years, events_list=None):
+        """Indicator deltas for every year from dated, time-distributed events
+
+        Builds an event x time impulse array (one impulse at each event's year,
+        scaled by how often it appears in ``events_list``) and convolves each
+        row with the event's impact kernel. Events without a known date are
+        assumed to happen in the first year; events after the last year have
+        no effect yet. Returns an array of shape (years, indicators).
+        """
+        years = np.asarray(years, dtype=float)
+        counts = (np.ones(len(self.events)) if events_list is None
+                  else self._event_counts(events_list))
+        event_years = np.where(np.isnan(self.event_years), years[0], self.event_years)
+        # Impacts are causal, so events after the window can't reach it
+        counts = np.where(event_years <= years[-1], counts, 0.0)
+
+        # Extend the grid back so effects of earlier events carry into the window
+        start = min(years[0], event_years[counts > 0].min()) if counts.any() else years[0]
+        grid = np.arange(start, years[-1] + 1)
+        horizon = len(grid)
+
+        impulses = np.zeros((len(self.events), horizon))
+        dated = counts > 0
+        positions = (event_years[dated] - start).astype(np.int64)
+        impulses[np.flatnonzero(dated), positions] = counts[dated]
+
+        kernels = self.profile_weights(np.arange(horizon)[None, :])
+        # Causal convolution per event: realized[e, t] = sum_s impulses[e, s] * kernels[e, t - s]
+        lag_index = np.arange(horizon)[:, None] - np.arange(horizon)[None, :]
+        shifted = np.where(lag_index >= 0, kernels[:, np.clip(lag_index, 0, None)], 0.0)
+        realized = np.einsum('es,ets->et', impulses, shifted)
+
+        rows = np.searchsorted(grid, years)
+        return self._propagate(realized[:, rows].T)
+
+    @traced('event_impact.apply_impacts_over_time')
+    def apply_impacts_over_time(self, baseline, events_list):
+        """Apply time-distributed event impacts to every year of a baseline
+
+        ``baseline`` is indexed by year with one column per indicator.
+        """
+        deltas = self.impact_paths(baseline.index, events_list)
+        cols = self.indicators.get_indexer(baseline.columns)
+        affected = baseline.columns[cols >= 0]
+        if not len(affected):
+            return baseline.copy()
+
+        # Rebuild the affected block in one piece rather than column by column
+        updated = pd.DataFrame(
+            baseline[affected].to_numpy(dtype=float) + deltas[:, cols[cols >= 0]],
+            index=baseline.index, columns=affected
+        )
+        return pd.concat([baseline.drop(columns=affected), updated], axis=1)[baseline.columns]
+
+    def set_impacts(self, events, indicators, values):
+        """Add or overwrite impacts given as parallel event/indicator/value lists
+
+        Pairs naming an unknown event or indicator are ignored; later values
+        overwrite earlier ones for the same pair and zeros are not stored.
+        """
+        rows = self.events.get_indexer(events)
+        cols = self.indicators.get_indexer(indicators)
+        values = np.asarray(values, dtype=float)
+        known = (rows >= 0) & (cols >= 0)
+
+        rows = np.concatenate([self.impact_rows, rows[known]])
+        cols = np.concatenate([self.impact_cols, cols[known]])
+        values = np.concatenate([self.impact_values, values[known]])
+
+        # Keep the last value for each (event, indicator) pair
+        keys = cols * len(self.events) + rows
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - last
+        keep = keep[values[keep] != 0]
+        # np.unique sorts keys, so entries come out ordered by indicator
+        self.impact_rows = rows[keep]
+        self.impact_cols = cols[keep]
+        self.impact_values = values[keep]
+
+    @property
+    def impact_matrix(self):
+        """Dense event x indicator view of the sparse store"""
+        dense = np.zeros((len(self.events), len(self.indicators)))
+        dense[self.impact_rows, self.impact_cols] = self.impact_values
+        return pd.DataFrame(dense, index=self.events, columns=self.indicators)
+
+    def _propagate(self, weights):
+        """Sparse product mapping event weights (n, events) to indicator deltas (n, indicators)"""
+        weights = np.atleast_2d(weights)
+        n_pairs = len(self.events) * len(self.indicators)
+        if n_pairs and len(self.impact_values) > DENSE_THRESHOLD * n_pairs:
+            dense = np.zeros((len(self.events), len(self.indicators)))
+            dense[self.impact_rows, self.impact_cols] = self.impact_values
+            return weights @ dense
+
+        out = np.zeros((weights.shape[0], len(self.indicators)))
+        if len(self.impact_values):
+            contributions = weights[:, self.impact_rows] * self.impact_values
+            starts = np.flatnonzero(np.diff(self.impact_cols, prepend=-1))
+            out[:, self.impact_cols[starts]] = np.add.reduceat(contributions, starts, axis=1)
+        return out
+
+    def _event_counts(self, events_list):
+        """How many times each known event appears in events_list"""
+        idx = self.events.get_indexer(list(events_list))
+        return np.bincount(idx[idx >= 0], minlength=len(self.events)).astype(float)
+
+    @traced('event_impact.apply_impacts')
     def apply_impacts(self, baseline, events_list, year):
-        """Apply event impacts to baseline projections"""
+        """Apply event impacts to baseline projections
+
+        ``year`` may be a single index label, a list of labels, or None to
+        adjust every row of the baseline.
+        """
         adjusted = baseline.copy()
-        
-        for event in events_list:
-            if event in self.impact_matrix.index:
-                impacts = self.impact_matrix.loc[event]
-                for indicator, impact in impacts.items():
-                    if impact != 0 and indicator in adjusted.columns:
-                        adjusted.loc[year, indicator] += impact
-        
+
+        delta = self._propagate(self._event_counts(events_list))[0]
+        cols = self.indicators.get_indexer(adjusted.columns)
+        affected = adjusted.columns[cols >= 0]
+        if len(affected):
+            rows = adjusted.index if year is None else year
+            adjusted.loc[rows, affected] = (
+                adjusted.loc[rows, affected].to_numpy(dtype=float) + delta[cols[cols >= 0]]
+            )
+
         return adjusted
 
 if __name__ == "__main__":
@@ -0,0 +1,347 @@
+"""Report figures as declared jobs, rendered only when their inputs change
+
+A ``FigureJob`` names an output file, a module-level plot function, the data
+slice it draws and its plotting parameters. Its key is a hash of all of
+these plus the plot function's source. ``render_figures`` skips jobs whose
+key matches the one recorded in the ``.figures.json`` manifest next to their
+output, and renders the rest in a process pool on the Agg backend.
+
+Plot functions draw on a bare ``matplotlib.figure.Figure`` passed in as the
+first argument, so no pyplot state builds up across thousands of figures.
+"""
+import hashlib
+import inspect
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from src.instrumentation import count, span, traced
+
+DEFAULT_FIGURE_DIR = 'reports/figures'
+MANIFEST_NAME = '.figures.json'
+DEFAULT_DPI = 300
+# Bump to re-render every figure after a change outside the plot functions
+FIGURES_FORMAT = 1
+ACCOUNT_CODE = 'ACC_OWNERSHIP'
+
+_source_hashes = {}
+
+
+def _source_hash(plot):
+    if plot not in _source_hashes:
+        try:
+            source = inspect.getsource(plot).encode()
+        except (OSError, TypeError):
+            source = plot.__code__.co_code
+        _source_hashes[plot] = hashlib.sha256(source).hexdigest()
+    return _source_hashes[plot]
+
+
+def _data_hash(data, digest):
+    """Feed a frame, series or dict of them into ``digest``, labels included"""
+    if isinstance(data, dict):
+        for name in sorted(data):
+            digest.update(f'[{name}]'.encode())
+            _data_hash(data[name], digest)
+        return
+    if isinstance(data, pd.Series):
+        data = data.reset_index()
+    digest.update(json.dumps([str(col) for col in data.columns]).encode())
+    hashed = pd.util.hash_pandas_object(data.reset_index(drop=True), index=True)
+    digest.update(hashed.to_numpy().tobytes())
+
+
+class FigureJob:
+    """One figure: output path, plot function, input slice and parameters
+
+    ``plot(fig, data, **params)`` must be defined at module level so the job
+    can be sent to a worker process.
+    """
+
+    def __init__(self, path, plot, data, figsize=(10, 6), dpi=DEFAULT_DPI, **params):
+        self.path = path
+        self.plot = plot
+        self.data = data
+        self.figsize = tuple(figsize)
+        self.dpi = dpi
+        self.params = params
+
+    def key(self):
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            'format': FIGURES_FORMAT,
+            'plot': f'{self.plot.__module__}.{self.plot.__qualname__}',
+            'source': _source_hash(self.plot),
+            'figsize': self.figsize,
+            'dpi': self.dpi,
+            'params': self.params,
+        }, sort_keys=True, default=str).encode())
+        _data_hash(self.data, digest)
+        return digest.hexdigest()
+
+    def render(self):
+        """Draw the figure and write it atomically to ``path``"""
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=self.figsize)
+        self.plot(fig, self.data, **self.params)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        fig.savefig(tmp, dpi=self.dpi, bbox_inches='tight',
+                    format=os.path.splitext(self.path)[1].lstrip('.') or 'png')
+        os.replace(tmp, self.path)
+        return self.path
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(job):
+    return job.render()
+
+
+def _read_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST_NAME)
+    os.makedirs(directory or '.', exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+@traced('figures.render')
+def render_figures(jobs, workers=None, force=False):
+    """Render the jobs whose inputs changed since their last render
+
+    ``workers`` defaults to the CPU count; with one worker, or one figure to
+    draw, rendering happens in this process. ``force`` ignores the manifests.
+    Returns the ``rendered`` and ``skipped`` output paths.
+    """
+    jobs = list(jobs)
+    manifests = {}
+    pending, skipped = [], []
+    with span('figures.plan', jobs=len(jobs)):
+        for job in jobs:
+            directory, name = os.path.split(job.path)
+            if directory not in manifests:
+                manifests[directory] = _read_manifest(directory)
+            key = job.key()
+            if not force and manifests[directory].get(name) == key and os.path.exists(job.path):
+                skipped.append(job.path)
+            else:
+                pending.append((job, key))
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    rendered = []
+    try:
+        if workers <= 1:
+            results = (_render(job) for job, _ in pending)
+            for (job, key), path in zip(pending, results):
+                manifests[os.path.dirname(job.path)][os.path.basename(path)] = key
+                rendered.append(path)
+        else:
+            # Several jobs per task so thousands of small figures don't pay a round trip each
+            chunksize = max(1, len(pending) // (workers * 4))
+            with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+                results = pool.map(_render, [job for job, _ in pending], chunksize=chunksize)
+                for (job, key), path in zip(pending, results):
+                    manifests[os.path.dirname(job.path)][os.path.basename(path)] = key
+                    rendered.append(path)
+    finally:
+        # Record whatever finished, so a failed job doesn't re-render the others
+        for directory, manifest in manifests.items():
+            _write_manifest(directory, manifest)
+    count('figures_rendered', len(rendered))
+    return {'rendered': rendered, 'skipped': skipped}
+
+
+def _draw_trend(ax, data, title, ylabel, event_years=(), fill=False):
+    ax.plot(data['year'], data['value'], 'o-', linewidth=2, markersize=8, color='#2E86AB')
+    if fill:
+        ax.fill_between(data['year'], 0, data['value'], alpha=0.2, color='#2E86AB')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+    ax.grid(True, alpha=0.3)
+    for year in event_years:
+        ax.axvline(x=year, color='red', linestyle='--', alpha=0.5, linewidth=1)
+        ax.text(year, ax.get_ylim()[1] * 0.95, 'Event', rotation=90,
+                verticalalignment='top', fontsize=8, color='red')
+
+
+def plot_trend(fig, data, title, ylabel='Value', event_years=(), fill=False):
+    """Line chart of a series' ``year`` and ``value`` columns"""
+    _draw_trend(fig.add_subplot(), data, title, ylabel, event_years, fill)
+
+
+def plot_eda_overview(fig, data, title, ylabel):
+    """Trend with event markers, period growth bars and record type composition"""
+    ax1, ax2, ax3 = fig.subplots(3, 1)
+    if len(data['trend']):
+        _draw_trend(ax1, data['trend'], title, ylabel, data['events']['year'], fill=True)
+
+    growth = data['growth']
+    if len(growth):
+        colors = ['green' if g > 5 else 'orange' if g > 2 else 'red' for g in growth['change_pp']]
+        bars = ax2.bar(growth['year'].astype(str), growth['change_pp'], color=colors, alpha=0.7)
+        ax2.set_title('Growth in Account Ownership per Survey Period (Percentage Points)',
+                      fontsize=14, fontweight='bold')
+        ax2.set_xlabel('Period', fontsize=12)
+        ax2.set_ylabel('Growth (pp)', fontsize=12)
+        ax2.grid(True, alpha=0.3, axis='y')
+        for bar in bars:
+            height = bar.get_height()
+            ax2.text(bar.get_x() + bar.get_width() / 2., height, f'{height:+.1f}',
+                     ha='center', va='bottom', fontsize=9)
+
+    records = data['record_types']
+    ax3.pie(records['count'], labels=records['record_type'], autopct='%1.1f%%', startangle=90,
+            colors=['#4ECDC4', '#FF6B6B', '#FFE66D', '#95E1D3'][:len(records)])
+    ax3.set_title('Data Composition by Record Type', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+
+
+def plot_data_quality(fig, data):
+    """Record counts by confidence level and by year"""
+    ax1, ax2 = fig.subplots(1, 2)
+    confidence = data['confidence']
+    if len(confidence):
+        palette = {'high': 'green', 'medium': 'orange', 'low': 'red'}
+        ax1.bar(confidence['confidence'], confidence['count'],
+                color=[palette.get(c, 'gray') for c in confidence['confidence']], alpha=0.7)
+        ax1.set_title('Data Confidence Levels', fontsize=12, fontweight='bold')
+        ax1.set_xlabel('Confidence', fontsize=11)
+        ax1.set_ylabel('Count', fontsize=11)
+        for i, v in enumerate(confidence['count']):
+            ax1.text(i, v + 0.1, str(v), ha='center', fontsize=10)
+
+    yearly = data['years']
+    ax2.bar(yearly['year'].astype(str), yearly['count'], color='#6A4C93', alpha=0.7)
+    ax2.set_title('Data Points by Year', fontsize=12, fontweight='bold')
+    ax2.set_xlabel('Year', fontsize=11)
+    ax2.set_ylabel('Number of Records', fontsize=11)
+    ax2.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+
+def _years(data, time_col='observation_date'):
+    return pd.to_datetime(data[time_col], errors='coerce').dt.year
+
+
+def _counts(values, name):
+    counts = values.value_counts()
+    return pd.DataFrame({name: counts.index.astype(str), 'count': counts.to_numpy()})
+
+
+def eda_jobs(data, out_dir=DEFAULT_FIGURE_DIR, dpi=DEFAULT_DPI, only=None):
+    """Jobs for the EDA report figures of the unified data
+
+    ``eda_comprehensive.png`` (account ownership trend, its growth per
+    period and the record composition), ``eda_data_quality.png`` and
+    ``account_ownership.png``. ``only`` limits the jobs to those file names.
+    """
+    from src.analytics import growth_table
+
+    years = _years(data)
+    observations = data[(data['record_type'] == 'observation') & data['value_numeric'].notna()]
+    account = observations[observations['indicator_code'] == ACCOUNT_CODE]
+    trend = pd.DataFrame({'year': _years(account).to_numpy(),
+                          'value': account['value_numeric'].to_numpy(dtype=float)})
+    trend = trend.dropna().sort_values('year', kind='mergesort').reset_index(drop=True)
+    growth = growth_table(account)
+    growth = growth.loc[growth['change_pp'].notna(), ['year', 'change_pp']].reset_index(drop=True)
+    event_years = years[data['record_type'] == 'event'].dropna().astype(int)
+    title, ylabel = 'Account Ownership in Ethiopia', 'Account Ownership (%)'
+
+    jobs = [
+        FigureJob(os.path.join(out_dir, 'eda_comprehensive.png'), plot_eda_overview,
+                  {'trend': trend, 'growth': growth,
+                   'events': event_years.to_frame('year').reset_index(drop=True),
+                   'record_types': _counts(data['record_type'], 'record_type')},
+                  figsize=(15, 12), dpi=dpi, title=f'{title} (2011-2025)', ylabel=ylabel),
+        FigureJob(os.path.join(out_dir, 'eda_data_quality.png'), plot_data_quality,
+                  {'confidence': _counts(data['confidence'], 'confidence')
+                   if 'confidence' in data.columns else pd.DataFrame({'confidence': [], 'count': []}),
+                   'years': years.dropna().astype(int).value_counts().sort_index()
+                   .rename_axis('year').rename('count').reset_index()},
+                  figsize=(12, 5), dpi=dpi),
+        FigureJob(os.path.join(out_dir, 'account_ownership.png'), plot_trend, trend,
+                  dpi=dpi, title=title, ylabel=ylabel),
+    ]
+    if only is not None:
+        jobs = [job for job in jobs if os.path.basename(job.path) in only]
+    return jobs
+
+
+def _file_name(key):
+    """Readable file name for a series key, with a hash of the key so that
+    keys sanitized to the same text (``A/B`` and ``A_B``) stay distinct"""
+    parts = [str(part) for part in (key if isinstance(key, tuple) else (key,))]
+    stem = re.sub(r'[^A-Za-z0-9_.-]+', '_', '__'.join(parts))
+    digest = hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:8]
+    return f'{stem}-{digest}.png'
+
+
+def indicator_jobs(data, out_dir=os.path.join(DEFAULT_FIGURE_DIR, 'indicators'),
+                   group_cols=('indicator_code',), dpi=150):
+    """One trend figure per series of the observations
+
+    A series is one combination of ``group_cols``, such as indicator and
+    region, and is drawn to ``<out_dir>/<code>__<region>-<key hash>.png``.
+    """
+    group_cols = list(group_cols)
+    observations = data[(data['record_type'] == 'observation') & data['value_numeric'].notna()]
+    frame = pd.DataFrame({'year': _years(observations).to_numpy(),
+                          'value': observations['value_numeric'].to_numpy(dtype=float)})
+    for col in group_cols:
+        frame[col] = observations[col].to_numpy()
+    frame = frame.dropna(subset=['year']).sort_values('year', kind='mergesort')
+    jobs = []
+    for key, rows in frame.groupby(group_cols if len(group_cols) > 1 else group_cols[0],
+                                   sort=True, observed=True):
+        label = ' / '.join(str(part) for part in (key if isinstance(key, tuple) else (key,)))
+        jobs.append(FigureJob(os.path.join(out_dir, _file_name(key)), plot_trend,
+                              rows[['year', 'value']].reset_index(drop=True),
+                              dpi=dpi, title=label))
+    return jobs
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from src.data_store import load_store
+
+    data = load_store().data
+    rng = np.random.default_rng(0)
+    n_series, n_years = 100, 8
+    synthetic = pd.DataFrame({
+        'record_type': 'observation',
+        'indicator_code': np.repeat([f'IND_{i // 4:03d}' for i in range(n_series)], n_years),
+        'region': np.repeat(np.tile(['Addis Ababa', 'Amhara', 'Oromia', 'Tigray'], n_series // 4),
+                            n_years),
+        'observation_date': np.tile([f'{2015 + y}-12-31' for y in range(n_years)], n_series),
+        'value_numeric': rng.uniform(1, 90, n_series * n_years),
+    })
+    with tempfile.TemporaryDirectory() as out_dir:
+        jobs = eda_jobs(data, out_dir) + indicator_jobs(
+            synthetic, os.path.join(out_dir, 'indicators'), group_cols=('indicator_code', 'region'),
+            dpi=72)
+        for label in ('first run', 'no-op rerun'):
+            start = time.perf_counter()
+            result = render_figures(jobs)
+            print(f"{label}: rendered {len(result['rendered'])}, skipped {len(result['skipped'])} "
+                  f"in {time.perf_counter() - start:.2f}s")
@@ -1,35 +1,30 @@
 #!/usr/bin/env python3
 """
-Script to ensure EDA notebook has all required visualizations
-"""
-import json
-import nbformat
-from nbformat.v4 import new_markdown_cell, new_code_cell
+Check that the EDA notebook has all required visualizations
 
-# Read the existing notebook
-with open('notebooks/eda.ipynb', 'r', encoding='utf-8') as f:
-    notebook = nbformat.read(f, as_version=4)
+Run from the repository root with ``python -m src.fix_notebook [notebook]``.
+A chart counts as present when its cell in the executed notebook produced an
+image; rebuild the notebook with ``python -m src notebook`` to fix it.
+"""
+import sys
 
-# Check for required visualizations
-required_charts = [
-    "Account ownership trajectory (2011-2024)",
-    "Growth rates between survey years",
-    "Gender gap visualization",
-    "Urban vs rural ownership comparison",
-    "Mobile money account penetration trend",
-    "Digital payment adoption patterns",
-    "Infrastructure data plots",
-    "Event timeline visualization",
-    "Correlation heatmap"
-]
+from src.notebook_builder import verify_notebook
+from src.notebook_templates import REQUIRED_CHARTS
 
-print("Checking notebook for required visualizations...")
 
-# You would add code here to ensure all visualizations are present
-# For now, we'll just verify the notebook structure
+def main(path='notebooks/eda.ipynb'):
+    print("Checking notebook for required visualizations...")
+    problems = verify_notebook(path, REQUIRED_CHARTS)
+    for chart in REQUIRED_CHARTS:
+        print(f"  {'MISSING' if chart in problems else 'ok':<8} {chart}"
+              + (f" ({problems[chart]})" if chart in problems else ''))
+    if problems:
+        print(f"{len(problems)} of {len(REQUIRED_CHARTS)} required charts missing; "
+              "rebuild with: python -m src notebook")
+        return 1
+    print("All required visualizations present.")
+    return 0
 
-# Save the notebook
-with open('notebooks/eda.ipynb', 'w', encoding='utf-8') as f:
-    nbformat.write(notebook, f)
 
-print("Notebook structure verified.")
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
@@ -1,24 +1,644 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-import statsmodels.api as sm
-from datetime import datetime
+
+from src.instrumentation import count, traced
+
+# Resamples handled by one bootstrap task; fixed so results do not depend
+# on the number of worker processes.
+BOOTSTRAP_CHUNK = 100
+
+# Parameters of each diffusion curve, in the order they are fitted
+DIFFUSION_PARAMS = {
+    'logistic': ['saturation', 'rate', 'midpoint'],
+    'bass': ['market', 'innovation', 'imitation'],
+}
+
+def _to_year(values):
+    """Convert a date or numeric year column to float years"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    return pd.to_datetime(values, errors='coerce').dt.year.to_numpy(dtype=float)
+
+
+def _series_codes(data, group_cols):
+    """Assign an integer code to every series in a long-format frame"""
+    grouped = data.groupby(list(group_cols), sort=True, dropna=False, observed=True)
+    return grouped.ngroup().to_numpy(), grouped.size().index
+
+
+def _observations(data, time_col, value_col):
+    """Observation rows with a value and a parseable time, and their years"""
+    obs = data
+    if 'record_type' in obs.columns:
+        obs = obs[obs['record_type'] == 'observation']
+    obs = obs[obs[value_col].notna()]
+    years = _to_year(obs[time_col])
+    valid = ~np.isnan(years)
+    obs, years = obs[valid], years[valid]
+    if obs.empty:
+        raise ValueError("No observations to fit")
+    return obs, years
+
+
+def _series_digests(codes, x, y, n_series):
+    """Order-independent 64-bit digest of each series' (year, value) pairs
+
+    Row hashes are summed with wraparound, so the digest of a series with
+    appended rows is its old digest plus theirs.
+    """
+    rows = pd.util.hash_array(x) ^ (pd.util.hash_array(y) * np.uint64(0x9E3779B97F4A7C15))
+    digests = np.zeros(n_series, dtype=np.uint64)
+    np.add.at(digests, codes, rows)
+    return digests
+
+
+def _sufficient_stats(codes, x, y, n_series):
+    """Per-series sums [n, sum_x, sum_y, sum_xx, sum_xy, sum_yy]"""
+    stats = np.empty((n_series, 6))
+    stats[:, 0] = np.bincount(codes, minlength=n_series)
+    for i, w in enumerate([x, y, x * x, x * y, y * y], start=1):
+        stats[:, i] = np.bincount(codes, weights=w, minlength=n_series)
+    return stats
+
+
+def _solve_coefficients(stats):
+    """Closed-form simple regression coefficients from per-series sums"""
+    n, sx, sy, sxx, sxy = stats[:, 0], stats[:, 1], stats[:, 2], stats[:, 3], stats[:, 4]
+    x_mean = sx / n
+    y_mean = sy / n
+    s_xx = sxx - n * x_mean ** 2
+    s_xy = sxy - n * x_mean * y_mean
+    # Series observed at a single year get a flat trend
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(s_xx > 1e-12, s_xy / s_xx, 0.0)
+    intercept = y_mean - slope * x_mean
+    return np.column_stack([intercept, slope])
+
+
+def residual_variance(stats, coefficients):
+    """Residual variance of every series' trend fit, NaN below three observations"""
+    n, sx, sy, sxx, sxy, syy = stats.T
+    slope = coefficients[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s_xy = sxy - sx * sy / n
+        s_yy = syy - sy ** 2 / n
+        sse = np.clip(s_yy - slope * s_xy, 0.0, None)
+        return np.where(n > 2, sse / (n - 2), np.nan)
+
+
+def prediction_intervals(stats, coefficients, x, level=0.95):
+    """Residual-based prediction interval half-widths for every series and year
+
+    ``stats`` and ``coefficients`` hold one row per series, ``x`` the forecast
+    years measured from the fit's year origin. The standard error combines the
+    residual variance with the leverage of each forecast year,
+    s * sqrt(1 + 1/n + (x - x_mean)^2 / S_xx), scaled by a Student-t quantile
+    on n - 2 degrees of freedom. Series with fewer than three observations
+    get NaN half-widths.
+    """
+    from scipy import stats as st
+
+    n, sx, sy, sxx, sxy, syy = stats.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = sx / n
+        s_xx = sxx - n * x_mean ** 2
+        dof = n - 2
+        sigma = np.sqrt(residual_variance(stats, coefficients))
+        leverage = 1.0 / n[:, None] + (np.asarray(x)[None, :] - x_mean[:, None]) ** 2 / s_xx[:, None]
+        t_crit = st.t.ppf(0.5 + level / 2, np.where(dof > 0, dof, np.nan))
+    return (t_crit * sigma)[:, None] * np.sqrt(1.0 + leverage)
+
+
+def _logistic_curve(params, t):
+    """Logistic S-curve K / (1 + exp(-r (t - t0))) and its Jacobian, per row"""
+    K, r, t0 = params.T
+    e = np.exp(np.clip(-r * (t - t0), -50, 50))
+    d = 1.0 + e
+    jacobian = np.column_stack([1.0 / d, K * e * (t - t0) / d ** 2, -K * e * r / d ** 2])
+    return K / d, jacobian
+
+
+def _bass_curve(params, t):
+    """Cumulative Bass adoption m (1 - e) / (1 + q/p e), e = exp(-(p+q) t), and its Jacobian"""
+    m, p, q = params.T
+    e = np.exp(-(p + q) * t)
+    ratio = q / p
+    num = 1.0 - e
+    den = 1.0 + ratio * e
+    adoption = num / den
+    d_num = t * e
+    d_den_p = -ratio * e * (1.0 / p + t)
+    d_den_q = e * (1.0 / p - ratio * t)
+    jacobian = np.column_stack([
+        adoption,
+        m * (d_num * den - num * d_den_p) / den ** 2,
+        m * (d_num * den - num * d_den_q) / den ** 2,
+    ])
+    return m * adoption, jacobian
+
+
+DIFFUSION_CURVES = {'logistic': _logistic_curve, 'bass': _bass_curve}
+
+# Saturation bound of series that aren't percentages, as a multiple of their peak
+CAPACITY_MARGIN = 2.0
+
+
+def diffusion_capacity(data, group_cols=('indicator_code',), value_col='value_numeric'):
+    """Saturation bound of every series: 100 for percentages, else a margin over the peak
+
+    A series is a percentage when its indicator name contains '%' or it is
+    in the access or usage pillar (shares of adults), and it never exceeds
+    100. Densities and counts such as agents per 100k adults are bounded by
+    ``CAPACITY_MARGIN`` times their highest observed value.
+    """
+    codes, keys = _series_codes(data, group_cols)
+    n_series = len(keys)
+    peak = np.zeros(n_series)
+    np.maximum.at(peak, codes, data[value_col].to_numpy(dtype=float))
+    percent = np.zeros(len(data), dtype=bool)
+    if 'indicator' in data.columns:
+        percent |= data['indicator'].astype(str).str.contains('%', regex=False).to_numpy()
+    if 'pillar' in data.columns:
+        percent |= data['pillar'].isin(['access', 'usage']).to_numpy()
+    is_percent = np.bincount(codes, weights=percent, minlength=n_series) > 0
+    capacity = np.where(is_percent & (peak <= 100.0), 100.0,
+                        np.maximum(peak * CAPACITY_MARGIN, 1e-3))
+    return pd.Series(capacity, index=keys, name='capacity')
+
+
+def _batched_levenberg_marquardt(curve, params, codes, t, y, lower, upper, max_iter=200, tol=1e-10):
+    """Least-squares fit of one curve per series, all series at once
+
+    ``params`` holds one starting row per series and ``codes`` maps each
+    observation to its series. Every iteration builds each series' normal
+    equations from bincounts, solves the damped systems in one batched
+    ``np.linalg.solve`` and clips steps to the bounds. Damping adapts per
+    series, and series drop out of the iteration once their SSE stops
+    improving, so warm-started series that are already fitted cost only a
+    couple of passes. ``lower`` and ``upper`` bound each parameter, either
+    for all series or per series. Returns the parameters, per-series SSE
+    and a converged flag.
+    """
+    n_series, n_params = params.shape
+    lower = np.broadcast_to(lower, params.shape)
+    upper = np.broadcast_to(upper, params.shape)
+    params = np.clip(params, lower, upper)
+    damping = np.full(n_series, 1e-3)
+    active = np.ones(n_series, dtype=bool)
+    pairs = [(i, j) for i in range(n_params) for j in range(i, n_params)]
+
+    fitted, _ = curve(params[codes], t)
+    sse = np.bincount(codes, weights=(y - fitted) ** 2, minlength=n_series)
+    for _ in range(max_iter):
+        series = np.flatnonzero(active)
+        if not len(series):
+            break
+        # Work on the observations of still-active series only
+        rows = active[codes]
+        sub_codes = (np.cumsum(active) - 1)[codes[rows]]
+        sub_t, sub_y = t[rows], y[rows]
+        n_active = len(series)
+        current = params[series]
+        low, high = lower[series], upper[series]
+
+        fitted, jacobian = curve(current[sub_codes], sub_t)
+        residuals = sub_y - fitted
+        normal = np.zeros((n_active, n_params, n_params))
+        for i, j in pairs:
+            normal[:, i, j] = normal[:, j, i] = np.bincount(
+                sub_codes, weights=jacobian[:, i] * jacobian[:, j], minlength=n_active)
+        gradient = np.column_stack([np.bincount(sub_codes, weights=jacobian[:, i] * residuals,
+                                                minlength=n_active) for i in range(n_params)])
+        diagonal = np.einsum('nii->ni', normal)
+        system = normal + (damping[series, None] * diagonal + 1e-12)[:, :, None] * np.eye(n_params)
+        step = np.linalg.solve(system, gradient[:, :, None])[:, :, 0]
+        # Hold parameters that sit on a bound and would step past it, and
+        # re-solve for the rest, instead of letting clipping stall the fit
+        pinned = ((current <= low) & (step < 0)) | ((current >= high) & (step > 0))
+        if pinned.any():
+            free = (~pinned).astype(float)
+            system = system * free[:, :, None] * free[:, None, :] + pinned[:, :, None] * np.eye(n_params)
+            step = np.linalg.solve(system, (gradient * free)[:, :, None])[:, :, 0]
+        candidate = np.clip(current + step, low, high)
+
+        new_fitted, _ = curve(candidate[sub_codes], sub_t)
+        new_sse = np.bincount(sub_codes, weights=(sub_y - new_fitted) ** 2, minlength=n_active)
+        old_sse = sse[series]
+        better = new_sse < old_sse
+        improvement = np.where(better, (old_sse - new_sse) / np.maximum(old_sse, 1e-12), 0.0)
+        params[series[better]] = candidate[better]
+        sse[series[better]] = new_sse[better]
+        damping[series] = np.where(better, damping[series] / 10, damping[series] * 10)
+        done = (better & (improvement < tol)) | (damping[series] > 1e10)
+        active[series[done]] = False
+    return params, sse, ~active
+
+
+def _bootstrap_worker(task):
+    """Run one chunk of residual-bootstrap resamples"""
+    codes, x, fitted, residuals, starts, counts, design, n_boot, seed = task
+    rng = np.random.default_rng(seed)
+    n_series = len(counts)
+    out = np.empty((n_boot, n_series, design.shape[0]))
+    for b in range(n_boot):
+        draw = starts[codes] + (rng.random(len(codes)) * counts[codes]).astype(np.int64)
+        y_star = fitted + residuals[draw]
+        coef = _solve_coefficients(_sufficient_stats(codes, x, y_star, n_series))
+        # Future noise: one resampled residual per series and forecast year
+        noise_draw = starts[:, None] + (rng.random((n_series, design.shape[0])) * counts[:, None]).astype(np.int64)
+        out[b] = coef @ design.T + residuals[noise_draw]
+    return out
+
 
 class FinancialInclusionForecaster:
     def __init__(self):
         self.models = {}
+        # Batch state: one row per series, coefficients as [intercept, slope]
+        # on years measured from year_origin, and the per-series sums
+        # [n, sum_x, sum_y, sum_xx, sum_xy, sum_yy] the fit was solved from.
+        self.series_index = None
+        self.coefficients = None
+        self.batch_stats = None
+        self.year_origin = None
+        self.group_cols = None
+        # Content digest of every series' data at its last fit or update
+        self.series_digests = None
+        self.model_stats = {}
+        # Fitted observations as chunks of (series row, year offset, value),
+        # needed only for bootstrap intervals. Updates append a chunk and the
+        # chunks are joined when a bootstrap needs them. None when the fit
+        # was restored from saved state or made with keep_observations=False.
+        self._batch_obs = None
+        # Diffusion fits by curve: parameters per series (midpoints in
+        # calendar years), SSE and convergence, kept for warm starts
+        self.diffusion = {}
         
+    @traced('forecasting.fit_trend_model')
     def fit_trend_model(self, historical_data, indicator):
         """Fit linear trend model to historical data"""
+        from sklearn.linear_model import LinearRegression
+
         X = np.array(historical_data['year']).reshape(-1, 1)
         y = historical_data[indicator].values
         
         model = LinearRegression()
         model.fit(X, y)
+        count('series_fitted')
+        count('rows_scanned', len(y))
         
         self.models[indicator] = model
+        origin = int(X.min())
+        x = X[:, 0].astype(float) - origin
+        self.model_stats[indicator] = (origin, _sufficient_stats(
+            np.zeros(len(x), dtype=np.int64), x, y.astype(float), 1))
+        return model
+
+    def update_trend_model(self, indicator, years, values):
+        """Add observations to a fit_trend_model model without refitting"""
+        if indicator not in self.models:
+            raise ValueError(f"No model trained for {indicator}")
+        origin, stats = self.model_stats[indicator]
+        x = np.atleast_1d(np.asarray(years, dtype=float)) - origin
+        y = np.atleast_1d(np.asarray(values, dtype=float))
+        stats = stats + _sufficient_stats(np.zeros(len(x), dtype=np.int64), x, y, 1)
+        intercept, slope = _solve_coefficients(stats)[0]
+
+        model = self.models[indicator]
+        model.coef_ = np.array([slope])
+        model.intercept_ = intercept - slope * origin
+        self.model_stats[indicator] = (origin, stats)
         return model
     
+    @traced('forecasting.fit_batch')
+    def fit_batch(self, data, group_cols=('indicator_code',), time_col='observation_date',
+                  value_col='value_numeric', keep_observations=True):
+        """Fit linear trends for every series of a long-format frame at once
+
+        Each series is one combination of ``group_cols`` (e.g. indicator_code,
+        region, gender). The least-squares solution is computed in closed form
+        from per-series sums, so thousands of series cost a few array passes.
+        Without ``keep_observations`` only the sums are kept, which is enough
+        for forecasts and analytic intervals but not for bootstrap ones.
+        """
+        obs, years = _observations(data, time_col, value_col)
+
+        codes, keys = _series_codes(obs, group_cols)
+        self.year_origin = int(years.min())
+        x = years - self.year_origin
+        y = obs[value_col].to_numpy(dtype=float)
+
+        self.series_index = keys
+        self.group_cols = list(group_cols)
+        self.batch_stats = _sufficient_stats(codes, x, y, len(keys))
+        self.coefficients = _solve_coefficients(self.batch_stats)
+        self.series_digests = _series_digests(codes, x, y, len(keys))
+        self._batch_obs = [(codes, x, y)] if keep_observations else None
+        count('series_fitted', len(keys))
+        count('rows_scanned', len(y))
+        return self.coefficients
+
+    def fit_store(self, store, pillar=None):
+        """fit_batch over the observations of a FinancialInclusionStore
+
+        The store's rows are already typed and sorted by indicator and date,
+        so selecting them is an index lookup rather than a scan of the
+        unified frame.
+        """
+        return self.fit_batch(store.observations(pillar=pillar))
+
+    def _key_positions(self, keys):
+        """Rows of the batch state for some series keys, appending unseen series"""
+        positions = self.series_index.get_indexer(keys)
+        new = positions < 0
+        n_new = int(new.sum())
+        if n_new:
+            positions[new] = len(self.series_index) + np.arange(n_new)
+            self.series_index = self.series_index.append(keys[new])
+            self.batch_stats = np.vstack([self.batch_stats, np.zeros((n_new, 6))])
+            self.coefficients = np.vstack([self.coefficients, np.zeros((n_new, 2))])
+            self.series_digests = np.concatenate([self.series_digests, np.zeros(n_new, dtype=np.uint64)])
+        return positions
+
+    @traced('forecasting.update_batch')
+    def update_batch(self, data, time_col='observation_date', value_col='value_numeric'):
+        """Add new observations, e.g. a survey wave, to the batch fit
+
+        The new rows' sums are added to their series' sufficient statistics
+        and only those series are re-solved, so the cost grows with the new
+        data, not the history. Interval widths follow from the updated sums.
+        Unseen series are appended. Returns the keys of the updated series.
+        """
+        if self.batch_stats is None:
+            raise ValueError("No batch models trained")
+        obs, years = _observations(data, time_col, value_col)
+        codes, keys = _series_codes(obs, self.group_cols)
+        x = years - self.year_origin
+        y = obs[value_col].to_numpy(dtype=float)
+
+        positions = self._key_positions(keys)
+        self.batch_stats[positions] += _sufficient_stats(codes, x, y, len(keys))
+        self.coefficients[positions] = _solve_coefficients(self.batch_stats[positions])
+        self.series_digests[positions] += _series_digests(codes, x, y, len(keys))
+        if self._batch_obs is not None:
+            self._batch_obs.append((positions[codes], x, y))
+        count('series_fitted', len(keys))
+        count('rows_scanned', len(y))
+        return keys
+
+    @traced('forecasting.sync_batch')
+    def sync_batch(self, data, time_col='observation_date', value_col='value_numeric'):
+        """Bring the batch fit in line with the full current dataset
+
+        Series whose data digest matches the last fit are left alone; new
+        series and series with added, edited or removed rows are re-solved
+        from their own rows only. Returns the keys of the series that changed.
+        """
+        if self.batch_stats is None:
+            self.fit_batch(data, time_col=time_col, value_col=value_col)
+            return self.series_index
+        obs, years = _observations(data, time_col, value_col)
+        codes, keys = _series_codes(obs, self.group_cols)
+        x = years - self.year_origin
+        y = obs[value_col].to_numpy(dtype=float)
+
+        digests = _series_digests(codes, x, y, len(keys))
+        known = self.series_index.get_indexer(keys)
+        changed = (known < 0) | (digests != self.series_digests[np.maximum(known, 0)])
+        positions = self._key_positions(keys)
+        self._batch_obs = [(positions[codes], x, y)]
+        count('rows_scanned', len(y))
+        count('series_fitted', int(changed.sum()))
+        if not changed.any():
+            return keys[:0]
+
+        rows = changed[codes]
+        sub_codes = (np.cumsum(changed) - 1)[codes[rows]]
+        target = positions[changed]
+        self.batch_stats[target] = _sufficient_stats(sub_codes, x[rows], y[rows], int(changed.sum()))
+        self.coefficients[target] = _solve_coefficients(self.batch_stats[target])
+        self.series_digests[target] = digests[changed]
+        return keys[changed]
+
+    def save_state(self, path):
+        """Write the batch fit, its sums and digests to an .npz file
+
+        Raw observations are not saved; after load_state, run sync_batch on
+        the current data before asking for bootstrap intervals.
+        """
+        if self.batch_stats is None:
+            raise ValueError("No batch models trained")
+        keys = self.series_index.to_frame(index=False)
+        np.savez(path, group_cols=np.array(self.group_cols, dtype=str),
+                 year_origin=self.year_origin, batch_stats=self.batch_stats,
+                 coefficients=self.coefficients, series_digests=self.series_digests,
+                 **{f'key_{i}': keys[col].astype(str).to_numpy(dtype=str)
+                    for i, col in enumerate(keys.columns)})
+
+    def load_state(self, path):
+        """Restore a batch fit written by save_state"""
+        with np.load(path) as state:
+            self.group_cols = list(state['group_cols'])
+            keys = [state[f'key_{i}'] for i in range(len(self.group_cols))]
+            if len(keys) == 1:
+                self.series_index = pd.Index(keys[0], name=self.group_cols[0])
+            else:
+                self.series_index = pd.MultiIndex.from_arrays(keys, names=self.group_cols)
+            self.year_origin = int(state['year_origin'])
+            self.batch_stats = state['batch_stats']
+            self.coefficients = state['coefficients']
+            self.series_digests = state['series_digests']
+            self._batch_obs = None
+        return self
+
+    @traced('forecasting.forecast_batch')
+    def forecast_batch(self, years):
+        """Predict every batch-fitted series for the given years
+
+        Returns a frame with one row per series and one column per year.
+        """
+        if self.coefficients is None:
+            raise ValueError("No batch models trained")
+
+        years = list(years)
+        predictions = self.coefficients @ self._design(years).T
+        return pd.DataFrame(predictions, index=self.series_index, columns=years)
+
+    def _design(self, years):
+        return np.column_stack([
+            np.ones(len(years)),
+            np.asarray(years, dtype=float) - self.year_origin
+        ])
+
+    @traced('forecasting.forecast_intervals')
+    def forecast_intervals(self, years, level=0.95, method='analytic', n_boot=1000,
+                           seed=0, n_jobs=None):
+        """Forecasts with prediction intervals for every batch-fitted series
+
+        ``method='analytic'`` uses the residual variance and leverage of each
+        series; ``method='bootstrap'`` resamples residuals ``n_boot`` times,
+        spread over a process pool of ``n_jobs`` workers (1 runs in-process).
+        Results are reproducible for a given ``seed`` whatever ``n_jobs`` is.
+        Returns a long frame with one row per series and year.
+        """
+        if self.coefficients is None:
+            raise ValueError("No batch models trained")
+
+        years = list(years)
+        design = self._design(years)
+        predictions = self.coefficients @ design.T
+        if method == 'analytic':
+            half_width = prediction_intervals(self.batch_stats, self.coefficients,
+                                              design[:, 1], level)
+            lower = predictions - half_width
+            upper = predictions + half_width
+        elif method == 'bootstrap':
+            samples = self._bootstrap(design, n_boot, seed, n_jobs)
+            alpha = (1 - level) / 2
+            lower, upper = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+            # Too few points to estimate residual spread
+            too_short = self.batch_stats[:, 0] <= 2
+            lower[too_short] = np.nan
+            upper[too_short] = np.nan
+        else:
+            raise ValueError(f"Unknown interval method: {method}")
+
+        n_series, n_years = predictions.shape
+        index = self.series_index.repeat(n_years)
+        return pd.DataFrame({
+            'year': np.tile(years, n_series),
+            'prediction': predictions.ravel(),
+            'lower_bound': lower.ravel(),
+            'upper_bound': upper.ravel()
+        }, index=index).reset_index()
+
+    @traced('forecasting.fit_diffusion')
+    def fit_diffusion(self, data, curve='logistic', group_cols=('indicator_code',),
+                      time_col='observation_date', value_col='value_numeric', capacity=None,
+                      initial=None, max_iter=200):
+        """Fit a logistic or Bass diffusion curve to every series at once
+
+        Saturation levels are bounded by ``capacity``: a number for every
+        series, a Series of bounds indexed like the series, or None to
+        derive them with ``diffusion_capacity`` (100 for percentages).
+        Starting values come from ``initial`` (a frame of parameters indexed
+        like the series, e.g. last night's fit), else from this forecaster's
+        previous fit of the same curve; series without one start from a
+        logit-linear regression. Bass time is measured in years from the
+        year before each fit's first observation. Returns one row of
+        parameters per series with its SSE, observation count and whether
+        it converged.
+        """
+        if curve not in DIFFUSION_CURVES:
+            raise ValueError(f"Unknown diffusion curve: {curve}")
+        obs, years = _observations(data, time_col, value_col)
+
+        codes, keys = _series_codes(obs, group_cols)
+        y = obs[value_col].to_numpy(dtype=float)
+        n_series = len(keys)
+        start_year = years.min() - 1.0
+        t = years - start_year
+        if capacity is None:
+            capacity = diffusion_capacity(obs, group_cols, value_col)
+        if isinstance(capacity, pd.Series):
+            capacity = capacity.reindex(keys).to_numpy(dtype=float)
+            if np.isnan(capacity).any():
+                raise ValueError(f"No capacity for series: {list(keys[np.isnan(capacity)])}")
+        else:
+            capacity = np.full(n_series, float(capacity))
+
+        # Cold start: saturation above the peak, rate and midpoint from a
+        # straight line through logit(y / K)
+        peak = np.zeros(n_series)
+        np.maximum.at(peak, codes, y)
+        saturation = np.minimum(np.maximum(peak * 1.25, 1e-3), capacity)
+        share = np.clip(y / saturation[codes], 1e-3, 1 - 1e-3)
+        line = _solve_coefficients(_sufficient_stats(codes, t, np.log(share / (1 - share)), n_series))
+        rate = np.clip(line[:, 1], 0.05, 2.0)
+        if curve == 'logistic':
+            params = np.column_stack([saturation, rate, -line[:, 0] / rate])
+            lower = np.array([1e-6, 1e-4, -200.0])
+            upper = np.column_stack([capacity, np.full(n_series, 5.0), np.full(n_series, 300.0)])
+        else:
+            params = np.column_stack([saturation, np.full(n_series, 0.03), rate])
+            lower = np.array([1e-6, 1e-6, 0.0])
+            upper = np.column_stack([capacity, np.full(n_series, 1.0), np.full(n_series, 5.0)])
+
+        previous = initial
+        if previous is None and curve in self.diffusion:
+            previous = self.diffusion[curve]['params']
+        if previous is not None:
+            warm = previous.reindex(keys)[DIFFUSION_PARAMS[curve]].to_numpy(dtype=float, copy=True)
+            if curve == 'logistic':
+                warm[:, 2] -= start_year
+            known = ~np.isnan(warm).any(axis=1)
+            params[known] = warm[known]
+
+        params, sse, converged = _batched_levenberg_marquardt(
+            DIFFUSION_CURVES[curve], params, codes, t, y, lower, upper, max_iter)
+        if curve == 'logistic':
+            params[:, 2] += start_year
+
+        result = pd.DataFrame(params, index=keys, columns=DIFFUSION_PARAMS[curve])
+        result['sse'] = sse
+        result['n_obs'] = np.bincount(codes, minlength=n_series)
+        result['converged'] = converged
+        self.diffusion[curve] = {'params': result, 'start_year': start_year}
+        count('series_fitted', n_series)
+        count('rows_scanned', len(y))
+        return result
+
+    @traced('forecasting.forecast_diffusion')
+    def forecast_diffusion(self, years, curve='logistic'):
+        """Predict every diffusion-fitted series, one row per series and a column per year"""
+        if curve not in self.diffusion:
+            raise ValueError(f"No {curve} diffusion models trained")
+        fit = self.diffusion[curve]
+        params = fit['params'][DIFFUSION_PARAMS[curve]].to_numpy(dtype=float)
+        years = np.asarray(list(years), dtype=float)
+        if curve == 'logistic':
+            t = years
+        else:
+            t = years - fit['start_year']
+        n_series = len(params)
+        rows = np.repeat(np.arange(n_series), len(years))
+        predictions, _ = DIFFUSION_CURVES[curve](params[rows], np.tile(t, n_series))
+        return pd.DataFrame(predictions.reshape(n_series, len(years)),
+                            index=fit['params'].index, columns=list(years.astype(int)))
+
+    def _bootstrap(self, design, n_boot, seed, n_jobs):
+        """Residual-bootstrap forecast samples, shape (n_boot, n_series, n_years)"""
+        if self._batch_obs is None:
+            raise ValueError("Bootstrap intervals need the fitted observations, which this fit "
+                             "doesn't keep; run sync_batch on the current data first")
+        if len(self._batch_obs) > 1:
+            self._batch_obs = [tuple(np.concatenate(parts) for parts in zip(*self._batch_obs))]
+        codes, x, y = self._batch_obs[0]
+        fitted = self.coefficients[codes, 0] + self.coefficients[codes, 1] * x
+        counts = self.batch_stats[:, 0].astype(np.int64)
+        # Inflate residuals for the two fitted parameters
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.where(counts > 2, np.sqrt(counts / np.maximum(counts - 2, 1)), 0.0)
+        order = np.argsort(codes, kind='stable')
+        residuals = ((y - fitted) * scale[codes])[order]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        sizes = [min(BOOTSTRAP_CHUNK, n_boot - i) for i in range(0, n_boot, BOOTSTRAP_CHUNK)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(codes, x, fitted, residuals, starts, counts, design, size, s)
+                 for size, s in zip(sizes, seeds)]
+
+        n_jobs = n_jobs or os.cpu_count()
+        if n_jobs == 1 or len(tasks) == 1:
+            chunks = [_bootstrap_worker(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+                chunks = list(pool.map(_bootstrap_worker, tasks))
+        return np.concatenate(chunks)
+
+    @traced('forecasting.forecast')
     def forecast(self, indicator, years):
         """Generate forecasts for future years"""
         if indicator not in self.models:
@@ -27,10 +647,13 @@ class FinancialInclusionForecaster:
         years_array = np.array(years).reshape(-1, 1)
         predictions = self.models[indicator].predict(years_array)
         
-        # Add confidence intervals (simplified)
-        std_error = 0.02  # 2% standard error for illustration
-        lower_bound = predictions - 1.96 * std_error
-        upper_bound = predictions + 1.96 * std_error
+        # 95% prediction intervals from the residuals of the fitted trend
+        origin, stats = self.model_stats[indicator]
+        model = self.models[indicator]
+        coefficients = np.array([[model.intercept_ + model.coef_[0] * origin, model.coef_[0]]])
+        half_width = prediction_intervals(stats, coefficients, years_array[:, 0] - origin)[0]
+        lower_bound = predictions - half_width
+        upper_bound = predictions + half_width
         
         forecasts = pd.DataFrame({
             'year': years,
@@ -41,6 +664,7 @@ class FinancialInclusionForecaster:
         
         return forecasts
     
+    @traced('forecasting.create_scenarios')
     def create_scenarios(self, baseline, events_model, events_list):
         """Create optimistic, baseline, and pessimistic scenarios"""
         scenarios = {}
@@ -49,9 +673,7 @@ class FinancialInclusionForecaster:
         scenarios['baseline'] = baseline
         
         # Optimistic scenario (with positive events)
-        optimistic = baseline.copy()
-        for year in [2025, 2026, 2027]:
-            optimistic = events_model.apply_impacts(optimistic, events_list, year)
+        optimistic = events_model.apply_impacts_over_time(baseline, events_list)
         scenarios['optimistic'] = optimistic
         
         # Pessimistic scenario (reduced growth)
@@ -79,3 +701,19 @@ if __name__ == "__main__":
     
     print("Forecasts for Account Ownership:")
     print(forecasts)
+
+    # Batch fit over the unified long-format schema
+    long_format = pd.DataFrame({
+        'indicator_code': ['ACC_OWNERSHIP'] * 5,
+        'observation_date': ['2011-12-31', '2014-12-31', '2017-12-31', '2021-12-31', '2024-12-31'],
+        'value_numeric': [14.0, 22.0, 35.0, 46.0, 49.0]
+    })
+    forecaster.fit_batch(long_format)
+    print("\nBatch forecasts:")
+    print(forecaster.forecast_batch(future_years))
+
+    # Saturating diffusion curves bend below the straight-line trend
+    for curve in DIFFUSION_PARAMS:
+        forecaster.fit_diffusion(long_format, curve=curve)
+        print(f"\n{curve.title()} diffusion forecasts:")
+        print(forecaster.forecast_diffusion(future_years, curve=curve))
@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HTTP_CACHE_DIR = 'data/cache/http'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Where each source is fetched from; {country} and {series} come from the spec.
+# GSMA data is a licensed CSV export, so it needs a base_url to be configured.
+SOURCES = {
+    'worldbank': {
+        'base_url': 'https://api.worldbank.org/v2',
+        'path': '/country/{country}/indicator/{series}?format=json&per_page=1000',
+        'format': 'worldbank',
+    },
+    'imf': {
+        'base_url': 'http://dataservices.imf.org/REST/SDMX_JSON.svc',
+        'path': '/CompactData/FAS/A.{country}.{series}',
+        'format': 'sdmx',
+    },
+    'gsma': {
+        'base_url': None,
+        'path': '/export/{series}.csv?iso={country}',
+        'format': 'csv',
+    },
+}
+
+# Indicators refreshed by default. The World Bank API republishes Findex and
+# the IMF Financial Access Survey under its own series codes.
+INDICATOR_SPECS = [
+    {'indicator_code': 'ACC_OWNERSHIP', 'indicator': 'Account Ownership', 'pillar': 'access',
+     'source': 'worldbank', 'series': 'FX.OWN.TOTL.ZS', 'country': 'ETH',
+     'source_name': 'Global Findex'},
+    {'indicator_code': 'INF_ATM_DENSITY', 'indicator': 'ATM per 100k adults',
+     'pillar': 'infrastructure', 'source': 'worldbank', 'series': 'FB.ATM.TOTL.P5',
+     'country': 'ETH', 'source_name': 'IMF FAS'},
+    {'indicator_code': 'INF_BANK_DENSITY', 'indicator': 'Bank Branches per 100k adults',
+     'pillar': 'infrastructure', 'source': 'worldbank', 'series': 'FB.CBK.BRCH.P5',
+     'country': 'ETH', 'source_name': 'IMF FAS'},
+    {'indicator_code': 'INF_4G_COVERAGE', 'indicator': '4G Coverage (%)',
+     'pillar': 'infrastructure', 'source': 'gsma', 'series': '4g_coverage', 'country': 'ETH',
+     'source_name': 'GSMA'},
+]
+
+
+def _year_end(years):
+    """Year-only periods as the year-end dates used in the unified data"""
+    return pd.Series(years).astype(str).str[:4] + '-12-31'
+
+
+def parse_worldbank(payload):
+    """World Bank API JSON: ``[metadata, [{'date': '2021', 'value': 46.5}, ...]]``"""
+    data = json.loads(payload)
+    rows = data[1] if len(data) > 1 and data[1] else []
+    frame = pd.DataFrame({'year': [row['date'] for row in rows],
+                          'value': [row['value'] for row in rows]})
+    return frame
+
+
+def parse_sdmx(payload):
+    """IMF SDMX-JSON CompactData with a single series of ``@TIME_PERIOD``/``@OBS_VALUE``"""
+    series = json.loads(payload)['CompactData']['DataSet'].get('Series', {})
+    obs = series.get('Obs', [])
+    obs = [obs] if isinstance(obs, dict) else obs
+    return pd.DataFrame({'year': [o['@TIME_PERIOD'] for o in obs],
+                         'value': [o.get('@OBS_VALUE') for o in obs]})
+
+
+def parse_csv(payload):
+    """CSV export with ``Year`` and ``Value`` columns"""
+    frame = pd.read_csv(io.BytesIO(payload))
+    return pd.DataFrame({'year': frame['Year'], 'value': frame['Value']})
+
+
+PARSERS = {'worldbank': parse_worldbank, 'sdmx': parse_sdmx, 'csv': parse_csv}
+
+
+def to_unified(parsed, specs):
+    """Map parsed rows onto the unified schema
+
+    ``parsed`` holds ``year``, ``value``, ``url`` and ``spec`` (position of
+    the row's spec in ``specs``); all payloads are mapped in one pass.
+    """
+    values = pd.to_numeric(parsed['value'], errors='coerce')
+    parsed = parsed[values.notna()].reset_index(drop=True)
+    values = values[values.notna()].round(2).to_numpy()
+    meta = pd.DataFrame(specs).iloc[parsed['spec'].to_numpy()].reset_index(drop=True)
+    return pd.DataFrame({
+        'record_type': 'observation',
+        'pillar': meta['pillar'],
+        'indicator': meta['indicator'],
+        'indicator_code': meta['indicator_code'],
+        'value_numeric': values,
+        'observation_date': _year_end(parsed['year']),
+        'source_name': meta['source_name'],
+        'source_url': parsed['url'],
+        'confidence': 'high',
+        'original_text': meta['series'] + ' = ' + pd.Series(values).astype(str),
+        'collected_by': 'Ingest',
+        'collection_date': date.today().isoformat(),
+        'notes': meta['source'] + ' series ' + meta['series'],
+    })
+
+
+def spec_url(spec, base_urls=None):
+    """URL of a spec's payload, or None when its source has no base_url"""
+    source = SOURCES[spec['source']]
+    base_url = (base_urls or {}).get(spec['source'], source['base_url'])
+    if base_url is None:
+        return None
+    return base_url.rstrip('/') + source['path'].format(**spec)
+
+
+class ResponseCache:
+    """On-disk cache of response bodies with their ETag and content hash"""
+
+    def __init__(self, cache_dir=DEFAULT_HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, key + '.body'), os.path.join(self.cache_dir, key + '.json')
+
+    def get(self, url):
+        """Cached metadata and body for a URL, or (None, None)"""
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            return meta, f.read()
+
+    def put(self, url, body, etag=None, last_modified=None):
+        body_path, meta_path = self._paths(url)
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified,
+                'sha256': hashlib.sha256(body).hexdigest()}
+        with open(body_path + '.tmp', 'wb') as f:
+            f.write(body)
+        os.replace(body_path + '.tmp', body_path)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+        return meta
+
+
+class IngestClient:
+    """Concurrent HTTP fetcher with retries and a conditional-request cache
+
+    Requests go through one pooled ``requests.Session`` on a thread pool,
+    with at most ``concurrency`` in flight. Transient failures (connection
+    errors and 429/5xx) are retried with jittered exponential backoff,
+    during which the request gives up its slot.
+    Cached ETag/Last-Modified values are sent back so unchanged payloads come
+    back as 304 and are read from disk; ``changed`` compares content hashes
+    for servers that send neither.
+    """
+
+    def __init__(self, concurrency=8, retries=3, backoff=0.5, timeout=30,
+                 cache_dir=DEFAULT_HTTP_CACHE_DIR):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_dir)
+        self.stats = {'requests': 0, 'not_modified': 0, 'retries': 0}
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(concurrency)
+        self._semaphore = None
+
+    def _get(self, url, headers):
+        return self._session.get(url, headers=headers, timeout=self.timeout)
+
+    async def _wait(self, attempt, response=None):
+        self.stats['retries'] += 1
+        delay = self.backoff * 2 ** attempt * (1 + random.random())
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            delay = max(delay, int(response.headers['Retry-After']))
+        await asyncio.sleep(delay)
+
+    async def fetch(self, url):
+        """Body of a URL plus whether it changed since the cached copy"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        meta, cached = self.cache.get(url)
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            self.stats['requests'] += 1
+            try:
+                # Held for the request only, so a URL backing off doesn't
+                # keep other requests waiting for its slot
+                async with self._semaphore:
+                    response = await loop.run_in_executor(self._executor, self._get, url, headers)
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+                await self._wait(attempt)
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                await self._wait(attempt, response)
+                continue
+            break
+
+        if response.status_code == 304 and cached is not None:
+            self.stats['not_modified'] += 1
+            return {'url': url, 'body': cached, 'changed': False}
+        response.raise_for_status()
+        new_meta = self.cache.put(url, response.content, response.headers.get('ETag'),
+                                  response.headers.get('Last-Modified'))
+        changed = meta is None or meta['sha256'] != new_meta['sha256']
+        return {'url': url, 'body': response.content, 'changed': changed}
+
+    def close(self):
+        self._session.close()
+        self._executor.shutdown(wait=False)
+
+
+async def ingest(specs, client, base_urls=None):
+    """Fetch and parse every spec concurrently
+
+    Returns the unified records of all payloads and a list of
+    ``(indicator_code, error)`` for specs that could not be fetched or parsed.
+    """
+    async def one(position, spec, url):
+        result = await client.fetch(url)
+        parsed = PARSERS[SOURCES[spec['source']]['format']](result['body'])
+        return parsed.assign(url=url, spec=position)
+
+    jobs = [(position, spec, spec_url(spec, base_urls)) for position, spec in enumerate(specs)]
+    jobs = [job for job in jobs if job[2] is not None]
+    results = await asyncio.gather(*(one(*job) for job in jobs), return_exceptions=True)
+
+    frames, errors = [], []
+    for (_, spec, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            errors.append((spec['indicator_code'], repr(result)))
+        else:
+            frames.append(result)
+    if not frames:
+        return pd.DataFrame(), errors
+    return to_unified(pd.concat(frames, ignore_index=True), specs), errors
+
+
+def refresh(specs=None, pipeline=None, base_urls=None, **client_kwargs):
+    """Ingest the given specs and append new records to an EnrichmentPipeline
+
+    Returns the fetched records, fetch errors, and the pipeline's append
+    counts (None without a pipeline).
+    """
+    specs = INDICATOR_SPECS if specs is None else specs
+    client = IngestClient(**client_kwargs)
+    try:
+        records, errors = asyncio.run(ingest(specs, client, base_urls))
+    finally:
+        client.close()
+    result = pipeline.append(records) if pipeline is not None and len(records) else None
+    return records, errors, result
+
+
+if __name__ == "__main__":
+    records, errors, _ = refresh()
+    print(f"Fetched {len(records)} records")
+    for code, error in errors:
+        print(f"  {code}: {error}")
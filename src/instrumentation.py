@@ -0,0 +1,312 @@
+"""Timing spans, counters and opt-in profiling for hot paths
+
+Instrumented code marks stages with ``@traced(name)`` or ``with span(name):``
+and bumps counters with ``count(name, n)``. While recording is off, which is
+the default, each of these is a single flag check. Recording is turned on by
+``enable()`` or the environment:
+
+- ``FI_TRACE=path``: record spans and counters and write a Chrome trace
+  (open in chrome://tracing or Perfetto) to ``path`` at exit
+- ``FI_PROFILE=stage,...``: run matching spans under cProfile
+- ``FI_TRACEMALLOC=stage,...``: record the peak memory of matching spans
+  and their top allocation sites
+
+Stage names may be glob patterns such as ``forecasting.*``. Profiles go to
+``FI_PROFILE_DIR`` (default ``data/cache/profiles``).
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from fnmatch import fnmatch
+
+DEFAULT_PROFILE_DIR = 'data/cache/profiles'
+# Oldest events are dropped beyond this, so long-lived processes stay bounded
+MAX_EVENTS = 200_000
+
+
+class _Recorder:
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = None
+        self.profile_stages = ()
+        self.memory_stages = ()
+        self.profile_dir = DEFAULT_PROFILE_DIR
+        self.reset()
+
+    def reset(self):
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.counters = {}
+        self.captures = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        # Open memory-traced spans; tracemalloc has one global peak they share
+        self.memory_spans = []
+        self.origin = time.perf_counter_ns()
+        self._matches = {}
+
+    def stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def matches(self, name):
+        """Whether a span name is profiled and whether it is memory-traced"""
+        if name not in self._matches:
+            self._matches[name] = (any(fnmatch(name, p) for p in self.profile_stages),
+                                   any(fnmatch(name, p) for p in self.memory_stages))
+        return self._matches[name]
+
+    def capture_path(self, name, suffix):
+        with self.lock:
+            n = self.captures[name] = self.captures.get(name, 0) + 1
+        os.makedirs(self.profile_dir, exist_ok=True)
+        return os.path.join(self.profile_dir, f'{name}-{os.getpid()}-{n}{suffix}')
+
+
+_recorder = _Recorder()
+
+
+class _Span:
+    """A recorded stage; ``set`` attaches attributes shown in the trace"""
+
+    __slots__ = ('name', 'args', 'start', 'children', 'profiler', 'memory', 'started_tracing',
+                 'peak_floor')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.children = 0
+        self.profiler = None
+        self.memory = False
+        self.started_tracing = False
+        self.peak_floor = 0
+
+    def set(self, **attrs):
+        self.args.update(attrs)
+
+    def __enter__(self):
+        profile, memory = _recorder.matches(self.name)
+        if memory:
+            self.memory = True
+            with _recorder.lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self.started_tracing = True
+                else:
+                    # Resetting the peak for this span drops it for the open
+                    # ones, so they keep what it had reached as a floor
+                    peak = tracemalloc.get_traced_memory()[1]
+                    for outer in _recorder.memory_spans:
+                        outer.peak_floor = max(outer.peak_floor, peak)
+                    tracemalloc.reset_peak()
+                _recorder.memory_spans.append(self)
+        if profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        _recorder.stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        stack = _recorder.stack()
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].children += duration
+        if self.profiler is not None:
+            self.profiler.disable()
+            path = _recorder.capture_path(self.name, '.prof')
+            self.profiler.dump_stats(path)
+            self.args['profile'] = path
+        if self.memory:
+            with _recorder.lock:
+                peak = max(self.peak_floor, tracemalloc.get_traced_memory()[1])
+                if self in _recorder.memory_spans:
+                    _recorder.memory_spans.remove(self)
+            self.args['peak_kb'] = round(peak / 1024, 1)
+            top = tracemalloc.take_snapshot().statistics('lineno')[:20]
+            path = _recorder.capture_path(self.name, '.mem.txt')
+            with open(path, 'w') as f:
+                f.write('\n'.join(str(stat) for stat in top) + '\n')
+            self.args['allocations'] = path
+            if self.started_tracing:
+                tracemalloc.stop()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        event = {'name': self.name, 'ph': 'X', 'ts': (self.start - _recorder.origin) / 1000,
+                 'dur': duration / 1000, 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'args': self.args, 'self_us': (duration - self.children) / 1000}
+        with _recorder.lock:
+            _recorder.events.append(event)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **attrs):
+    """Context manager timing a stage; spans opened inside it nest under it"""
+    if not _recorder.enabled:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+def traced(name=None):
+    """Decorator recording every call of a function as a span"""
+    def decorate(fn):
+        label = name or f'{fn.__module__}.{fn.__qualname__}'
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _recorder.enabled:
+                return fn(*args, **kwargs)
+            with _Span(label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1):
+    """Add to a counter, and to the same-named attribute of the innermost span"""
+    if not _recorder.enabled:
+        return
+    stack = _recorder.stack()
+    if stack:
+        stack[-1].args[name] = stack[-1].args.get(name, 0) + value
+    with _recorder.lock:
+        total = _recorder.counters[name] = _recorder.counters.get(name, 0) + value
+        _recorder.events.append({'name': name, 'ph': 'C', 'pid': os.getpid(),
+                                 'ts': (time.perf_counter_ns() - _recorder.origin) / 1000,
+                                 'args': {name: total}})
+
+
+def enabled():
+    return _recorder.enabled
+
+
+def enable(trace_path=None, profile=(), memory=(), profile_dir=None):
+    """Start recording; ``profile`` and ``memory`` name the stages to capture"""
+    _recorder.trace_path = trace_path
+    _recorder.profile_stages = tuple(profile)
+    _recorder.memory_stages = tuple(memory)
+    _recorder.profile_dir = profile_dir or DEFAULT_PROFILE_DIR
+    _recorder._matches = {}
+    _recorder.enabled = True
+
+
+def disable():
+    _recorder.enabled = False
+
+
+def reset():
+    """Drop recorded spans and counters"""
+    _recorder.reset()
+
+
+def counters():
+    return dict(_recorder.counters)
+
+
+def summary():
+    """Per-stage call count and total, self and max time in milliseconds, slowest first"""
+    stages = {}
+    with _recorder.lock:
+        events = [event for event in _recorder.events if event['ph'] == 'X']
+    for event in events:
+        stage = stages.setdefault(event['name'], {'stage': event['name'], 'calls': 0,
+                                                  'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0})
+        stage['calls'] += 1
+        stage['total_ms'] += event['dur'] / 1000
+        stage['self_ms'] += event['self_us'] / 1000
+        stage['max_ms'] = max(stage['max_ms'], event['dur'] / 1000)
+    return sorted(stages.values(), key=lambda stage: -stage['total_ms'])
+
+
+def report():
+    """Summary and counters as a text table"""
+    lines = [f"{'stage':<40} {'calls':>7} {'total ms':>10} {'self ms':>10} {'max ms':>10}"]
+    for stage in summary():
+        lines.append(f"{stage['stage']:<40} {stage['calls']:>7} {stage['total_ms']:>10.1f} "
+                     f"{stage['self_ms']:>10.1f} {stage['max_ms']:>10.1f}")
+    for name, value in sorted(_recorder.counters.items()):
+        lines.append(f"{name:<40} {value:>7}")
+    return '\n'.join(lines)
+
+
+def write_trace(path=None):
+    """Write recorded events as a Chrome trace with the summary and counters alongside"""
+    path = path or _recorder.trace_path
+    if path is None:
+        raise ValueError("No trace path given or configured")
+    with _recorder.lock:
+        events = list(_recorder.events)
+    trace = {
+        'traceEvents': events,
+        'displayTimeUnit': 'ms',
+        'summary': summary(),
+        'counters': counters(),
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(trace, f, default=str)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def flush():
+    """Write the trace to the configured path, if recording to one"""
+    if _recorder.enabled and _recorder.trace_path is not None:
+        write_trace()
+
+
+def _stages(variable):
+    return [stage.strip() for stage in os.environ.get(variable, '').split(',') if stage.strip()]
+
+
+if os.environ.get('FI_TRACE') or os.environ.get('FI_PROFILE') or os.environ.get('FI_TRACEMALLOC'):
+    enable(os.environ.get('FI_TRACE') or None, _stages('FI_PROFILE'), _stages('FI_TRACEMALLOC'),
+           os.environ.get('FI_PROFILE_DIR'))
+    atexit.register(flush)
+
+
+if __name__ == "__main__":
+    import timeit
+
+    def work(n):
+        return sum(i * i for i in range(n))
+
+    @traced('demo.fit')
+    def fit(n):
+        count('series_fitted', n)
+        return work(n)
+
+    raw = timeit.timeit(lambda: work(1), number=200_000)
+    wrapped = timeit.timeit(lambda: fit(1), number=200_000)
+    enable(profile=['demo.fit'])
+    with span('demo.pipeline', size='small'):
+        for n in (10_000, 100_000):
+            fit(n)
+    print(report())
+    disable()
+    print(f"Overhead per call while disabled: {(wrapped - raw) / 200_000 * 1e9:.0f} ns")
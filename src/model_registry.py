@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pandas as pd
+import numpy as np
+
+DEFAULT_REGISTRY_DIR = 'models/registry'
+REGISTRY_FORMAT = 1
+TAGS_FILE = 'tags.json'
+
+# Columns stored for each model family, one row per series
+FAMILY_COLUMNS = {
+    'linear': ['intercept', 'slope', 'n', 'sum_x', 'sum_y', 'sum_xx', 'sum_xy', 'sum_yy'],
+    'trend': ['intercept', 'slope', 'n', 'sum_x', 'sum_y', 'sum_xx', 'sum_xy', 'sum_yy', 'origin'],
+    'logistic': ['saturation', 'rate', 'midpoint', 'sse', 'n_obs'],
+    'bass': ['market', 'innovation', 'imitation', 'sse', 'n_obs'],
+}
+
+
+def _key_array(index):
+    """Series keys as a fixed-width string array, one column per key level"""
+    keys = index.to_frame(index=False)
+    return np.column_stack([keys[col].astype(str).to_numpy(dtype=str) for col in keys.columns])
+
+
+def _key_dtypes(index):
+    """Each key level's numpy dtype, so string-stored keys can be cast back on load"""
+    levels = index.levels if isinstance(index, pd.MultiIndex) else [index]
+    return [level.dtype.str if level.dtype.kind in 'iuf' else 'str' for level in levels]
+
+
+def _write_family(directory, name, keys, values, names, **meta):
+    np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(values, dtype=np.float64))
+    np.save(os.path.join(directory, f'{name}.keys.npy'), keys)
+    return {'file': f'{name}.npy', 'keys_file': f'{name}.keys.npy', 'columns': FAMILY_COLUMNS[name],
+            'key_names': list(names), 'n_series': len(values), **meta}
+
+
+class ModelFamily:
+    """One family's fitted parameters, read lazily from its array files
+
+    With ``mmap`` the arrays are memory-mapped, so opening a family costs
+    nothing until rows are read, and forecasting a few series reads only
+    their rows.
+    """
+
+    def __init__(self, directory, name, meta, mmap=True):
+        self.name = name
+        self.meta = meta
+        self._paths = (os.path.join(directory, meta['file']), os.path.join(directory, meta['keys_file']))
+        self._mmap = 'r' if mmap else None
+        self._values = None
+        self._index = None
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = np.load(self._paths[0], mmap_mode=self._mmap)
+        return self._values
+
+    @property
+    def index(self):
+        if self._index is None:
+            keys = np.load(self._paths[1], mmap_mode=self._mmap)
+            names = self.meta['key_names']
+            dtypes = self.meta.get('key_dtypes', ['str'] * len(names))
+            levels = [np.asarray(col) if dtype == 'str' else np.asarray(col).astype(dtype)
+                      for col, dtype in zip(keys.T, dtypes)]
+            if len(names) == 1:
+                self._index = pd.Index(levels[0], name=names[0])
+            else:
+                self._index = pd.MultiIndex.from_arrays(levels, names=names)
+        return self._index
+
+    def column(self, name):
+        return self.values[:, self.meta['columns'].index(name)]
+
+    def params(self):
+        return pd.DataFrame(np.asarray(self.values), index=self.index, columns=self.meta['columns'])
+
+    def _rows(self, keys):
+        if keys is None:
+            return slice(None), self.index
+        positions = self.index.get_indexer(keys)
+        if (positions < 0).any():
+            raise KeyError(f"Unknown series in {self.name}: {list(pd.Index(keys)[positions < 0])}")
+        return positions, self.index[positions]
+
+    def forecast(self, years, keys=None):
+        """Predictions for the given years, one row per series"""
+        rows, index = self._rows(keys)
+        values = np.asarray(self.values[rows])
+        columns = self.meta['columns']
+        years = np.asarray(list(years), dtype=float)
+        if self.name in ('linear', 'trend'):
+            origin = values[:, columns.index('origin')] if self.name == 'trend' else self.meta['year_origin']
+            x = years[None, :] - np.reshape(origin, (-1, 1))
+            predictions = values[:, [0]] + values[:, [1]] * x
+        else:
+            from src.forecasting import DIFFUSION_CURVES
+
+            t = years if self.name == 'logistic' else years - self.meta['start_year']
+            n_series = len(values)
+            predictions, _ = DIFFUSION_CURVES[self.name](
+                np.repeat(values[:, :3], len(years), axis=0), np.tile(t, n_series))
+            predictions = predictions.reshape(n_series, len(years))
+        return pd.DataFrame(predictions, index=index, columns=list(years.astype(int)))
+
+    def intervals(self, years, keys=None, level=0.95):
+        """Prediction interval half-widths of a linear family, as forecast_intervals computes them"""
+        if self.name not in ('linear', 'trend'):
+            raise ValueError(f"No analytic intervals for the {self.name} family")
+        from src.forecasting import prediction_intervals
+
+        rows, index = self._rows(keys)
+        values = np.asarray(self.values[rows])
+        years = np.asarray(list(years), dtype=float)
+        if self.name == 'trend':
+            widths = np.vstack([prediction_intervals(row[None, 2:8], row[None, :2], years - row[8], level)
+                                for row in values])
+        else:
+            widths = prediction_intervals(values[:, 2:8], values[:, :2], years - self.meta['year_origin'],
+                                          level)
+        return pd.DataFrame(widths, index=index, columns=list(years.astype(int)))
+
+
+class ModelRegistry:
+    """Versioned store of fitted forecaster parameters
+
+    Each version is a directory holding one ``.npy`` array per model family
+    (linear batch trends, single-indicator trends, logistic and Bass fits)
+    plus its series keys and a ``manifest.json`` with fit metadata and the
+    data hash. Tags such as ``latest`` or ``production`` name versions.
+    """
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR):
+        self.root = root
+
+    def _tags(self):
+        path = os.path.join(self.root, TAGS_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_tags(self, tags):
+        path = os.path.join(self.root, TAGS_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(tags, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def versions(self):
+        """Saved versions, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, 'manifest.json')))
+
+    def tags(self):
+        return self._tags()
+
+    def tag(self, version, *tags):
+        """Point tags at a version"""
+        if version not in self.versions():
+            raise KeyError(version)
+        current = self._tags()
+        current.update({tag: version for tag in tags})
+        self._write_tags(current)
+
+    def resolve(self, ref):
+        """Version named by a tag or a version id"""
+        tags = self._tags()
+        if ref in tags:
+            return tags[ref]
+        if ref in self.versions():
+            return ref
+        raise KeyError(f"No model version or tag {ref!r} in {self.root}")
+
+    def save(self, forecaster, version=None, tags=('latest',), data_hash=None, notes=None):
+        """Write every fitted family of a FinancialInclusionForecaster as a new version"""
+        families = {}
+        created = datetime.now(timezone.utc)
+        version = version or created.strftime('%Y%m%dT%H%M%S%f')
+        staging = os.path.join(self.root, f'.{version}.tmp')
+        os.makedirs(staging, exist_ok=True)
+
+        if forecaster.coefficients is not None:
+            families['linear'] = _write_family(
+                staging, 'linear', _key_array(forecaster.series_index),
+                np.hstack([forecaster.coefficients, forecaster.batch_stats]),
+                forecaster.series_index.names, key_dtypes=_key_dtypes(forecaster.series_index),
+                year_origin=forecaster.year_origin, group_cols=forecaster.group_cols)
+            if forecaster.series_digests is not None:
+                np.save(os.path.join(staging, 'linear.digests.npy'), forecaster.series_digests)
+                families['linear']['digests_file'] = 'linear.digests.npy'
+                if data_hash is None:
+                    data_hash = hashlib.sha256(forecaster.series_digests.tobytes()).hexdigest()
+
+        if forecaster.models:
+            names = list(forecaster.models)
+            rows = []
+            for name in names:
+                origin, stats = forecaster.model_stats[name]
+                model = forecaster.models[name]
+                slope = float(model.coef_[0])
+                rows.append([model.intercept_ + slope * origin, slope, *stats[0], origin])
+            families['trend'] = _write_family(staging, 'trend', np.array(names, dtype=str)[:, None],
+                                              np.array(rows), ['indicator'])
+
+        for curve, fit in forecaster.diffusion.items():
+            params = fit['params']
+            values = params[FAMILY_COLUMNS[curve]].to_numpy(dtype=float)
+            families[curve] = _write_family(staging, curve, _key_array(params.index), values,
+                                            params.index.names, key_dtypes=_key_dtypes(params.index),
+                                            start_year=fit['start_year'])
+
+        if not families:
+            shutil.rmtree(staging)
+            raise ValueError("Forecaster has no fitted models to save")
+        manifest = {
+            'format': REGISTRY_FORMAT,
+            'version': version,
+            'created_at': created.isoformat(),
+            'data_hash': data_hash,
+            'notes': notes,
+            'families': families,
+        }
+        with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(staging, os.path.join(self.root, version))
+        if tags:
+            self.tag(version, *tags)
+        return version
+
+    def load(self, ref='latest', mmap=True):
+        """Open a version's families without reading their arrays"""
+        version = self.resolve(ref)
+        directory = os.path.join(self.root, version)
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            manifest = json.load(f)
+        return {name: ModelFamily(directory, name, meta, mmap)
+                for name, meta in manifest['families'].items()}
+
+    def manifest(self, ref='latest'):
+        with open(os.path.join(self.root, self.resolve(ref), 'manifest.json')) as f:
+            return json.load(f)
+
+    def load_forecaster(self, ref='latest'):
+        """A FinancialInclusionForecaster with a version's batch and diffusion fits
+
+        Raw observations are not stored, so bootstrap intervals raise
+        ValueError until sync_batch has been run on the current data; it
+        only re-solves series whose digest changed. Trend models from
+        fit_trend_model are served through ``load`` only.
+        """
+        from src.forecasting import DIFFUSION_PARAMS, FinancialInclusionForecaster
+
+        families = self.load(ref, mmap=False)
+        forecaster = FinancialInclusionForecaster()
+        if 'linear' in families:
+            linear = families['linear']
+            forecaster.series_index = linear.index
+            forecaster.group_cols = linear.meta['group_cols']
+            forecaster.year_origin = linear.meta['year_origin']
+            forecaster.coefficients = np.array(linear.values[:, :2])
+            forecaster.batch_stats = np.array(linear.values[:, 2:])
+            if 'digests_file' in linear.meta:
+                forecaster.series_digests = np.load(
+                    os.path.join(self.root, self.resolve(ref), linear.meta['digests_file']))
+            else:
+                forecaster.series_digests = np.zeros(len(linear.index), dtype=np.uint64)
+        for curve in DIFFUSION_PARAMS:
+            if curve in families:
+                params = families[curve].params()
+                params['n_obs'] = params['n_obs'].astype(np.int64)
+                forecaster.diffusion[curve] = {'params': params,
+                                               'start_year': families[curve].meta['start_year']}
+        return forecaster
+
+
+if __name__ == "__main__":
+    import subprocess
+    import sys
+    import tempfile
+
+    from src.forecasting import FinancialInclusionForecaster
+
+    rng = np.random.default_rng(0)
+    years = np.array([2011, 2014, 2017, 2021, 2024] * 10_000)
+    data = pd.DataFrame({
+        'indicator_code': np.repeat([f'SYN_{i:05d}' for i in range(10_000)], 5),
+        'year': years,
+        'value_numeric': rng.uniform(0, 90, len(years)),
+    })
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data, time_col='year')
+    forecaster.fit_diffusion(data, time_col='year')
+
+    with tempfile.TemporaryDirectory() as root:
+        version = ModelRegistry(root).save(forecaster, tags=('latest', 'production'))
+        print(f"Saved version {version}")
+        script = (
+            "import sys, time; start = time.perf_counter()\n"
+            "from src.model_registry import ModelRegistry\n"
+            "imported = time.perf_counter()\n"
+            f"families = ModelRegistry({root!r}).load('production')\n"
+            "forecasts = families['linear'].forecast([2025, 2026, 2027])\n"
+            "done = time.perf_counter()\n"
+            "print(f'Fresh process: imports {(imported - start) * 1000:.0f} ms, '\n"
+            "      f'{len(forecasts)} series served in {(done - imported) * 1000:.1f} ms, '\n"
+            "      f'sklearn imported: {\"sklearn\" in sys.modules}')\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True)
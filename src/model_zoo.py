@@ -0,0 +1,356 @@
+import hashlib
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+from scipy.optimize import OptimizeWarning, curve_fit, minimize
+
+from src.forecasting import _series_codes, _to_year, diffusion_capacity
+from src.instrumentation import traced
+
+DEFAULT_ZOO_CACHE = 'data/cache/model_zoo.json'
+
+MODEL_REGISTRY = {}
+
+
+def register_model(cls):
+    """Class decorator adding a trend model to MODEL_REGISTRY under its name"""
+    MODEL_REGISTRY[cls.name] = cls
+    return cls
+
+
+class TrendModel:
+    """Trend model of a yearly series
+
+    Subclasses implement ``_fit(t, y)`` returning a flat coefficient array
+    and ``_predict(coef, t)``, with ``t`` in years since the first
+    observation. Coefficients are plain floats so fitted models can be
+    cached and rebuilt with ``from_coef``.
+    """
+    name = None
+    defaults = {}
+
+    def __init__(self, **params):
+        self.params = {**self.defaults, **params}
+        self.coef = None
+        self.origin = None
+
+    def fit(self, years, values):
+        years = np.asarray(years, dtype=float)
+        self.origin = float(years.min())
+        self.coef = np.asarray(self._fit(years - self.origin, np.asarray(values, dtype=float)))
+        return self
+
+    def predict(self, years):
+        if self.coef is None:
+            raise ValueError(f"{self.name} model is not fitted")
+        return self._predict(self.coef, np.asarray(years, dtype=float) - self.origin)
+
+    @classmethod
+    def from_coef(cls, params, origin, coef):
+        model = cls(**params)
+        model.origin, model.coef = origin, np.asarray(coef)
+        return model
+
+
+@register_model
+class LinearTrend(TrendModel):
+    name = 'linear'
+
+    def _fit(self, t, y):
+        return np.polyfit(t, y, 1) if len(t) > 1 else np.array([0.0, y[0]])
+
+    def _predict(self, coef, t):
+        return coef[0] * t + coef[1]
+
+
+@register_model
+class LogisticTrend(TrendModel):
+    """Saturating growth towards ``capacity`` (100 for percentage indicators)
+
+    ``ModelSelector`` derives the capacity of each series with
+    ``diffusion_capacity`` when a candidate's capacity is None.
+    """
+    name = 'logistic'
+    defaults = {'capacity': 100.0}
+
+    def _curve(self, t, rate, midpoint):
+        return self.params['capacity'] / (1.0 + np.exp(-rate * (t - midpoint)))
+
+    def _fit(self, t, y):
+        coef, _ = curve_fit(self._curve, t, y, p0=[0.2, t.mean() + 10.0],
+                            bounds=([1e-4, -100.0], [5.0, 200.0]), maxfev=5000)
+        return coef
+
+    def _predict(self, coef, t):
+        return self._curve(t, *coef)
+
+
+@register_model
+class GompertzTrend(TrendModel):
+    """Asymmetric S-curve diffusion towards ``capacity``"""
+    name = 'gompertz'
+    defaults = {'capacity': 100.0}
+
+    def _curve(self, t, displacement, rate):
+        return self.params['capacity'] * np.exp(-displacement * np.exp(-rate * t))
+
+    def _fit(self, t, y):
+        start = np.log(self.params['capacity'] / np.clip(y[0], 1e-6, None))
+        coef, _ = curve_fit(self._curve, t, y, p0=[max(start, 1e-3), 0.05],
+                            bounds=([1e-6, 1e-6], [50.0, 5.0]), maxfev=5000)
+        return coef
+
+    def _predict(self, coef, t):
+        return self._curve(t, *coef)
+
+
+def _holt(y, alpha, beta, phi):
+    """Additive-trend exponential smoothing; one-step errors and final level/trend"""
+    level, trend = y[0], y[1] - y[0]
+    errors = np.empty(len(y) - 1)
+    for i, value in enumerate(y[1:]):
+        forecast = level + phi * trend
+        errors[i] = value - forecast
+        new_level = alpha * value + (1 - alpha) * forecast
+        trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        level = new_level
+    return errors, level, trend
+
+
+@register_model
+class ETSTrend(TrendModel):
+    """ETS(A,A,N): Holt's linear trend with smoothing weights fitted by least squares
+
+    Irregular survey years are linearly interpolated to an annual grid first.
+    """
+    name = 'ets'
+    defaults = {}
+    bounds = [(0.01, 0.99), (0.01, 0.99), (1.0, 1.0)]
+
+    def _fit(self, t, y):
+        grid = np.arange(0.0, t.max() + 1.0)
+        annual = np.interp(grid, t, y)
+        if len(annual) < 3:
+            return np.array([annual[-1], annual[-1] - annual[0], 1.0, grid[-1]])
+        result = minimize(lambda p: np.sum(_holt(annual, *p)[0] ** 2),
+                          [np.mean(b) for b in self.bounds], bounds=self.bounds, method='L-BFGS-B')
+        _, level, trend = _holt(annual, *result.x)
+        return np.array([level, trend, result.x[2], grid[-1]])
+
+    def _predict(self, coef, t):
+        level, trend, phi, last = coef
+        steps = np.maximum(np.round(t - last), 0.0)
+        if phi == 1.0:
+            return level + steps * trend
+        return level + trend * phi * (1 - phi ** steps) / (1 - phi)
+
+
+@register_model
+class DampedTrend(ETSTrend):
+    """ETS(A,Ad,N): Holt's trend damped by ``phi``, which is fitted within ``phi_range``"""
+    name = 'damped'
+    defaults = {'phi_range': (0.8, 0.98)}
+
+    @property
+    def bounds(self):
+        return [(0.01, 0.99), (0.01, 0.99), tuple(self.params['phi_range'])]
+
+
+# A capacity of None is derived per series by diffusion_capacity
+DEFAULT_CANDIDATES = [
+    ('linear', {}),
+    ('logistic', {'capacity': None}),
+    ('gompertz', {'capacity': None}),
+    ('damped', {}),
+    ('ets', {}),
+]
+
+
+def series_hash(years, values):
+    """Content hash of one series"""
+    data = np.column_stack([np.asarray(years, dtype=float), np.asarray(values, dtype=float)])
+    return hashlib.sha256(data.tobytes()).hexdigest()
+
+
+def rolling_origin_score(model_cls, params, years, values, min_train=3, horizon=1):
+    """Mean absolute error over rolling-origin folds
+
+    Each fold fits on the first k observations (k from ``min_train``) and
+    scores the next ``horizon``. Returns the score and number of folds; a
+    series too short for any fold scores NaN.
+    """
+    errors = []
+    for k in range(min_train, len(years)):
+        model = model_cls(**params).fit(years[:k], values[:k])
+        future = slice(k, k + horizon)
+        errors.append(np.abs(model.predict(years[future]) - values[future]))
+    if not errors:
+        return np.nan, 0
+    return float(np.mean(np.concatenate(errors))), len(errors)
+
+
+def _evaluate(task):
+    """Cross-validate one candidate on one series, then fit it on the whole series"""
+    name, params, years, values, min_train, horizon = task
+    model_cls = MODEL_REGISTRY[name]
+    try:
+        with warnings.catch_warnings():
+            # Exactly determined folds have no parameter covariance
+            warnings.simplefilter('ignore', OptimizeWarning)
+            score, n_folds = rolling_origin_score(model_cls, params, years, values, min_train, horizon)
+            model = model_cls(**params).fit(years, values)
+        coef = model.coef.tolist()
+        if not np.all(np.isfinite(coef)):
+            raise ValueError("non-finite coefficients")
+    except (RuntimeError, ValueError, np.linalg.LinAlgError):
+        return {'score': None, 'n_folds': 0, 'origin': None, 'coef': None}
+    return {'score': None if np.isnan(score) else score, 'n_folds': n_folds,
+            'origin': model.origin, 'coef': coef}
+
+
+class ModelSelector:
+    """Choose a trend model per series by rolling-origin cross-validation
+
+    Every (series, candidate) pair is scored in a process pool of ``n_jobs``
+    workers (1 runs in-process). Results, including the final fit, are cached
+    on disk by (series hash, model, params, CV settings), so unchanged series
+    are never refitted. Series too short to cross-validate keep the first
+    candidate that fits. Candidates with ``capacity: None`` get each
+    series' bound from ``diffusion_capacity``: 100 for percentages, else a
+    margin over the series' peak.
+    """
+
+    def __init__(self, candidates=None, min_train=3, horizon=1, n_jobs=None,
+                 cache_path=DEFAULT_ZOO_CACHE):
+        self.candidates = DEFAULT_CANDIDATES if candidates is None else candidates
+        self.min_train = min_train
+        self.horizon = horizon
+        self.n_jobs = n_jobs
+        self.cache_path = cache_path
+        self.scores = None
+        self.best = {}
+        self._index = None
+
+    def _load_cache(self):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return {}
+        with open(self.cache_path) as f:
+            return json.load(f)
+
+    def _save_cache(self, cache):
+        if self.cache_path is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        with open(self.cache_path + '.tmp', 'w') as f:
+            json.dump(cache, f)
+        os.replace(self.cache_path + '.tmp', self.cache_path)
+
+    def _key(self, digest, name, params):
+        return f"{digest}:{name}:{json.dumps(params, sort_keys=True)}:{self.min_train}:{self.horizon}"
+
+    @traced('model_zoo.select')
+    def select(self, data, group_cols=('indicator_code',), time_col='observation_date',
+               value_col='value_numeric'):
+        """Score every candidate on every series and keep the best model of each
+
+        Returns one row per series and candidate with its score, fold count
+        and whether it came from the cache.
+        """
+        obs = data
+        if 'record_type' in obs.columns:
+            obs = obs[obs['record_type'] == 'observation']
+        obs = obs[obs[value_col].notna()]
+        years = _to_year(obs[time_col])
+        valid = ~np.isnan(years)
+        obs, years = obs[valid], years[valid]
+        codes, keys = _series_codes(obs, group_cols)
+        values = obs[value_col].to_numpy(dtype=float)
+        capacity = diffusion_capacity(obs, group_cols, value_col).to_numpy()
+        order = np.lexsort((years, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+
+        cache = self._load_cache()
+        rows, tasks, pending = [], [], []
+        for i, key in enumerate(keys):
+            rows_i = order[bounds[i]:bounds[i + 1]]
+            series_years, series_values = years[rows_i], values[rows_i]
+            digest = series_hash(series_years, series_values)
+            for candidate, (name, params) in enumerate(self.candidates):
+                if params.get('capacity', 0.0) is None:
+                    params = {**params, 'capacity': float(capacity[i])}
+                cache_key = self._key(digest, name, params)
+                rows.append({'series': key, 'series_position': i, 'candidate': candidate,
+                             'model': name, 'params': params, 'cache_key': cache_key})
+                if cache_key not in cache:
+                    pending.append(len(rows) - 1)
+                    tasks.append((name, params, series_years, series_values,
+                                  self.min_train, self.horizon))
+
+        n_jobs = self.n_jobs or os.cpu_count()
+        if n_jobs == 1 or len(tasks) <= 1:
+            results = [_evaluate(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (4 * n_jobs))))
+        for position, result in zip(pending, results):
+            cache[rows[position]['cache_key']] = result
+        if results:
+            self._save_cache(cache)
+
+        fresh = set(pending)
+        for position, row in enumerate(rows):
+            row.update(cache[row['cache_key']], cached=position not in fresh)
+        scores = pd.DataFrame(rows)
+
+        # Lowest score wins; series that cannot be scored keep the first
+        # candidate that fitted
+        ranked = scores[scores['coef'].notna()].assign(
+            rank_score=scores['score'].astype(float).fillna(np.inf))
+        chosen = ranked.sort_values(['rank_score', 'candidate'], kind='stable').drop_duplicates(
+            'series_position')
+        self.best = {
+            keys[row.series_position]: MODEL_REGISTRY[row.model].from_coef(row.params, row.origin, row.coef)
+            for row in chosen.itertuples()
+        }
+        selected = np.zeros(len(scores), dtype=bool)
+        selected[chosen.index] = True
+        self.scores = scores.drop(columns=['series_position', 'candidate', 'cache_key', 'origin', 'coef']).assign(
+            selected=selected)
+        index = keys if isinstance(keys, pd.MultiIndex) else pd.Index(keys, name=group_cols[0])
+        self._index = index
+        return self.scores
+
+    def forecast(self, years):
+        """Predictions of each series' selected model, one row per series"""
+        years = list(years)
+        index = self._index[[key in self.best for key in self._index]]
+        return pd.DataFrame([self.best[key].predict(years) for key in index],
+                            index=index, columns=years)
+
+if __name__ == "__main__":
+    import time
+
+    data = pd.read_csv('data/processed/ethiopia_fi_enriched.csv')
+    selector = ModelSelector(cache_path=None, n_jobs=1)
+    scores = selector.select(data)
+    print(scores[scores['selected']])
+    print(selector.forecast([2025, 2026, 2027]))
+
+    rng = np.random.default_rng(0)
+    years = np.array([2011, 2014, 2017, 2021, 2024] * 500)
+    synthetic = pd.DataFrame({
+        'indicator_code': np.repeat([f'SYN_{i:04d}' for i in range(500)], 5),
+        'pillar': 'access',
+        'year': years,
+        'value_numeric': 90 / (1 + np.exp(-0.25 * (years - 2018))) + rng.normal(0, 2, len(years)),
+    })
+    cache = 'data/cache/model_zoo_demo.json'
+    for run in ('cold', 'cached'):
+        start = time.perf_counter()
+        ModelSelector(cache_path=cache).select(synthetic, time_col='year')
+        print(f"{run}: 500 series x {len(DEFAULT_CANDIDATES)} models in {time.perf_counter() - start:.2f}s")
+    os.remove(cache)
@@ -0,0 +1,448 @@
+"""Build notebooks from templates, execute them incrementally and verify their charts
+
+Each code cell is keyed by its source, the hash of the notebook's input
+data and the keys of the cells it depends on. A cell depends on the latest
+earlier cell that defines a name it reads; names come from the cell's
+syntax tree. A rebuild replays cached outputs for unchanged cells. It
+executes the cells whose key changed, plus the cells they depend on so the
+kernel has their state. After a one-cell edit, only that cell, its
+dependents and their inputs run.
+
+Execution needs nbformat, nbclient and a Jupyter kernel (the ``jupyter``
+requirement).
+"""
+import ast
+import hashlib
+import json
+import os
+import string
+
+from src.data_cache import file_hash
+from src.instrumentation import count, span, traced
+from src.notebook_templates import TEMPLATES
+
+DEFAULT_CACHE_DIR = 'data/cache/notebooks'
+DEFAULT_OUTPUTS = {'eda': 'notebooks/eda.ipynb'}
+DEFAULT_KERNEL = 'python3'
+CELL_TIMEOUT = 600
+# Bump to invalidate every cached cell output
+CACHE_FORMAT = 1
+IMAGE_TYPES = ('image/png', 'image/svg+xml', 'image/jpeg')
+
+
+def _nbformat():
+    try:
+        import nbformat
+    except ImportError as exc:
+        raise ImportError("Building notebooks requires nbformat: pip install nbformat") from exc
+    return nbformat
+
+
+def render_template(name, **params):
+    """A notebook from a template, with ``$name`` placeholders filled from ``params``"""
+    if name not in TEMPLATES:
+        raise KeyError(f"Unknown notebook template {name!r}; templates: {', '.join(TEMPLATES)}")
+    template = TEMPLATES[name]
+    nbf = _nbformat()
+    values = {**template['defaults'], **params}
+    notebook = nbf.v4.new_notebook()
+    notebook.metadata['kernelspec'] = {'display_name': 'Python 3', 'language': 'python',
+                                       'name': DEFAULT_KERNEL}
+    notebook.metadata['template'] = name
+    for cell in template['cells']:
+        source = string.Template(cell['source']).safe_substitute(values)
+        if cell['cell_type'] == 'markdown':
+            notebook.cells.append(nbf.v4.new_markdown_cell(source))
+        else:
+            new = nbf.v4.new_code_cell(source)
+            if cell.get('chart'):
+                new.metadata['chart'] = cell['chart']
+            notebook.cells.append(new)
+    # Stable ids so an unchanged rebuild rewrites an identical file
+    for index, cell in enumerate(notebook.cells):
+        cell.id = f'cell-{index}'
+    return notebook
+
+
+class _Names(ast.NodeVisitor):
+    """Names a block reads before binding them, binds and mutates in place
+
+    Nodes are visited in evaluation order, so ``df = df.dropna()`` reads
+    ``df`` before binding it. Function, lambda, class and comprehension
+    bodies are their own scope: their parameters and local bindings are
+    neither inputs nor outputs of the enclosing block.
+    """
+
+    def __init__(self, bound=()):
+        self.bound = set(bound)
+        self.inputs, self.stores, self.mutated = set(), set(), set()
+
+    def load(self, name):
+        if name not in self.bound:
+            self.inputs.add(name)
+
+    def bind(self, name):
+        self.bound.add(name)
+        self.stores.add(name)
+
+    def scope(self, nodes, params=()):
+        inner = _Names(self.bound | set(params))
+        for node in nodes:
+            inner.visit(node)
+        self.inputs |= inner.inputs
+        self.mutated |= inner.mutated - inner.stores - set(params)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.load(node.id)
+        else:
+            self.bind(node.id)
+
+    def _visit_target(self, node):
+        # ``df['x'] = ...`` and ``df.x = ...`` mutate ``df`` in place
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            base = node.value
+            while isinstance(base, (ast.Subscript, ast.Attribute, ast.Call)):
+                base = base.func if isinstance(base, ast.Call) else base.value
+            if isinstance(base, ast.Name):
+                self.mutated.add(base.id)
+        self.generic_visit(node)
+
+    visit_Subscript = visit_Attribute = _visit_target
+
+    def visit_Assign(self, node):
+        self.visit(node.value)
+        for target in node.targets:
+            self.visit(target)
+
+    def visit_AugAssign(self, node):
+        self.visit(node.value)
+        if isinstance(node.target, ast.Name):
+            self.load(node.target.id)
+        self.visit(node.target)
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None:
+            self.visit(node.value)
+        self.visit(node.annotation)
+        self.visit(node.target)
+
+    def visit_NamedExpr(self, node):
+        self.visit(node.value)
+        self.visit(node.target)
+
+    def visit_For(self, node):
+        self.visit(node.iter)
+        self.visit(node.target)
+        for statement in node.body + node.orelse:
+            self.visit(statement)
+
+    visit_AsyncFor = visit_For
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.name != '*':
+                self.bind((alias.asname or alias.name).split('.')[0])
+
+    visit_ImportFrom = visit_Import
+
+    def visit_ExceptHandler(self, node):
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            self.bind(node.name)
+        for statement in node.body:
+            self.visit(statement)
+
+    def visit_MatchAs(self, node):
+        if node.pattern is not None:
+            self.visit(node.pattern)
+        if node.name:
+            self.bind(node.name)
+
+    def visit_MatchStar(self, node):
+        if node.name:
+            self.bind(node.name)
+
+    def _parameters(self, args):
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            self.visit(default)
+        every = args.posonlyargs + args.args + args.kwonlyargs + [
+            arg for arg in (args.vararg, args.kwarg) if arg is not None]
+        for arg in every:
+            if arg.annotation is not None:
+                self.visit(arg.annotation)
+        return [arg.arg for arg in every]
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        params = self._parameters(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+        # Bound before the body so recursive calls aren't inputs
+        self.bind(node.name)
+        self.scope(node.body, params)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self.scope([node.body], self._parameters(node.args))
+
+    def visit_ClassDef(self, node):
+        for expr in node.decorator_list + node.bases + [kw.value for kw in node.keywords]:
+            self.visit(expr)
+        self.bind(node.name)
+        self.scope(node.body)
+
+    def _comprehension(self, node, elements):
+        # The first iterable is evaluated in the enclosing scope
+        generators = node.generators
+        self.visit(generators[0].iter)
+        inner = _Names(self.bound)
+        for index, generator in enumerate(generators):
+            if index:
+                inner.visit(generator.iter)
+            inner.visit(generator.target)
+            for condition in generator.ifs:
+                inner.visit(condition)
+        for element in elements:
+            inner.visit(element)
+        self.inputs |= inner.inputs
+        self.mutated |= inner.mutated - inner.stores
+
+    def visit_ListComp(self, node):
+        self._comprehension(node, [node.elt])
+
+    visit_SetComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._comprehension(node, [node.key, node.value])
+
+
+def cell_names(source):
+    """Names a cell reads before binding them, and names it binds or mutates
+
+    A name the cell reads and then rebinds (``df = df.dropna()``) is both.
+    Returns None for cells that don't parse as Python after dropping
+    IPython magics and shell lines.
+    """
+    lines = [line for line in source.splitlines() if not line.lstrip().startswith(('%', '!'))]
+    try:
+        tree = ast.parse('\n'.join(lines))
+    except SyntaxError:
+        return None
+    names = _Names()
+    for statement in tree.body:
+        names.visit(statement)
+    # A mutated name the cell didn't bind was read from an earlier cell
+    return names.inputs | (names.mutated - names.stores), names.stores | names.mutated
+
+
+def cell_dependencies(sources):
+    """For each cell source, the indices of the earlier cells it depends on
+
+    A cell that doesn't parse depends on, and is a dependency of, every
+    other cell.
+    """
+    definers = {}
+    opaque = []
+    dependencies = []
+    for index, source in enumerate(sources):
+        names = cell_names(source)
+        if names is None:
+            dependencies.append(set(range(index)))
+            opaque.append(index)
+            continue
+        inputs, outputs = names
+        dependencies.append({definers[name] for name in inputs if name in definers} | set(opaque))
+        for name in outputs:
+            definers[name] = index
+    return dependencies
+
+
+def data_hash(paths):
+    """Combined content hash of a notebook's input files"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(f'{os.path.basename(path)}:{file_hash(path)}'.encode())
+    return digest.hexdigest()
+
+
+def cell_keys(sources, dependencies, inputs_hash, kernel=DEFAULT_KERNEL):
+    keys = []
+    for source, deps in zip(sources, dependencies):
+        payload = json.dumps([CACHE_FORMAT, kernel, inputs_hash, source,
+                              sorted(keys[dep] for dep in deps)])
+        keys.append(hashlib.sha256(payload.encode()).hexdigest())
+    return keys
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + '.json')
+
+
+def _read_cached(cache_dir, key):
+    path = _cache_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_cached(cache_dir, key, cell):
+    path = _cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'outputs': cell.outputs}, f)
+    os.replace(path + '.tmp', path)
+
+
+def _number_cells(notebook):
+    """Number code cells in order, since only some of them ran in this kernel"""
+    number = 0
+    for cell in notebook.cells:
+        if cell.cell_type != 'code':
+            continue
+        number += 1
+        cell.execution_count = number
+        for output in cell.outputs:
+            if output.get('output_type') == 'execute_result':
+                output['execution_count'] = number
+
+
+@traced('notebooks.execute')
+def execute_incremental(notebook, inputs_hash, workdir='.', cache_dir=DEFAULT_CACHE_DIR,
+                        force=False, kernel=DEFAULT_KERNEL, timeout=CELL_TIMEOUT):
+    """Fill a notebook's code cell outputs from the cache, executing only what changed
+
+    Returns the indices (into ``notebook.cells``) of the ``changed`` cells,
+    all ``executed`` cells and the ``cached`` ones.
+    """
+    nbf = _nbformat()
+    code_cells = [index for index, cell in enumerate(notebook.cells) if cell.cell_type == 'code']
+    sources = [notebook.cells[index].source for index in code_cells]
+    dependencies = cell_dependencies(sources)
+    keys = cell_keys(sources, dependencies, inputs_hash, kernel)
+
+    cached = {}
+    if not force:
+        for position, key in enumerate(keys):
+            entry = _read_cached(cache_dir, key)
+            if entry is not None:
+                cached[position] = entry
+    changed = [position for position in range(len(keys)) if position not in cached]
+    # Changed cells need the kernel state of everything they depend on
+    run = set()
+    stack = list(changed)
+    while stack:
+        position = stack.pop()
+        if position not in run:
+            run.add(position)
+            stack.extend(dependencies[position])
+
+    for position, entry in cached.items():
+        if position not in run:
+            notebook.cells[code_cells[position]].outputs = [
+                nbf.from_dict(output) for output in entry['outputs']]
+    if run:
+        from nbclient import NotebookClient
+
+        client = NotebookClient(notebook, timeout=timeout, kernel_name=kernel,
+                                resources={'metadata': {'path': workdir}})
+        with client.setup_kernel():
+            for position in sorted(run):
+                index = code_cells[position]
+                with span('notebooks.cell', index=index):
+                    client.execute_cell(notebook.cells[index], index)
+                _write_cached(cache_dir, keys[position], notebook.cells[index])
+    _number_cells(notebook)
+    count('notebook_cells_executed', len(run))
+    return {
+        'changed': [code_cells[position] for position in changed],
+        'executed': [code_cells[position] for position in sorted(run)],
+        'cached': [code_cells[position] for position in sorted(set(cached) - run)],
+    }
+
+
+def verify_notebook(notebook, required=None):
+    """Problems with a notebook's required charts, by chart title; empty when all are drawn
+
+    A chart counts as drawn when a code cell tagged with its title has an
+    image output and no error. ``notebook`` is a path or a notebook;
+    ``required`` defaults to the charts of the template it was built from.
+    """
+    nbf = _nbformat()
+    if isinstance(notebook, str):
+        notebook = nbf.read(notebook, as_version=4)
+    if required is None:
+        template = notebook.metadata.get('template')
+        if template not in TEMPLATES:
+            raise ValueError("Notebook wasn't built from a template; pass the required charts")
+        required = TEMPLATES[template]['required_charts']
+    charts = {}
+    for cell in notebook.cells:
+        if cell.cell_type == 'code' and cell.metadata.get('chart'):
+            charts.setdefault(cell.metadata['chart'], []).append(cell)
+    problems = {}
+    for title in required:
+        cells = charts.get(title)
+        if not cells:
+            problems[title] = "no cell draws it"
+            continue
+        outputs = [output for cell in cells for output in cell.get('outputs', [])]
+        if any(output.get('output_type') == 'error' for output in outputs):
+            problems[title] = "its cell raised an error"
+        elif not any(kind in output.get('data', {}) for output in outputs for kind in IMAGE_TYPES):
+            problems[title] = "its cell has no image output"
+    return problems
+
+
+@traced('notebooks.build')
+def build_notebook(template='eda', output=None, params=None, data_paths=None, execute=True,
+                   cache_dir=DEFAULT_CACHE_DIR, force=False, kernel=DEFAULT_KERNEL,
+                   timeout=CELL_TIMEOUT):
+    """Render a template to ``output``, executing it incrementally
+
+    ``data_paths`` are the files the notebook reads, relative to the current
+    directory; their contents are part of every cell's cache key. They
+    default to the template's ``data_path`` resolved against the notebook's
+    directory. Returns the build stats of ``execute_incremental`` (empty
+    without ``execute``) with the output path.
+    """
+    nbf = _nbformat()
+    output = output or DEFAULT_OUTPUTS.get(template, f'notebooks/{template}.ipynb')
+    workdir = os.path.dirname(output) or '.'
+    params = params or {}
+    notebook = render_template(template, **params)
+    stats = {}
+    if execute:
+        if data_paths is None:
+            path = params.get('data_path', TEMPLATES[template]['defaults'].get('data_path'))
+            data_paths = [os.path.normpath(os.path.join(workdir, path))] if path else []
+        stats = execute_incremental(notebook, data_hash(data_paths), workdir, cache_dir, force,
+                                    kernel, timeout)
+    os.makedirs(workdir, exist_ok=True)
+    with open(output + '.tmp', 'w', encoding='utf-8') as f:
+        nbf.write(notebook, f)
+    os.replace(output + '.tmp', output)
+    return {'output': output, **stats}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        output = os.path.join('notebooks', 'eda_demo.ipynb')
+        try:
+            for label, params in [('cold build', {}), ('no-op rebuild', {}),
+                                  ('retitled', {'title': 'EDA (demo)'})]:
+                start = time.perf_counter()
+                stats = build_notebook('eda', output, params, cache_dir=cache_dir)
+                print(f"{label}: executed {len(stats['executed'])}, cached {len(stats['cached'])} "
+                      f"in {time.perf_counter() - start:.1f}s")
+            print(f"Chart problems: {verify_notebook(output) or 'none'}")
+        finally:
+            if os.path.exists(output):
+                os.remove(output)
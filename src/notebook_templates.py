@@ -0,0 +1,268 @@
+"""Notebook templates for ``src.notebook_builder``
+
+A template is a list of cells. Their sources may contain ``$name``
+placeholders that are filled from the build parameters. Chart cells name
+the visualization they draw; the builder's verification step checks that
+each required chart produced an image.
+"""
+from textwrap import dedent
+
+# Visualizations the EDA notebook must contain
+REQUIRED_CHARTS = [
+    "Account ownership trajectory (2011-2024)",
+    "Growth rates between survey years",
+    "Gender gap visualization",
+    "Urban vs rural ownership comparison",
+    "Mobile money account penetration trend",
+    "Digital payment adoption patterns",
+    "Infrastructure data plots",
+    "Event timeline visualization",
+    "Correlation heatmap",
+]
+
+# Paths are relative to the notebook's directory, where its kernel runs
+EDA_DEFAULTS = {
+    'title': 'Exploratory Data Analysis: Ethiopia Financial Inclusion',
+    'repo_root': '..',
+    'data_path': '../data/processed/ethiopia_fi_enriched.csv',
+}
+
+
+def markdown(source):
+    return {'cell_type': 'markdown', 'source': dedent(source).strip()}
+
+
+def code(source, chart=None):
+    return {'cell_type': 'code', 'source': dedent(source).strip(), 'chart': chart}
+
+
+EDA_TEMPLATE = [
+    markdown("""
+        # $title
+        **Task 2 - Exploratory Data Analysis**
+
+        Built by `python -m src notebook`; edit `src/notebook_templates.py` rather than this file.
+    """),
+    code("""
+        import sys
+        import warnings
+
+        import pandas as pd
+        import numpy as np
+        import matplotlib.pyplot as plt
+
+        sys.path.insert(0, '$repo_root')
+        from src.analytics import growth_summary, growth_table
+
+        warnings.filterwarnings('ignore')
+        plt.style.use('seaborn-v0_8-darkgrid')
+        %matplotlib inline
+
+
+        def show_missing(ax, title, message):
+            ax.set_title(title, fontsize=14, fontweight='bold')
+            ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=12, color='gray',
+                    transform=ax.transAxes)
+            ax.set_xticks([])
+            ax.set_yticks([])
+    """),
+    code("""
+        data = pd.read_csv('$data_path')
+        data['year'] = pd.to_datetime(data['observation_date'], errors='coerce').dt.year
+        observations = data[(data['record_type'] == 'observation') & data['value_numeric'].notna()]
+        events = data[data['record_type'] == 'event']
+        code_text = observations['indicator_code'].astype(str)
+        print(f'Loaded {len(data)} records: {len(observations)} observations, {len(events)} events')
+    """),
+    markdown("""
+        ## 1. Dataset Overview
+        Understanding the structure and completeness of our data.
+    """),
+    code("""
+        print('=== RECORD TYPES ===')
+        print(data['record_type'].value_counts())
+        print('\\n=== PILLAR DISTRIBUTION ===')
+        print(data['pillar'].value_counts(dropna=False))
+        print('\\n=== TEMPORAL RANGE ===')
+        print(f"From: {data['observation_date'].min()} to {data['observation_date'].max()}")
+    """),
+    code("""
+        print('=== MISSING VALUES ===')
+        for col in ['value_numeric', 'observation_date', 'source_name']:
+            missing = data[col].isna().sum()
+            print(f'  {col}: {missing}/{len(data)} ({missing / len(data) * 100:.1f}%)')
+        if 'confidence' in data.columns:
+            print('\\n=== CONFIDENCE LEVELS ===')
+            print(data['confidence'].value_counts(dropna=False))
+    """),
+    markdown("""
+        ## 2. Access Analysis - Account Ownership
+        Period growth, CAGR and gap to target for every indicator come from `src.analytics`.
+    """),
+    code("""
+        growth = growth_table(data)
+        account = growth[growth['indicator_code'] == 'ACC_OWNERSHIP']
+        print(account[['year', 'value', 'change_pp', 'annualized_pp', 'cagr', 'acceleration',
+                       'gap_to_target']].round(3).to_string(index=False))
+    """),
+    code("""
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.plot(account['year'], account['value'], 'o-', linewidth=3, markersize=10,
+                markerfacecolor='white', markeredgewidth=2, label='Account Ownership')
+        for _, row in account.dropna(subset=['change_pp']).iterrows():
+            ax.annotate(f"+{row['change_pp']:.0f}pp",
+                        xy=((row['prev_year'] + row['year']) / 2, (row['prev_value'] + row['value']) / 2),
+                        xytext=(0, 10), textcoords='offset points', ha='center', fontweight='bold')
+        ax.set_title('Ethiopia: Account Ownership Trend (2011-2024)', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Year', fontsize=14)
+        ax.set_ylabel('Account Ownership (% of adults)', fontsize=14)
+        ax.set_xticks(account['year'])
+        ax.legend(fontsize=12)
+        plt.show()
+    """, chart="Account ownership trajectory (2011-2024)"),
+    code("""
+        periods = account.dropna(subset=['change_pp'])
+        fig, ax = plt.subplots(figsize=(12, 5))
+        labels = [f'{prev:.0f}-{year}' for prev, year in zip(periods['prev_year'], periods['year'])]
+        colors = ['green' if g > 5 else 'orange' if g > 2 else 'red' for g in periods['change_pp']]
+        ax.bar(labels, periods['change_pp'], color=colors, alpha=0.7, label='Change (pp)')
+        ax.plot(labels, periods['annualized_pp'], 'ko--', label='pp per year')
+        ax.set_title('Account Ownership Growth Between Survey Years', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Percentage points')
+        ax.legend()
+        plt.show()
+    """, chart="Growth rates between survey years"),
+    markdown("""
+        ## 3. Disaggregation
+        Gender and location breakdowns, where the dataset has them.
+    """),
+    code("""
+        if 'gender' in observations.columns:
+            by_gender = observations[observations['gender'].isin(['male', 'female'])]
+        else:
+            rows = code_text.str.contains('_MALE|_FEMALE')
+            by_gender = observations[rows].assign(
+                gender=np.where(code_text[rows].str.contains('_FEMALE'), 'female', 'male'))
+        fig, ax = plt.subplots(figsize=(12, 5))
+        if by_gender.empty:
+            show_missing(ax, 'Account Ownership by Gender', 'No gender-disaggregated observations yet')
+        else:
+            table = by_gender.pivot_table(index='year', columns='gender', values='value_numeric')
+            table.plot(kind='bar', ax=ax)
+            if {'male', 'female'} <= set(table.columns):
+                for i, gap in enumerate(table['male'] - table['female']):
+                    ax.text(i, table.iloc[i].max(), f'gap {gap:.1f}pp', ha='center', va='bottom')
+            ax.set_title('Account Ownership by Gender', fontsize=14, fontweight='bold')
+            ax.set_ylabel('% of adults')
+        plt.show()
+    """, chart="Gender gap visualization"),
+    code("""
+        if 'location' in observations.columns:
+            by_location = observations[observations['location'].isin(['urban', 'rural'])]
+        else:
+            rows = code_text.str.contains('_URBAN|_RURAL')
+            by_location = observations[rows].assign(
+                location=np.where(code_text[rows].str.contains('_URBAN'), 'urban', 'rural'))
+        fig, ax = plt.subplots(figsize=(12, 5))
+        if by_location.empty:
+            show_missing(ax, 'Urban vs Rural Account Ownership', 'No urban/rural observations yet')
+        else:
+            by_location.pivot_table(index='year', columns='location',
+                                    values='value_numeric').plot(kind='bar', ax=ax)
+            ax.set_title('Urban vs Rural Account Ownership', fontsize=14, fontweight='bold')
+            ax.set_ylabel('% of adults')
+        plt.show()
+    """, chart="Urban vs rural ownership comparison"),
+    markdown("""
+        ## 4. Usage Analysis
+        Mobile money and digital payments.
+    """),
+    code("""
+        mobile_money = observations[observations['indicator'].str.contains('mobile money', case=False, na=False)
+                                    | code_text.str.contains('MOBILE_MONEY|_MM_')]
+        fig, ax = plt.subplots(figsize=(12, 5))
+        if mobile_money.empty:
+            show_missing(ax, 'Mobile Money Account Penetration', 'No mobile money observations yet')
+        else:
+            for name, rows in mobile_money.sort_values('year').groupby('indicator'):
+                ax.plot(rows['year'], rows['value_numeric'], 'o-', label=name)
+            ax.set_title('Mobile Money Account Penetration', fontsize=14, fontweight='bold')
+            ax.set_ylabel('% of adults')
+            ax.legend()
+        plt.show()
+    """, chart="Mobile money account penetration trend"),
+    code("""
+        usage = observations[observations['pillar'] == 'usage']
+        latest_account = account['value'].iloc[-1] if len(account) else np.nan
+        fig, ax = plt.subplots(figsize=(12, 5))
+        if usage.empty:
+            show_missing(ax, 'Digital Payment Adoption', 'No usage observations yet')
+        else:
+            latest = usage.sort_values('year').groupby('indicator').last()
+            ax.barh(latest.index, latest['value_numeric'], color='#2E86AB', alpha=0.8)
+            if not np.isnan(latest_account):
+                ax.axvline(latest_account, color='red', linestyle='--',
+                           label=f'Account ownership ({latest_account:.0f}%)')
+                ax.legend()
+            ax.set_title('Digital Payment Adoption vs Account Ownership', fontsize=14, fontweight='bold')
+            ax.set_xlabel('% of adults')
+        plt.show()
+    """, chart="Digital payment adoption patterns"),
+    markdown("""
+        ## 5. Infrastructure and Events
+    """),
+    code("""
+        infrastructure = observations[observations['pillar'] == 'infrastructure']
+        fig, ax = plt.subplots(figsize=(12, 5))
+        if infrastructure.empty:
+            show_missing(ax, 'Infrastructure Indicators', 'No infrastructure observations yet')
+        else:
+            latest = infrastructure.sort_values('year').groupby('indicator').last()
+            ax.barh(latest.index, latest['value_numeric'], color='#6A4C93', alpha=0.8)
+            for i, value in enumerate(latest['value_numeric']):
+                ax.text(value, i, f' {value:g}', va='center')
+            ax.set_title('Infrastructure Indicators (latest)', fontsize=14, fontweight='bold')
+        plt.show()
+    """, chart="Infrastructure data plots"),
+    code("""
+        fig, ax = plt.subplots(figsize=(12, 5))
+        ax.plot(account['year'], account['value'], 'o-', color='#2E86AB', label='Account Ownership')
+        event_dates = pd.to_datetime(events['observation_date'], errors='coerce')
+        for name, date in zip(events['indicator'], event_dates):
+            if pd.notna(date):
+                position = date.year + (date.dayofyear - 1) / 365
+                ax.axvline(position, color='red', linestyle='--', alpha=0.6)
+                ax.text(position, ax.get_ylim()[1] * 0.95, name, rotation=90, va='top', color='red')
+        ax.set_title('Event Timeline and Account Ownership', fontsize=14, fontweight='bold')
+        ax.set_ylabel('% of adults')
+        ax.legend(loc='lower right')
+        plt.show()
+    """, chart="Event timeline visualization"),
+    code("""
+        wide = observations.pivot_table(index='year', columns='indicator_code', values='value_numeric')
+        correlation = wide.corr(min_periods=2).dropna(how='all').dropna(axis=1, how='all')
+        fig, ax = plt.subplots(figsize=(8, 6))
+        if correlation.shape[0] < 2:
+            show_missing(ax, 'Indicator Correlations',
+                         'Fewer than two indicators share two or more years')
+        else:
+            image = ax.imshow(correlation, cmap='RdBu_r', vmin=-1, vmax=1)
+            ax.set_xticks(range(len(correlation.columns)), correlation.columns, rotation=45, ha='right')
+            ax.set_yticks(range(len(correlation.index)), correlation.index)
+            fig.colorbar(image, ax=ax)
+            ax.set_title('Indicator Correlations', fontsize=14, fontweight='bold')
+        plt.show()
+    """, chart="Correlation heatmap"),
+    markdown("""
+        ## 6. Key Insights Summary
+    """),
+    code("""
+        summary = growth_summary(growth)
+        print(summary[['indicator_code', 'first_year', 'latest_year', 'latest_value', 'avg_pp_per_year',
+                       'cagr', 'gap_to_target', 'required_pp_per_year']].round(3).to_string(index=False))
+    """),
+]
+
+TEMPLATES = {
+    'eda': {'cells': EDA_TEMPLATE, 'defaults': EDA_DEFAULTS, 'required_charts': REQUIRED_CHARTS},
+}
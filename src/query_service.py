@@ -0,0 +1,276 @@
+import asyncio
+import http.client
+import json
+import os
+import queue
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pandas as pd
+
+from src.artifacts import DEFAULT_ARTIFACT_DIR, load_artifact
+from src.data_store import DEFAULT_DATA_PATH, load_store
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+ARTIFACT_TABLES = ('history', 'forecasts')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as exc:
+        raise ImportError("The query service requires pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def to_arrow(frame):
+    """Encode a frame as an Arrow IPC stream"""
+    pa = _pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_arrow(body):
+    """Decode an Arrow IPC stream into a frame"""
+    pa = _pyarrow()
+    return pa.ipc.open_stream(pa.py_buffer(body)).read_pandas()
+
+
+def slice_artifact(artifact, table, indicators=None, scenarios=None, start=None, end=None):
+    """Rows of an artifact's history or forecasts table
+
+    ``indicators`` and ``scenarios`` are lists of codes and scenario names;
+    ``start``/``end`` bound the year inclusively.
+    """
+    if table not in ARTIFACT_TABLES:
+        raise KeyError(table)
+    frame = artifact[table]
+    mask = pd.Series(True, index=frame.index)
+    if indicators is not None:
+        mask &= frame['indicator_code'].isin(indicators)
+    if scenarios is not None and 'scenario' in frame.columns:
+        mask &= frame['scenario'].isin(scenarios)
+    if start is not None:
+        mask &= frame['year'] >= int(start)
+    if end is not None:
+        mask &= frame['year'] <= int(end)
+    return frame[mask].reset_index(drop=True)
+
+
+def _list_param(params, name):
+    """Comma-separated values of a parameter: None when it is absent, [] when it is blank"""
+    if name not in params:
+        return None
+    return [v for value in params[name] for v in value.split(',') if v]
+
+
+class QueryService:
+    """Serves slices of the unified store and forecast artifact over HTTP
+
+    One process holds a single copy of the data for every dashboard session.
+    Routes:
+
+    - ``GET /manifest``: the artifact manifest as JSON
+    - ``GET /history``, ``GET /forecasts``: artifact rows as an Arrow stream,
+      filtered by ``indicator``, ``scenario``, ``start`` and ``end``
+    - ``GET /observations``: observation records from the store, filtered by
+      ``indicator``, ``start`` and ``end`` (dates)
+    - ``POST /reload``: reread the latest artifact and the store
+
+    A list parameter that is left out doesn't filter; a blank one
+    (``indicator=``) is an empty list and selects no rows.
+
+    Connections are kept alive, so a pooled client pays the connect cost once.
+    """
+
+    def __init__(self, artifact_dir=DEFAULT_ARTIFACT_DIR, data_path=DEFAULT_DATA_PATH):
+        self.artifact_dir = artifact_dir
+        self.data_path = data_path
+        self.reload()
+
+    def reload(self):
+        try:
+            self.artifact = load_artifact(self.artifact_dir)
+        except FileNotFoundError:
+            self.artifact = None
+        self.store = load_store(self.data_path) if os.path.exists(self.data_path) else None
+
+    def observations(self, indicators=None, start=None, end=None):
+        """Observation records for some indicators and an inclusive date range"""
+        if indicators is None:
+            return self.store.observations(start=start, end=end)
+        frames = [self.store.observations(code, start, end) for code in indicators]
+        if not frames:
+            return self.store.observations().iloc[:0].reset_index(drop=True)
+        return pd.concat(frames, ignore_index=True)
+
+    def handle(self, method, target):
+        """Status, content type and body for one request"""
+        url = urlsplit(target)
+        params = parse_qs(url.query, keep_blank_values=True)
+        route = url.path.strip('/')
+        start, end = params.get('start', [None])[0] or None, params.get('end', [None])[0] or None
+        indicators = _list_param(params, 'indicator')
+
+        if method == 'POST' and route == 'reload':
+            self.reload()
+            return 200, 'application/json', b'{"reloaded": true}'
+        if method != 'GET':
+            return 405, 'text/plain', b'Method not allowed'
+        if route == 'manifest':
+            if self.artifact is None:
+                return 404, 'text/plain', b'No forecast artifact'
+            return 200, 'application/json', json.dumps(self.artifact['manifest']).encode()
+        if route in ARTIFACT_TABLES:
+            if self.artifact is None:
+                return 404, 'text/plain', b'No forecast artifact'
+            frame = slice_artifact(self.artifact, route, indicators,
+                                   _list_param(params, 'scenario'), start, end)
+            return 200, ARROW_STREAM, to_arrow(frame)
+        if route == 'observations':
+            if self.store is None:
+                return 404, 'text/plain', b'No unified dataset'
+            return 200, ARROW_STREAM, to_arrow(self.observations(indicators, start, end))
+        return 404, 'text/plain', b'Not found'
+
+    async def _serve_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get('content-length', 0)):
+                    await reader.readexactly(int(headers['content-length']))
+
+                # Slicing and encoding run off the event loop so slow
+                # requests don't hold up the other connections
+                try:
+                    status, content_type, body = await loop.run_in_executor(
+                        None, self.handle, method, target)
+                except Exception as exc:
+                    status, content_type, body = 500, 'text/plain', str(exc).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {http.client.responses.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class QueryClient:
+    """Thread-safe client for a QueryService with a pool of kept-alive connections"""
+
+    def __init__(self, url=f'http://{DEFAULT_HOST}:{DEFAULT_PORT}', pool_size=8, timeout=10):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or DEFAULT_PORT
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(self, method, route, **params):
+        """Body and content type of a response; raises on HTTP errors
+
+        None parameters are left out; an empty list is sent blank, which
+        the service reads as selecting nothing.
+        """
+        params = {name: ','.join(value) if isinstance(value, (list, tuple)) else value
+                  for name, value in params.items() if value is not None}
+        target = f'/{route}' + (f'?{urlencode(params)}' if params else '')
+        for attempt in range(2):
+            conn = self._connection()
+            done = False
+            try:
+                conn.request(method, target)
+                response = conn.getresponse()
+                body = response.read()
+                done = True
+            except (http.client.HTTPException, ConnectionError):
+                # A pooled connection the server has since closed
+                if attempt:
+                    raise
+                continue
+            finally:
+                # Only a connection that finished its exchange is reused;
+                # timeouts and other errors close it
+                if done:
+                    self._release(conn)
+                else:
+                    conn.close()
+            if response.status != 200:
+                raise RuntimeError(f"{method} {target} failed: {response.status} {body.decode()}")
+            return body, response.getheader('Content-Type')
+
+    def manifest(self):
+        return json.loads(self.request('GET', 'manifest')[0])
+
+    def history(self, indicators=None, start=None, end=None):
+        return from_arrow(self.request('GET', 'history', indicator=indicators,
+                                       start=start, end=end)[0])
+
+    def forecasts(self, indicators=None, scenarios=None, start=None, end=None):
+        return from_arrow(self.request('GET', 'forecasts', indicator=indicators,
+                                       scenario=scenarios, start=start, end=end)[0])
+
+    def observations(self, indicators=None, start=None, end=None):
+        return from_arrow(self.request('GET', 'observations', indicator=indicators,
+                                       start=start, end=end)[0])
+
+    def reload(self):
+        self.request('POST', 'reload')
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the unified store and forecast artifact")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    service = QueryService()
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(service.serve(args.host, args.port))
@@ -0,0 +1,241 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from src.instrumentation import traced
+
+# Quantile of the simulated distribution reported under each dashboard scenario
+SCENARIO_QUANTILES = {'pessimistic': 0.1, 'baseline': 0.5, 'optimistic': 0.9}
+# Histogram bins per series and year when summarizing streamed paths
+SUMMARY_BINS = 512
+
+_worker_simulator = None
+
+
+def _init_worker(simulator):
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _simulate_chunk(task):
+    n_paths, seed = task
+    return _worker_simulator.simulate_chunk(n_paths, seed)
+
+
+class ScenarioSimulator:
+    """Monte Carlo scenario paths from a batch-fitted forecaster and event model
+
+    Each path draws trend coefficients from their sampling distribution,
+    scales every event's impact by a random factor and shifts its timing by
+    a whole number of years. Paths are stored as one array of shape
+    (paths, years, series).
+    """
+
+    def __init__(self, forecaster, events_model, events_list, years,
+                 impact_sd=0.25, timing_sd=1.0, dtype=np.float32):
+        if forecaster.coefficients is None:
+            raise ValueError("Forecaster has no batch models; call fit_batch first")
+
+        self.years = np.asarray(list(years), dtype=float)
+        self.series_index = forecaster.series_index
+        self.impact_sd = impact_sd
+        self.timing_sd = timing_sd
+        self.dtype = dtype
+        self.events_model = events_model
+        self.event_counts = events_model._event_counts(events_list)
+
+        # Trend re-parametrized around each series' mean year so the level
+        # and slope draws are independent
+        stats = forecaster.batch_stats
+        n, sx, sy, sxx, sxy, syy = stats.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.x_mean = sx / n
+            s_xx = sxx - n * self.x_mean ** 2
+            s_xy = sxy - n * self.x_mean * (sy / n)
+            s_yy = syy - sy ** 2 / n
+            slope = forecaster.coefficients[:, 1]
+            sigma = np.sqrt(np.clip(s_yy - slope * s_xy, 0.0, None) / (n - 2))
+            sigma = np.where(n > 2, sigma, 0.0)
+            self.level_sd = sigma / np.sqrt(n)
+            self.slope_sd = np.where(s_xx > 1e-12, sigma / np.sqrt(s_xx), 0.0)
+        self.level = sy / n
+        self.slope = slope
+        self.x = self.years - forecaster.year_origin
+
+        # Map each series to its indicator column in the event model
+        codes = self.series_index.get_level_values(0)
+        self.indicator_cols = events_model.indicators.get_indexer(codes)
+        self.event_years = np.where(np.isnan(events_model.event_years),
+                                    self.years[0], events_model.event_years)
+
+    def simulate_chunk(self, n_paths, seed):
+        """Simulate ``n_paths`` paths with their own random stream"""
+        rng = np.random.default_rng(seed)
+        n_series = len(self.level)
+
+        level = self.level + self.level_sd * rng.standard_normal((n_paths, n_series))
+        slope = self.slope + self.slope_sd * rng.standard_normal((n_paths, n_series))
+        paths = level[:, None, :] + slope[:, None, :] * (self.x[None, :, None] - self.x_mean)
+
+        n_events = len(self.event_counts)
+        if n_events and self.event_counts.any():
+            scale = np.clip(1 + self.impact_sd * rng.standard_normal((n_paths, n_events)), 0.0, None)
+            shift = np.rint(self.timing_sd * rng.standard_normal((n_paths, n_events)))
+            offsets = self.years[None, None, :] - (self.event_years[None, :, None] + shift[:, :, None])
+            weights = self.events_model.profile_weights(offsets)
+            weights *= (scale * self.event_counts)[:, :, None]
+
+            # (paths * years, events) -> (paths * years, indicators)
+            deltas = self.events_model._propagate(
+                weights.transpose(0, 2, 1).reshape(-1, n_events)
+            ).reshape(n_paths, len(self.years), -1)
+            mapped = self.indicator_cols >= 0
+            paths[:, :, mapped] += deltas[:, :, self.indicator_cols[mapped]]
+
+        return paths.astype(self.dtype, copy=False)
+
+    def _tasks(self, n_paths, chunk_size, seed):
+        sizes = [min(chunk_size, n_paths - i) for i in range(0, n_paths, chunk_size)]
+        return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+    def iter_chunks(self, n_paths, chunk_size=1000, seed=0, n_jobs=1):
+        """Yield (start, paths) chunks so callers can stream bounded-size blocks
+
+        With ``n_jobs`` other than 1, chunks are simulated across a process
+        pool (None uses every core) and still yielded in order.
+        """
+        tasks = self._tasks(n_paths, chunk_size, seed)
+        n_jobs = n_jobs or os.cpu_count()
+        start = 0
+        if n_jobs == 1 or len(tasks) <= 1:
+            for size, chunk_seed in tasks:
+                yield start, self.simulate_chunk(size, chunk_seed)
+                start += size
+            return
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)),
+                                 initializer=_init_worker, initargs=(self,)) as pool:
+            for chunk in pool.map(_simulate_chunk, tasks):
+                yield start, chunk
+                start += len(chunk)
+
+    @traced('simulation.simulate')
+    def simulate(self, n_paths, chunk_size=1000, n_jobs=1, seed=0, out=None):
+        """Simulate ``n_paths`` paths into one preallocated array
+
+        Paths are generated ``chunk_size`` at a time, in-process or across a
+        pool of ``n_jobs`` workers (None uses every core). Every chunk has its
+        own seed, so results do not depend on ``n_jobs``. Pass ``out`` (e.g.
+        an ``np.memmap``) to write paths somewhere other than RAM.
+        """
+        shape = (n_paths, len(self.years), len(self.level))
+        if out is None:
+            out = np.empty(shape, dtype=self.dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+
+        for start, chunk in self.iter_chunks(n_paths, chunk_size, seed, n_jobs):
+            out[start:start + len(chunk)] = chunk
+        return out
+
+    def summarize(self, paths, quantiles=(0.1, 0.5, 0.9), block_size=1000):
+        """Quantiles per series and year as a tidy frame
+
+        Series are processed ``block_size`` at a time to bound the temporary
+        memory np.quantile needs.
+        """
+        n_years, n_series = paths.shape[1], paths.shape[2]
+        result = np.empty((len(quantiles), n_years, n_series))
+        for start in range(0, n_series, block_size):
+            block = np.asarray(paths[:, :, start:start + block_size], dtype=float)
+            result[:, :, start:start + block_size] = np.quantile(block, quantiles, axis=0)
+
+        return self._quantile_frame(quantiles, result)
+
+    def summarize_chunks(self, chunks, quantiles=(0.1, 0.5, 0.9), bins=SUMMARY_BINS):
+        """Quantiles per series and year from streamed ``(start, paths)`` chunks
+
+        Only a histogram of ``bins`` counts per series and year is kept, so
+        memory does not grow with the number of paths. Bin ranges span three
+        times the spread of the first chunk; values outside fall in the edge
+        bins. Quantiles are interpolated within a bin, so they are exact to
+        within one bin width (1/``bins`` of that range).
+        """
+        counts = lo = width = None
+        n_cells = len(self.years) * len(self.level)
+        offsets = np.arange(n_cells) * bins
+        for _, chunk in chunks:
+            values = np.asarray(chunk, dtype=float).reshape(len(chunk), n_cells)
+            if counts is None:
+                low, high = values.min(axis=0), values.max(axis=0)
+                spread = np.maximum(high - low, 1e-9)
+                lo = low - spread
+                width = 3 * spread / bins
+                counts = np.zeros(n_cells * bins, dtype=np.int32)
+            index = np.clip(((values - lo) / width).astype(np.int64), 0, bins - 1)
+            counts += np.bincount((index + offsets).ravel(), minlength=len(counts)).astype(np.int32)
+        if counts is None:
+            raise ValueError("No paths to summarize")
+
+        counts = counts.reshape(n_cells, bins)
+        cumulative = np.cumsum(counts, axis=1)
+        result = np.empty((len(quantiles), len(self.years), len(self.level)))
+        for i, q in enumerate(quantiles):
+            target = q * cumulative[:, -1]
+            # First bin whose cumulative count reaches the target, then
+            # interpolate linearly inside it
+            b = np.minimum((cumulative < target[:, None]).sum(axis=1), bins - 1)
+            rows = np.arange(n_cells)
+            before = np.where(b > 0, cumulative[rows, np.maximum(b - 1, 0)], 0)
+            inside = np.maximum(counts[rows, b], 1)
+            fraction = np.clip((target - before) / inside, 0.0, 1.0)
+            result[i] = (lo + (b + fraction) * width).reshape(len(self.years), len(self.level))
+        return self._quantile_frame(quantiles, result)
+
+    def _quantile_frame(self, quantiles, result):
+        n_years, n_series = len(self.years), len(self.level)
+        summary = pd.DataFrame({
+            'year': np.tile(self.years.astype(int), n_series),
+        }, index=self.series_index.repeat(n_years))
+        for q, values in zip(quantiles, result):
+            summary[f'p{round(q * 100):02d}'] = values.T.ravel()
+        return summary.reset_index()
+
+
+def simulate_scenarios(forecaster, events_model, events_list, years, n_paths=5000,
+                       chunk_size=1000, n_jobs=1, seed=0, **kwargs):
+    """Simulated scenario bands labelled the way the dashboard expects
+
+    Paths are streamed ``chunk_size`` at a time into ``summarize_chunks``,
+    so memory stays bounded however many paths are drawn. Returns a tidy
+    frame with one row per series and year and one column per scenario in
+    SCENARIO_QUANTILES.
+    """
+    simulator = ScenarioSimulator(forecaster, events_model, events_list, years, **kwargs)
+    summary = simulator.summarize_chunks(
+        simulator.iter_chunks(n_paths, chunk_size=chunk_size, seed=seed, n_jobs=n_jobs),
+        quantiles=list(SCENARIO_QUANTILES.values()))
+    quantile_cols = [f'p{round(q * 100):02d}' for q in SCENARIO_QUANTILES.values()]
+    return summary.rename(columns=dict(zip(quantile_cols, SCENARIO_QUANTILES)))
+
+
+if __name__ == "__main__":
+    from src.forecasting import FinancialInclusionForecaster
+    from src.event_impact import EventImpactModel
+
+    history = pd.DataFrame({
+        'indicator_code': ['ACC_OWNERSHIP'] * 5 + ['ACC_MM_ACCOUNT'] * 3,
+        'observation_date': [2011, 2014, 2017, 2021, 2024, 2017, 2021, 2024],
+        'value_numeric': [0.14, 0.22, 0.35, 0.46, 0.49, 0.003, 0.047, 0.0945]
+    })
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(history)
+
+    events_model = EventImpactModel()
+    events_model.build_impact_matrix(['telebirr_launch', 'mpesa_entry'],
+                                     ['ACC_OWNERSHIP', 'ACC_MM_ACCOUNT'])
+
+    print("Simulated scenarios:")
+    print(simulate_scenarios(forecaster, events_model, ['telebirr_launch', 'mpesa_entry'],
+                             [2025, 2026, 2027]))
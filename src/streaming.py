@@ -0,0 +1,109 @@
+import pandas as pd
+import numpy as np
+
+from src.data_store import UNIFIED_DTYPES
+
+DEFAULT_CHUNKSIZE = 500_000
+AGGREGATIONS = ('mean', 'sum', 'min', 'max', 'count')
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+
+def iter_unified_chunks(path, chunksize=DEFAULT_CHUNKSIZE, record_type=None, pillar=None,
+                        indicator_code=None, start=None, end=None, usecols=None):
+    """Stream a unified-schema CSV in fixed-size, filtered chunks
+
+    Filters accept a single value or a list and are applied to each chunk as
+    it is read, before dates are parsed, so only matching rows are ever held
+    beyond the current chunk. ``start``/``end`` bound observation_date
+    inclusively.
+    """
+    filters = {
+        'record_type': _as_list(record_type),
+        'pillar': _as_list(pillar),
+        'indicator_code': _as_list(indicator_code),
+    }
+    if usecols is not None:
+        needed = [col for col, values in filters.items() if values is not None]
+        usecols = list(dict.fromkeys(list(usecols) + needed + ['observation_date']))
+    # Per-chunk categories would differ between chunks, so read labels as strings
+    dtypes = {col: ('object' if dtype == 'category' else dtype)
+              for col, dtype in UNIFIED_DTYPES.items()
+              if usecols is None or col in usecols}
+
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=dtypes, usecols=usecols):
+        mask = np.ones(len(chunk), dtype=bool)
+        for col, values in filters.items():
+            if values is not None:
+                mask &= chunk[col].isin(values).to_numpy()
+        chunk = chunk[mask]
+        if chunk.empty:
+            continue
+
+        chunk = chunk.assign(observation_date=pd.to_datetime(chunk['observation_date'], errors='coerce'))
+        if start is not None or end is not None:
+            dates = chunk['observation_date']
+            in_range = dates.notna()
+            if start is not None:
+                in_range &= dates >= start
+            if end is not None:
+                in_range &= dates <= end
+            chunk = chunk[in_range]
+        if not chunk.empty:
+            yield chunk
+
+
+def aggregate_yearly(path, agg='mean', group_cols=('indicator_code',), chunksize=DEFAULT_CHUNKSIZE,
+                     record_type='observation', **filters):
+    """Aggregate a unified-schema CSV into yearly series without loading it
+
+    Each chunk is reduced to per-(group, year) partial sums, counts and
+    extremes, which are merged into a running total, so peak memory is one
+    chunk plus one row per series-year. Returns a long frame with
+    ``group_cols``, ``year``, ``value_numeric`` and ``n_obs``, ready for
+    ``FinancialInclusionForecaster.fit_batch(..., time_col='year')``.
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {agg}")
+
+    keys = list(group_cols) + ['year']
+    usecols = list(group_cols) + ['value_numeric']
+    running = None
+    for chunk in iter_unified_chunks(path, chunksize, record_type=record_type,
+                                     usecols=usecols, **filters):
+        chunk = chunk[chunk['value_numeric'].notna() & chunk['observation_date'].notna()]
+        chunk = chunk.assign(year=chunk['observation_date'].dt.year)
+        partial = chunk.groupby(keys, dropna=False)['value_numeric'].agg(
+            ['sum', 'count', 'min', 'max']
+        ).astype(float)
+        if running is None:
+            running = partial
+            continue
+        running, partial = running.align(partial)
+        running = pd.DataFrame({
+            'sum': running['sum'].fillna(0) + partial['sum'].fillna(0),
+            'count': running['count'].fillna(0) + partial['count'].fillna(0),
+            'min': np.fmin(running['min'], partial['min']),
+            'max': np.fmax(running['max'], partial['max']),
+        })
+
+    if running is None:
+        return pd.DataFrame(columns=keys + ['value_numeric', 'n_obs'])
+
+    values = running['sum'] / running['count'] if agg == 'mean' else running[agg]
+    return pd.DataFrame({
+        'value_numeric': values,
+        'n_obs': running['count'].astype(int),
+    }).sort_index().reset_index()
+
+
+if __name__ == "__main__":
+    yearly = aggregate_yearly('data/processed/ethiopia_fi_enriched.csv', chunksize=5)
+    print("Yearly series:")
+    print(yearly)
@@ -0,0 +1,144 @@
+"""Local HTTP stand-in for the ingest sources, used by the ingest tests
+
+``python -m tests.ingest_fixtures`` times a refresh of synthetic specs
+against it at different concurrency levels.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pandas as pd
+import numpy as np
+
+from src.ingest import SOURCES, spec_url
+
+
+def fixture_payload(spec, years=range(2011, 2025), seed=0):
+    """Deterministic payload for a spec in its source's format"""
+    rng = np.random.default_rng([seed, int(hashlib.sha256(spec['series'].encode()).hexdigest()[:8], 16)])
+    years = list(years)
+    values = np.round(np.cumsum(rng.uniform(0, 5, len(years))), 2)
+    fmt = SOURCES[spec['source']]['format']
+    if fmt == 'worldbank':
+        rows = [{'indicator': {'id': spec['series']}, 'country': {'id': spec['country']},
+                 'date': str(year), 'value': float(value)}
+                for year, value in zip(reversed(years), reversed(values))]
+        return json.dumps([{'page': 1, 'pages': 1, 'total': len(rows)}, rows]).encode()
+    if fmt == 'sdmx':
+        obs = [{'@TIME_PERIOD': str(year), '@OBS_VALUE': str(value)}
+               for year, value in zip(years, values)]
+        return json.dumps({'CompactData': {'DataSet': {'Series': {
+            '@INDICATOR': spec['series'], '@REF_AREA': spec['country'], 'Obs': obs}}}}).encode()
+    return pd.DataFrame({'Year': years, 'Value': values}).to_csv(index=False).encode()
+
+
+class FixtureServer:
+    """Local stand-in for the ingest sources
+
+    Serves ``fixture_payload`` for every spec at the path its source would
+    use, with ETags and 304 responses. ``latency`` adds a per-request delay
+    and ``fail_first`` answers that many requests per path with 503, to
+    exercise concurrency and retries.
+    """
+
+    def __init__(self, specs, port=0, latency=0.0, fail_first=0):
+        self.payloads = {}
+        for spec in specs:
+            url = urlsplit(spec_url(spec, {spec['source']: 'http://fixture'}))
+            self.payloads[url.path + ('?' + url.query if url.query else '')] = fixture_payload(spec)
+        self.latency = latency
+        self.fail_first = fail_first
+        self.hits = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    @property
+    def base_urls(self):
+        """Base URL overrides pointing every source at this server"""
+        return {source: self.url for source in SOURCES}
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=b'', etag=None):
+                self.send_response(status)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.hits[self.path] = fixture.hits.get(self.path, 0) + 1
+                    hits = fixture.hits[self.path]
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                body = fixture.payloads.get(self.path)
+                if body is None:
+                    return self._reply(404, b'Not found')
+                if hits <= fixture.fail_first:
+                    return self._reply(503, b'Try again')
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self._reply(304, etag=etag)
+                self._reply(200, body, etag)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def synthetic_specs(n):
+    """``n`` indicator specs spread across every source"""
+    sources = list(SOURCES)
+    return [{'indicator_code': f'SYN_{i:04d}', 'indicator': f'Synthetic indicator {i}',
+             'pillar': 'usage', 'source': sources[i % len(sources)], 'series': f'SYN.{i:04d}',
+             'country': 'ETH', 'source_name': sources[i % len(sources)]}
+            for i in range(n)]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from src.ingest import refresh
+
+    specs = synthetic_specs(300)
+    server = FixtureServer(specs, latency=0.02, fail_first=1).start()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for concurrency in (1, 32):
+            server.hits.clear()
+            start = time.perf_counter()
+            records, errors, _ = refresh(specs, base_urls=server.base_urls, backoff=0.01,
+                                         concurrency=concurrency, cache_dir=f'{cache_dir}/{concurrency}')
+            print(f"concurrency={concurrency}: {len(records)} records, {len(errors)} errors "
+                  f"in {time.perf_counter() - start:.2f}s")
+        server.fail_first = 0
+        start = time.perf_counter()
+        records, errors, _ = refresh(specs, base_urls=server.base_urls, concurrency=32,
+                                     cache_dir=f'{cache_dir}/32')
+        print(f"cached refresh: {len(records)} records in {time.perf_counter() - start:.2f}s")
+    server.stop()
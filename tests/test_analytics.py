@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from src.analytics import growth_summary, growth_table, targets_from_records
+
+
+def records(series, record_type='observation'):
+    rows = [(code, year, value) for code, points in series.items() for year, value in points]
+    return pd.DataFrame({
+        'record_type': record_type,
+        'indicator_code': [code for code, _, _ in rows],
+        'observation_date': [f'{year}-12-31' for _, year, _ in rows],
+        'value_numeric': [value for _, _, value in rows],
+    })
+
+
+def test_known_cagr_series():
+    # 10% a year from 2014, observed at irregular survey years
+    years = [2014, 2017, 2021, 2024]
+    table = growth_table(records({'ACC': [(year, 20.0 * 1.1 ** (year - 2014)) for year in years]}))
+    assert table['year'].tolist() == years
+    np.testing.assert_allclose(table['cagr'].iloc[1:], 0.1)
+    np.testing.assert_allclose(table['years_elapsed'].iloc[1:], [3, 4, 3])
+    np.testing.assert_allclose(table['annualized_pp'].iloc[1:],
+                               table['change_pp'].iloc[1:] / np.array([3, 4, 3]))
+    assert np.isnan(table['cagr'].iloc[0]) and np.isnan(table['change_pp'].iloc[0])
+
+    summary = growth_summary(table).set_index('indicator_code')
+    assert summary.loc['ACC', 'cagr'] == pytest.approx(0.1)
+    assert summary.loc['ACC', 'n_obs'] == 4
+    assert summary.loc['ACC', 'avg_pp_per_year'] == pytest.approx(
+        (20.0 * 1.1 ** 10 - 20.0) / 10)
+
+
+def test_single_observation_and_non_positive_series():
+    table = growth_table(records({
+        'ONE': [(2024, 49.0)],
+        'ZERO': [(2017, 0.0), (2021, 4.7)],
+        'DROP': [(2017, 5.0), (2021, -1.0)],
+    }))
+    rows = table.set_index(['indicator_code', 'year'])
+    assert np.isnan(rows.loc[('ONE', 2024), 'change_pp'])
+    # Growth from zero has a change but no CAGR
+    assert rows.loc[('ZERO', 2021), 'change_pp'] == pytest.approx(4.7)
+    assert np.isnan(rows.loc[('ZERO', 2021), 'cagr'])
+    assert np.isnan(rows.loc[('DROP', 2021), 'cagr'])
+    assert rows.loc[('DROP', 2021), 'annualized_pp'] == pytest.approx(-1.5)
+
+    summary = growth_summary(table).set_index('indicator_code')
+    assert np.isnan(summary.loc['ONE', 'cagr']) and np.isnan(summary.loc['ONE', 'avg_pp_per_year'])
+    assert np.isnan(summary.loc['ZERO', 'cagr'])
+
+
+def test_targets_and_acceleration():
+    data = pd.concat([
+        records({'ACC': [(2017, 35.0), (2021, 46.0), (2024, 49.0)]}),
+        records({'TARGET_ACC': [(2025, 60.0), (2030, 70.0)]}, record_type='target'),
+    ], ignore_index=True)
+    targets = targets_from_records(data)
+    assert targets.loc['ACC', 'target'] == 70.0 and targets.loc['ACC', 'target_year'] == 2030
+
+    table = growth_table(data)
+    assert table['year'].tolist() == [2017, 2021, 2024]
+    latest = table.iloc[-1]
+    assert latest['gap_to_target'] == pytest.approx(21.0)
+    assert latest['required_pp_per_year'] == pytest.approx(21.0 / 6)
+    assert latest['acceleration'] == pytest.approx(1.0 - 11.0 / 4)
+
+
+def test_matches_the_per_row_loop_it_replaced():
+    obs = synthetic.observations(synthetic.dataset(n_series=30, n_years=6, n_events=3))
+    obs = obs.assign(obs_date=pd.to_datetime(obs['observation_date']))
+    # The loop the EDA scripts ran, as kept in the eda_growth benchmark
+    rows = []
+    for code, series in obs.sort_values('obs_date').groupby('indicator_code', observed=True):
+        for i in range(1, len(series)):
+            prev_year = series.iloc[i - 1]['obs_date'].year
+            curr_year = series.iloc[i]['obs_date'].year
+            growth_pp = series.iloc[i]['value_numeric'] - series.iloc[i - 1]['value_numeric']
+            years = curr_year - prev_year
+            rows.append((code, curr_year, growth_pp, growth_pp / years if years > 0 else growth_pp))
+    expected = pd.DataFrame(rows, columns=['indicator_code', 'year', 'change_pp', 'annualized_pp'])
+
+    table = growth_table(obs).dropna(subset=['change_pp']).reset_index(drop=True)
+    table['indicator_code'] = table['indicator_code'].astype(str)
+    expected['indicator_code'] = expected['indicator_code'].astype(str)
+    pd.testing.assert_frame_equal(table[expected.columns], expected, check_dtype=False)
@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('pyarrow')
+
+from streamlit.testing.v1 import AppTest
+
+from src.artifacts import build_forecast_artifacts
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboard', 'app.py')
+
+RECORDS = pd.DataFrame({
+    'record_type': 'observation',
+    'pillar': 'access',
+    'indicator': ['Account Ownership'] * 3 + ['Digital Payments'] * 3,
+    'indicator_code': ['ACC_OWNERSHIP'] * 3 + ['USG_DIGITAL_PAYMENT'] * 3,
+    'value_numeric': [22.0, 35.0, 46.0, 5.0, 10.0, 20.0],
+    'observation_date': ['2014-12-31', '2017-12-31', '2021-12-31'] * 2,
+    'collection_date': '2025-01-15',
+})
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    build_forecast_artifacts(RECORDS, out_dir=str(tmp_path / 'artifacts'))
+    data_path = str(tmp_path / 'unified.csv')
+    RECORDS.to_csv(data_path, index=False)
+    # The app reads these when it runs, so it serves the test artifact
+    monkeypatch.setattr('src.artifacts.DEFAULT_ARTIFACT_DIR', str(tmp_path / 'artifacts'))
+    monkeypatch.setattr('src.data_store.DEFAULT_DATA_PATH', data_path)
+    monkeypatch.setattr('src.data_cache.DEFAULT_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('FI_QUERY_SERVICE', raising=False)
+    import streamlit as st
+    st.cache_resource.clear()
+    yield AppTest.from_file(APP, default_timeout=60).run()
+    st.cache_resource.clear()
+
+
+def test_forecasts_page_with_no_indicators_selected(app):
+    app.radio[0].set_value('Forecasts').run()
+    assert not app.exception
+    assert len(app.dataframe) == 1
+
+    app.multiselect[0].set_value([]).run()
+    assert not app.exception
+    assert app.header[0].value == 'Forecasts 2025-2027'
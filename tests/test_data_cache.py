@@ -0,0 +1,106 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import src.data_cache as data_cache
+from src.data_cache import cache_path, clear_cache, load_csv_cached
+
+FRAME = pd.DataFrame({
+    'indicator_code': ['ACC_OWNERSHIP', 'ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT'],
+    'value_numeric': [35.0, 46.0, 10.0],
+    'observation_date': ['2017-12-31', '2021-12-31', '2021-12-31'],
+})
+OPTIONS = {'dtype': {'indicator_code': 'category', 'value_numeric': 'float32'},
+           'parse_dates': ['observation_date']}
+
+
+@pytest.fixture
+def csv(tmp_path):
+    path = str(tmp_path / 'unified.csv')
+    FRAME.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """CSV parses done while building caches"""
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args[0])
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(data_cache.pd, 'read_csv', counting_read_csv)
+    return calls
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_cache_hits_return_the_same_frame_and_dtypes(csv, tmp_path, reads, fmt):
+    cache_dir = str(tmp_path / 'cache')
+    first = load_csv_cached(csv, cache_dir, fmt=fmt, **OPTIONS)
+    second = load_csv_cached(csv, cache_dir, fmt=fmt, **OPTIONS)
+    assert len(reads) == 1
+    pd.testing.assert_frame_equal(second, first)
+    pd.testing.assert_frame_equal(second, pd.read_csv(csv, **OPTIONS))
+    assert isinstance(second['indicator_code'].dtype, pd.CategoricalDtype)
+    assert second['value_numeric'].dtype == 'float32'
+
+
+def test_read_options_get_their_own_cache(csv, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    assert cache_path(csv, cache_dir, **OPTIONS) != cache_path(csv, cache_dir)
+
+
+def test_size_change_rebuilds_and_removes_the_old_cache(csv, tmp_path, reads):
+    cache_dir = str(tmp_path / 'cache')
+    old = cache_path(csv, cache_dir)
+    pd.concat([FRAME, FRAME.tail(1)]).to_csv(csv, index=False)
+    new = cache_path(csv, cache_dir)
+    assert new != old and not os.path.exists(old)
+    assert len(load_csv_cached(csv, cache_dir)) == 4
+    assert len(reads) == 2
+
+
+def test_mtime_change_rehashes_the_file(csv, tmp_path, reads, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    old = cache_path(csv, cache_dir)
+    hashes = []
+    file_hash = data_cache.file_hash
+
+    def counting_file_hash(path):
+        hashes.append(path)
+        return file_hash(path)
+
+    monkeypatch.setattr(data_cache, 'file_hash', counting_file_hash)
+
+    # Same contents, new mtime: re-hashed but not rebuilt
+    stat = os.stat(csv)
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache_path(csv, cache_dir) == old
+    assert len(hashes) == 1 and len(reads) == 1
+    # Unchanged since: neither
+    assert cache_path(csv, cache_dir) == old
+    assert len(hashes) == 1
+
+    # Same size, different contents
+    FRAME.assign(value_numeric=[35.0, 47.0, 10.0]).to_csv(csv, index=False)
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert os.stat(csv).st_size == stat.st_size
+    assert load_csv_cached(csv, cache_dir)['value_numeric'].tolist() == [35.0, 47.0, 10.0]
+    assert len(reads) == 2
+
+
+def test_deleted_cache_files_are_rebuilt(csv, tmp_path, reads):
+    cache_dir = str(tmp_path / 'cache')
+    os.remove(cache_path(csv, cache_dir))
+    pd.testing.assert_frame_equal(load_csv_cached(csv, cache_dir), FRAME)
+    assert len(reads) == 2
+
+    clear_cache(cache_dir)
+    assert os.listdir(cache_dir) == []
+    pd.testing.assert_frame_equal(load_csv_cached(csv, cache_dir), FRAME)
+    assert len(reads) == 3
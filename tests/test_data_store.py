@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_store import FinancialInclusionStore
+from src.forecasting import FinancialInclusionForecaster
+
+RECORDS = pd.DataFrame({
+    'record_type': ['observation', 'observation', 'event', 'observation', 'target', 'observation',
+                    'observation', 'event'],
+    'pillar': ['access', 'access', None, 'usage', 'access', 'access', 'infrastructure', None],
+    'indicator': ['Account Ownership', 'Account Ownership', 'M-Pesa Entry', 'Digital Payments',
+                  'NFIS-II Target', 'Account Ownership', '4G Coverage', 'Telebirr Launch'],
+    'indicator_code': ['ACC_OWNERSHIP', 'ACC_OWNERSHIP', 'EVENT_MPESA', 'USG_DIGITAL_PAYMENT',
+                       'ACC_OWNERSHIP', 'ACC_OWNERSHIP', 'INF_4G_COVERAGE', 'EVENT_TELEBIRR'],
+    'value_numeric': [46.0, 14.0, np.nan, 9.45, 60.0, 35.0, 45.0, np.nan],
+    'observation_date': ['2021-12-31', '2011-12-31', '2023-08-01', '2024-12-31', '2027-12-31',
+                         '2017-12-31', '2024-12-31', '2021-05-01'],
+})
+
+
+@pytest.fixture
+def store():
+    return FinancialInclusionStore(RECORDS)
+
+
+def test_observations_for_one_indicator_are_sorted_by_date(store):
+    obs = store.observations('ACC_OWNERSHIP')
+    assert obs['observation_date'].dt.year.tolist() == [2011, 2017, 2021]
+    assert obs['value_numeric'].tolist() == [14.0, 35.0, 46.0]
+
+
+def test_observations_filter_by_date_range_and_pillar(store):
+    obs = store.observations('ACC_OWNERSHIP', start='2015-01-01', end='2021-12-31')
+    assert obs['value_numeric'].tolist() == [35.0, 46.0]
+    assert store.observations(pillar='usage')['indicator_code'].tolist() == ['USG_DIGITAL_PAYMENT']
+    assert len(store.observations()) == 5
+    assert store.observations('UNKNOWN').empty
+
+
+def test_events_targets_series_and_lookups(store):
+    assert store.events()['indicator'].tolist() == ['Telebirr Launch', 'M-Pesa Entry']
+    assert store.targets('ACC_OWNERSHIP')['value_numeric'].tolist() == [60.0]
+    series = store.series('ACC_OWNERSHIP')
+    assert series.index.year.tolist() == [2011, 2017, 2021]
+    assert store.value('ACC_OWNERSHIP', '2017-12-31') == 35.0
+    assert store.latest('ACC_OWNERSHIP') == 46.0
+    with pytest.raises(KeyError):
+        store.value('ACC_OWNERSHIP', '2018-12-31')
+    with pytest.raises(KeyError):
+        store.latest('EVENT_MPESA')
+
+
+def test_fit_store_matches_fit_batch_on_the_raw_frame(store):
+    from_store = FinancialInclusionForecaster()
+    from_store.fit_store(store)
+    from_frame = FinancialInclusionForecaster()
+    from_frame.fit_batch(RECORDS[RECORDS['record_type'] == 'observation'])
+    expected = from_frame.forecast_batch([2025, 2026])
+    actual = from_store.forecast_batch([2025, 2026]).reindex(list(expected.index))
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-6)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from dashboard.downsample import (MAX_POINTS_PER_CHART, WEBGL_THRESHOLD, downsample_series,
+                                  line_figure, lttb)
+
+
+@pytest.fixture(scope='module')
+def walk():
+    n = 50_000
+    return pd.DataFrame({
+        'date': pd.date_range('2011-01-01', periods=n, freq='h'),
+        'Mobile Money': np.cumsum(np.random.default_rng(0).normal(size=n)),
+        'Account Ownership': np.cumsum(np.random.default_rng(1).normal(size=n)),
+    })
+
+
+def test_lttb_keeps_endpoints_and_extremes(walk):
+    y = walk['Mobile Money'].to_numpy().copy()
+    y[20_000] = 1e3
+    idx = lttb(walk['date'], y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 20_000 in idx
+
+
+def test_short_series_pass_through_unchanged():
+    x = np.array([2011, 2014, 2017, 2021, 2024])
+    y = np.array([14.0, 22.0, 35.0, 46.0, 49.0])
+    np.testing.assert_array_equal(lttb(x, y, 10), np.arange(5))
+    xs, ys, raw = downsample_series(x, y, 10)
+    np.testing.assert_array_equal(xs, x)
+    np.testing.assert_array_equal(ys, y)
+    assert raw == 5
+
+
+def test_charts_stay_within_the_point_budget(walk):
+    columns = ['Mobile Money', 'Account Ownership']
+    fig = line_figure(walk, 'date', columns)
+    assert sum(len(trace.x) for trace in fig.data) <= MAX_POINTS_PER_CHART
+    for trace, col in zip(fig.data, columns):
+        assert trace.x[0] == walk['date'].iloc[0] and trace.x[-1] == walk['date'].iloc[-1]
+        assert trace.y[0] == walk[col].iloc[0] and trace.y[-1] == walk[col].iloc[-1]
+
+
+def test_zoom_crops_to_the_window_with_one_point_either_side(walk):
+    window = (walk['date'].iloc[1000], walk['date'].iloc[1999])
+    xs, _, raw = downsample_series(walk['date'], walk['Mobile Money'], 100, x_range=window)
+    assert raw == 1002
+    assert xs[0] == walk['date'].iloc[999].to_datetime64()
+    assert xs[-1] == walk['date'].iloc[2000].to_datetime64()
+
+
+def test_webgl_only_above_the_threshold(walk):
+    small = walk.head(WEBGL_THRESHOLD // 2)
+    assert isinstance(line_figure(small, 'date', ['Mobile Money']).data[0], go.Scatter)
+    assert isinstance(line_figure(small, 'date', ['Mobile Money', 'Account Ownership']).data[0],
+                      go.Scatter)
+    large = walk.head(WEBGL_THRESHOLD + 1)
+    assert isinstance(line_figure(large, 'date', ['Mobile Money']).data[0], go.Scattergl)
@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.enrichment import EnrichmentPipeline, validate
+
+
+def batch(codes, dates, record_type='observation', source='GSMA'):
+    return pd.DataFrame({
+        'record_type': record_type,
+        'pillar': 'infrastructure',
+        'indicator': [f'Indicator {code}' for code in codes],
+        'indicator_code': codes,
+        'value_numeric': 1.0,
+        'observation_date': dates,
+        'source_name': source,
+        'confidence': 'high',
+    })
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return EnrichmentPipeline(str(tmp_path / 'enriched'))
+
+
+def test_append_skips_records_already_stored_or_repeated_in_the_batch(pipeline):
+    first = pipeline.append(batch(['A', 'B'], ['2024-12-01', '2024-12-01']))
+    second = pipeline.append(batch(['B', 'C', 'C'], ['2024-12-01', '2024-12-01', '2024-12-01']))
+    assert (first['appended'], first['duplicates']) == (2, 0)
+    assert (second['appended'], second['duplicates']) == (1, 2)
+    assert pipeline.partitions() == [0, 1]
+    assert sorted(pipeline.read()['indicator_code']) == ['A', 'B', 'C']
+
+
+def test_same_indicator_and_date_from_another_source_is_new(pipeline):
+    pipeline.append(batch(['A'], ['2024-12-01']))
+    assert pipeline.append(batch(['A'], ['2024-12-01'], source='NBE'))['appended'] == 1
+
+
+def test_invalid_records_are_reported_by_reason(pipeline):
+    records = pd.concat([batch(['A'], ['2024-12-01']),
+                         batch(['B'], ['2024-12-01'], record_type='impact_link'),
+                         batch(['C'], ['not a date'])], ignore_index=True)
+    result = pipeline.append(records)
+    assert result['appended'] == 1
+    assert result['rejected'] == 2
+    assert result['rejections'] == {'unknown record_type': 1, 'unparseable observation_date': 1}
+    _, rejected = validate(records)
+    assert rejected['indicator_code'].tolist() == ['B', 'C']
+
+
+def test_strict_append_raises_and_stores_nothing(pipeline):
+    records = pd.concat([batch(['A'], ['2024-12-01']),
+                         batch(['B'], ['2024-12-01'], record_type='impact_link')])
+    with pytest.raises(ValueError, match='1 with unknown record_type'):
+        pipeline.append(records, strict=True)
+    assert pipeline.partitions() == []
+
+
+def test_missing_required_columns_raise(pipeline):
+    with pytest.raises(ValueError, match='record_type'):
+        pipeline.append(batch(['A'], ['2024-12-01']).drop(columns='record_type'))
+
+
+def test_export_keeps_partitions_and_compact_merges_them(pipeline, tmp_path):
+    pipeline.append(batch(['A'], ['2024-12-01']))
+    pipeline.append(batch(['B'], ['2024-12-01']))
+    output = str(tmp_path / 'flat.csv')
+
+    exported = pipeline.export(output)
+    assert pipeline.partitions() == [0, 1]
+    assert pd.read_csv(output)['indicator_code'].tolist() == ['A', 'B']
+
+    compacted = pipeline.compact()
+    assert pipeline.partitions() == [0]
+    pd.testing.assert_frame_equal(compacted, exported)
+    # The merged partition still deduplicates
+    assert pipeline.append(batch(['A', 'B'], ['2024-12-01', '2024-12-01']))['appended'] == 0
+
+
+def test_appends_check_and_extend_one_merged_key_index(pipeline, monkeypatch):
+    for code in 'ABC':
+        pipeline.append(batch([code], ['2024-12-01']))
+    assert len(pipeline) == 3
+    assert len(pipeline.key_index()) == 3
+
+    # Dedup reads the merged index, not every partition's key file
+    loads = []
+    load = np.load
+
+    def recording_load(path, *args, **kwargs):
+        loads.append(os.path.basename(path))
+        return load(path, *args, **kwargs)
+
+    monkeypatch.setattr(np, 'load', recording_load)
+    result = pipeline.append(batch(['A', 'D'], ['2024-12-01', '2024-12-01']))
+    assert (result['appended'], result['duplicates']) == (1, 1)
+    assert loads == ['index-00002.npy']
+    assert [name for name in os.listdir(pipeline.root) if name.startswith('index-')] == [
+        'index-00003.npy']
+    assert len(pipeline) == 4
+
+
+def test_missing_key_index_is_rebuilt_from_the_partitions(pipeline):
+    pipeline.append(batch(['A'], ['2024-12-01']))
+    pipeline.append(batch(['B'], ['2024-12-01']))
+    os.remove(os.path.join(pipeline.root, 'index-00001.npy'))
+    assert pipeline.append(batch(['A', 'B', 'C'], ['2024-12-01'] * 3))['appended'] == 1
+    assert len(pipeline) == 3
+
+
+def test_compact_writes_the_flat_csv_atomically(pipeline, tmp_path):
+    pipeline.append(batch(['A'], ['2024-12-01']))
+    pipeline.append(batch(['B'], ['2024-12-01']))
+    output = str(tmp_path / 'flat.csv')
+    pipeline.compact(output)
+    assert pd.read_csv(output)['indicator_code'].tolist() == ['A', 'B']
+    assert not os.path.exists(output + '.tmp')
+    assert len(pipeline) == 2
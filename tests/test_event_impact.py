@@ -0,0 +1,55 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from src.event_impact import EventImpactModel
+from src.forecasting import FinancialInclusionForecaster
+
+INDICATORS = ['ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT', 'ACC_MM_ACCOUNT']
+
+
+@pytest.fixture
+def model():
+    model = EventImpactModel()
+    model.build_impact_matrix(['telebirr_launch', 'mpesa_entry'], INDICATORS)
+    return model
+
+
+def test_impact_paths_ramps_in_after_event_year(model):
+    paths = model.impact_paths(range(2019, 2026), ['telebirr_launch'])
+    mm = paths[:, INDICATORS.index('ACC_MM_ACCOUNT')]
+    # Telebirr (2021) ramps its +5pp mobile money impact in over three years
+    np.testing.assert_allclose(mm, [0, 0, 0.05 / 3, 0.10 / 3, 0.05, 0.05, 0.05])
+
+
+def test_impact_paths_carries_earlier_events_into_window(model):
+    paths = model.impact_paths(range(2025, 2028), ['telebirr_launch', 'mpesa_entry'])
+    np.testing.assert_allclose(paths[:, INDICATORS.index('ACC_MM_ACCOUNT')], 0.07)
+    np.testing.assert_allclose(paths[:, INDICATORS.index('ACC_OWNERSHIP')], 0.01)
+
+
+def test_impact_paths_ignores_events_after_window(model):
+    paths = model.impact_paths(range(2015, 2020), ['telebirr_launch', 'mpesa_entry'])
+    assert paths.shape == (5, len(INDICATORS))
+    assert not paths.any()
+
+
+def test_impact_paths_future_event_only_counts_once_it_happens(model):
+    paths = model.impact_paths(range(2020, 2023), ['telebirr_launch'])
+    assert paths[0].sum() == 0
+    assert paths[1:, INDICATORS.index('ACC_MM_ACCOUNT')].tolist() == pytest.approx([0.05 / 3, 0.10 / 3])
+
+
+def test_create_scenarios_with_future_dated_events(model):
+    baseline = pd.DataFrame(40.0, index=range(2015, 2020), columns=INDICATORS)
+    scenarios = FinancialInclusionForecaster().create_scenarios(
+        baseline, model, ['telebirr_launch', 'mpesa_entry'])
+    pd.testing.assert_frame_equal(scenarios['optimistic'], baseline)
+
+
+def test_apply_impacts_matches_dense_matrix(model):
+    baseline = pd.DataFrame(1.0, index=[2025], columns=INDICATORS + ['OTHER'])
+    adjusted = model.apply_impacts(baseline, ['telebirr_launch', 'telebirr_launch'], None)
+    expected = 1.0 + 2 * model.impact_matrix.loc['telebirr_launch']
+    np.testing.assert_allclose(adjusted[INDICATORS].iloc[0], expected[INDICATORS])
+    assert adjusted['OTHER'].iloc[0] == 1.0
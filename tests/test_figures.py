@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+
+from src.figures import _file_name, indicator_jobs, render_figures
+
+
+def observations(codes):
+    return pd.DataFrame({
+        'record_type': 'observation',
+        'indicator_code': [code for code in codes for _ in range(3)],
+        'region': 'Addis Ababa',
+        'observation_date': ['2017-12-31', '2021-12-31', '2024-12-31'] * len(codes),
+        'value_numeric': [10.0, 20.0, 30.0] * len(codes),
+    })
+
+
+def test_file_names_keep_sanitized_keys_apart():
+    assert _file_name('A/B') != _file_name('A_B')
+    assert _file_name(('A', 'B')) != _file_name('A__B')
+    assert _file_name(('ACC_OWNERSHIP', 'Addis Ababa')).startswith('ACC_OWNERSHIP__Addis_Ababa-')
+    assert _file_name('A/B') == _file_name('A/B')
+
+
+def test_colliding_indicator_codes_render_to_separate_files(tmp_path):
+    jobs = indicator_jobs(observations(['A/B', 'A_B']), out_dir=str(tmp_path),
+                          group_cols=('indicator_code', 'region'), dpi=20)
+    assert len({job.path for job in jobs}) == 2
+    result = render_figures(jobs, workers=1)
+    assert sorted(result['rendered']) == sorted(job.path for job in jobs)
+    assert all(os.path.exists(job.path) for job in jobs)
+    assert render_figures(jobs, workers=1)['skipped'] == [job.path for job in jobs]
@@ -0,0 +1,181 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from src.__main__ import main
+from src.forecasting import CAPACITY_MARGIN, FinancialInclusionForecaster, diffusion_capacity
+
+YEARS = [2025, 2026, 2027]
+
+
+@pytest.fixture(scope='module')
+def data():
+    return synthetic.observations(synthetic.dataset(n_series=30, n_years=8, n_events=5))
+
+
+def split_last_year(data):
+    last = data['observation_date'] == data['observation_date'].max()
+    return data[~last], data[last]
+
+
+def linear_series(n_series, years, sigma, seed):
+    rng = np.random.default_rng(seed)
+    intercept = rng.uniform(10, 50, n_series)
+    slope = rng.uniform(0, 3, n_series)
+    values = intercept[:, None] + slope[:, None] * (years - years[0]) + rng.normal(
+        0, sigma, (n_series, len(years)))
+    return pd.DataFrame({
+        'indicator_code': np.repeat([f'S{i:05d}' for i in range(n_series)], len(years)),
+        'observation_date': np.tile([f'{year}-12-31' for year in years], n_series),
+        'value_numeric': values.ravel(),
+    })
+
+
+def test_batch_fit_matches_per_series_least_squares(data):
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data)
+    forecasts = forecaster.forecast_batch(YEARS)
+    years = pd.to_datetime(data['observation_date']).dt.year
+    for code, rows in data.groupby('indicator_code'):
+        slope, intercept = np.polyfit(years[rows.index], rows['value_numeric'], 1)
+        np.testing.assert_allclose(forecasts.loc[code], intercept + slope * np.array(YEARS),
+                                   rtol=1e-8)
+
+
+def test_single_year_series_get_a_flat_trend():
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(pd.DataFrame({'indicator_code': ['A', 'B', 'B'],
+                                       'observation_date': ['2024-12-31', '2020-12-31', '2024-12-31'],
+                                       'value_numeric': [45.0, 10.0, 20.0]}))
+    forecasts = forecaster.forecast_batch([2026])
+    assert forecasts.loc['A', 2026] == pytest.approx(45.0)
+    assert forecasts.loc['B', 2026] == pytest.approx(25.0)
+    assert forecaster.forecast_intervals([2026])['lower_bound'].isna().all()
+
+
+def test_update_batch_matches_a_full_refit(data):
+    history, wave = split_last_year(data)
+    updated = FinancialInclusionForecaster()
+    updated.fit_batch(history)
+    updated.update_batch(wave)
+    refit = FinancialInclusionForecaster()
+    refit.fit_batch(pd.concat([history, wave]))
+
+    np.testing.assert_allclose(updated.coefficients, refit.coefficients)
+    np.testing.assert_array_equal(updated.series_digests, refit.series_digests)
+    pd.testing.assert_frame_equal(
+        updated.forecast_intervals(YEARS, method='bootstrap', n_boot=50, n_jobs=1),
+        refit.forecast_intervals(YEARS, method='bootstrap', n_boot=50, n_jobs=1))
+
+
+def test_update_batch_appends_without_copying_the_history(data):
+    history, wave = split_last_year(data)
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(history)
+    first_chunk = forecaster._batch_obs[0]
+    forecaster.update_batch(wave)
+    forecaster.update_batch(wave.assign(observation_date='2030-12-31'))
+    assert len(forecaster._batch_obs) == 3
+    assert forecaster._batch_obs[0] is first_chunk
+
+
+def test_fit_without_observations_serves_analytic_intervals_only(data):
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data, keep_observations=False)
+    forecaster.update_batch(split_last_year(data)[1].assign(observation_date='2030-12-31'))
+    assert forecaster.forecast_intervals(YEARS)['upper_bound'].notna().all()
+    with pytest.raises(ValueError, match='sync_batch'):
+        forecaster.forecast_intervals(YEARS, method='bootstrap', n_boot=10, n_jobs=1)
+
+
+def test_saved_state_holds_sums_not_observations(data, tmp_path):
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data)
+    path = str(tmp_path / 'state.npz')
+    forecaster.save_state(path)
+    with np.load(path) as state:
+        assert not any(name.startswith('obs_') for name in state.files)
+
+    restored = FinancialInclusionForecaster().load_state(path)
+    pd.testing.assert_frame_equal(restored.forecast_intervals(YEARS), forecaster.forecast_intervals(YEARS))
+    with pytest.raises(ValueError, match='sync_batch'):
+        restored.forecast_intervals(YEARS, method='bootstrap', n_boot=10, n_jobs=1)
+    assert len(restored.sync_batch(data)) == 0
+    assert restored.forecast_intervals(YEARS, method='bootstrap', n_boot=10, n_jobs=1)[
+        'lower_bound'].notna().all()
+
+
+def test_sync_batch_only_refits_changed_series(data):
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data)
+    edited = data.copy()
+    edited.loc[edited.index[0], 'value_numeric'] += 5
+    changed = forecaster.sync_batch(edited)
+    assert list(changed) == [edited['indicator_code'].iloc[0]]
+    refit = FinancialInclusionForecaster()
+    refit.fit_batch(edited)
+    np.testing.assert_allclose(forecaster.coefficients, refit.coefficients)
+
+
+@pytest.mark.parametrize('method', ['analytic', 'bootstrap'])
+def test_intervals_cover_held_out_values(method):
+    years = np.arange(2010, 2030)
+    data = linear_series(400, years, sigma=2.0, seed=1)
+    held_out = data['observation_date'] >= '2025'
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data[~held_out])
+    intervals = forecaster.forecast_intervals(list(years[years >= 2025]), level=0.9, method=method,
+                                              n_boot=400, n_jobs=1)
+    actual = data[held_out]['value_numeric'].to_numpy()
+    covered = (intervals['lower_bound'].to_numpy() <= actual) & (actual <= intervals['upper_bound'].to_numpy())
+    # Bootstrap intervals from 15 residuals run slightly narrow
+    assert 0.85 <= covered.mean() <= 0.95
+
+
+def infrastructure_records():
+    return pd.DataFrame({
+        'record_type': 'observation',
+        'pillar': ['access'] * 3 + ['infrastructure'] * 6,
+        'indicator': ['Account Ownership'] * 3 + ['Agent Density'] * 3 + ['4G Coverage (%)'] * 3,
+        'indicator_code': ['ACC_OWNERSHIP'] * 3 + ['INF_AGENT_DENSITY'] * 3 + ['INF_4G_COVERAGE'] * 3,
+        'value_numeric': [22.0, 35.0, 46.0, 40.0, 80.0, 120.0, 20.0, 30.0, 45.0],
+        'observation_date': ['2018-12-31', '2021-12-31', '2024-12-31'] * 3,
+        'collection_date': '2025-01-15',
+    })
+
+
+def test_diffusion_capacity_caps_percentages_only():
+    capacity = diffusion_capacity(infrastructure_records())
+    assert capacity.to_dict() == {'ACC_OWNERSHIP': 100.0, 'INF_4G_COVERAGE': 100.0,
+                                  'INF_AGENT_DENSITY': 120.0 * CAPACITY_MARGIN}
+
+
+def test_diffusion_forecasts_are_not_capped_at_100_for_densities():
+    forecaster = FinancialInclusionForecaster()
+    params = forecaster.fit_diffusion(infrastructure_records())
+    assert params.loc['INF_AGENT_DENSITY', 'saturation'] > 120.0
+    assert params.loc['ACC_OWNERSHIP', 'saturation'] <= 100.0
+    assert forecaster.forecast_diffusion([2026]).loc['INF_AGENT_DENSITY', 2026] > 120.0
+
+    capped = FinancialInclusionForecaster().fit_diffusion(infrastructure_records(), capacity=100.0)
+    assert capped.loc['INF_AGENT_DENSITY', 'saturation'] <= 100.0
+    with pytest.raises(ValueError, match='INF_4G_COVERAGE'):
+        forecaster.fit_diffusion(infrastructure_records(),
+                                 capacity=pd.Series({'ACC_OWNERSHIP': 100.0, 'INF_AGENT_DENSITY': 500.0}))
+
+
+def test_cli_logistic_forecasts_use_per_indicator_capacity(tmp_path, capsys):
+    data_path = str(tmp_path / 'unified.csv')
+    infrastructure_records().to_csv(data_path, index=False)
+    registry = str(tmp_path / 'registry')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path)
+        assert main(['fit', '--data', data_path, '--registry', registry, '--diffusion', 'logistic']) == 0
+        capsys.readouterr()
+        assert main(['forecast', '--registry', registry, '--family', 'logistic', '--csv',
+                     '--indicator', 'INF_AGENT_DENSITY', '--years', '2027']) == 0
+    forecast = pd.read_csv(io.StringIO(capsys.readouterr().out), index_col=0)
+    assert forecast.loc['INF_AGENT_DENSITY', '2027'] > 120.0
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+
+import pytest
+import requests
+
+import src.ingest as ingest_module
+from src.ingest import INDICATOR_SPECS, IngestClient, ingest, refresh, spec_url
+from tests.ingest_fixtures import FixtureServer, fixture_payload, synthetic_specs
+
+SPECS = synthetic_specs(6)
+
+
+@pytest.fixture
+def server():
+    server = FixtureServer(SPECS).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = IngestClient(concurrency=4, retries=3, backoff=0.001, timeout=5,
+                          cache_dir=str(tmp_path / 'http'))
+    yield client
+    client.close()
+
+
+def url_of(server, spec):
+    return spec_url(spec, server.base_urls)
+
+
+def path_of(server, spec):
+    return url_of(server, spec)[len(server.url):]
+
+
+def test_refresh_maps_every_source_onto_the_unified_schema(server, tmp_path):
+    records, errors, _ = refresh(SPECS, base_urls=server.base_urls, cache_dir=str(tmp_path))
+    assert errors == []
+    assert sorted(records['indicator_code'].unique()) == [spec['indicator_code'] for spec in SPECS]
+    # Every source's payload has one value per year from 2011 to 2024
+    assert (records.groupby('indicator_code').size() == 14).all()
+    assert records['observation_date'].str.endswith('-12-31').all()
+
+
+def test_transient_failures_are_retried(server, client):
+    server.fail_first = 2
+    result = asyncio.run(client.fetch(url_of(server, SPECS[0])))
+    assert result['body'] == fixture_payload(SPECS[0])
+    assert client.stats['retries'] == 2
+    assert server.hits[path_of(server, SPECS[0])] == 3
+
+
+def test_gives_up_after_the_last_retry(server, client):
+    server.fail_first = 10
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(client.fetch(url_of(server, SPECS[0])))
+    assert server.hits[path_of(server, SPECS[0])] == client.retries + 1
+
+
+def test_backoff_doubles_with_each_attempt(server, client, monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(ingest_module.random, 'random', lambda: 0.0)
+    monkeypatch.setattr(ingest_module.asyncio, 'sleep', sleep)
+    server.fail_first = 3
+    asyncio.run(client.fetch(url_of(server, SPECS[0])))
+    assert delays == pytest.approx([0.001, 0.002, 0.004])
+
+
+def test_connection_errors_are_retried_then_raised(tmp_path):
+    client = IngestClient(retries=2, backoff=0.001, timeout=1, cache_dir=str(tmp_path))
+    try:
+        with pytest.raises(requests.ConnectionError):
+            asyncio.run(client.fetch('http://127.0.0.1:9/nothing'))
+        assert client.stats['requests'] == 3
+    finally:
+        client.close()
+
+
+def test_unchanged_payloads_come_back_as_304_from_the_cache(server, client):
+    url = url_of(server, SPECS[1])
+    first = asyncio.run(client.fetch(url))
+    second = asyncio.run(client.fetch(url))
+    assert first['changed'] and not second['changed']
+    assert second['body'] == first['body']
+    assert client.stats['not_modified'] == 1
+
+    server.payloads[path_of(server, SPECS[1])] = fixture_payload(SPECS[1], years=range(2011, 2026))
+    third = asyncio.run(client.fetch(url))
+    assert third['changed']
+    assert client.stats['not_modified'] == 1
+
+
+def test_parse_errors_are_reported_per_spec(server, client):
+    worldbank = next(spec for spec in SPECS if spec['source'] == 'worldbank')
+    sdmx = next(spec for spec in SPECS if spec['source'] == 'imf')
+    server.payloads[path_of(server, worldbank)] = b'<html>maintenance</html>'
+    server.payloads[path_of(server, sdmx)] = json.dumps({'CompactData': {}}).encode()
+
+    records, errors = asyncio.run(ingest(SPECS, client, server.base_urls))
+    failed = dict(errors)
+    assert set(failed) == {worldbank['indicator_code'], sdmx['indicator_code']}
+    assert 'JSONDecodeError' in failed[worldbank['indicator_code']]
+    assert 'KeyError' in failed[sdmx['indicator_code']]
+    assert len(records['indicator_code'].unique()) == len(SPECS) - 2
+
+
+def test_missing_values_and_unconfigured_sources_are_skipped(server, client):
+    spec = INDICATOR_SPECS[0]
+    rows = [{'date': '2021', 'value': 46.0}, {'date': '2022', 'value': None}]
+    server.payloads[path_of(server, spec)] = json.dumps([{'page': 1}, rows]).encode()
+    gsma = next(spec for spec in INDICATOR_SPECS if spec['source'] == 'gsma')
+    base_urls = {'worldbank': server.url, 'imf': server.url}
+
+    records, errors = asyncio.run(ingest([spec, gsma], client, base_urls))
+    assert errors == []
+    assert records['observation_date'].tolist() == ['2021-12-31']
+    assert records['value_numeric'].tolist() == [46.0]
+
+
+def test_backoff_does_not_hold_a_request_slot(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_module.random, 'random', lambda: 0.0)
+    client = IngestClient(concurrency=1, retries=1, backoff=0.5, timeout=5,
+                          cache_dir=str(tmp_path / 'http'))
+    server.fail_first = 1
+    # Only the first URL fails; the second has already used up its failure
+    server.hits[path_of(server, SPECS[1])] = 1
+    finished = {}
+
+    async def fetch(spec):
+        start = time.perf_counter()
+        await client.fetch(url_of(server, spec))
+        finished[spec['indicator_code']] = time.perf_counter() - start
+
+    async def both():
+        await asyncio.gather(fetch(SPECS[0]), fetch(SPECS[1]))
+
+    try:
+        asyncio.run(both())
+    finally:
+        client.close()
+    # The second fetch runs while the first one backs off
+    assert finished[SPECS[1]['indicator_code']] < 0.4
+    assert finished[SPECS[0]['indicator_code']] >= 0.5
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from src import instrumentation
+from src.instrumentation import span
+
+BLOCK = 8 * 1024 * 1024
+
+
+@pytest.fixture
+def recording(tmp_path):
+    instrumentation.reset()
+    instrumentation.enable(memory=('outer', 'inner'), profile_dir=str(tmp_path / 'profiles'))
+    yield tmp_path
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def peaks(path):
+    with open(instrumentation.write_trace(str(path / 'trace.json'))) as f:
+        events = json.load(f)['traceEvents']
+    return {event['name']: event['args']['peak_kb'] for event in events if event['ph'] == 'X'}
+
+
+def test_nested_memory_spans_keep_the_outer_peak(recording):
+    with span('outer'):
+        block = bytearray(BLOCK)
+        del block
+        with span('inner'):
+            small = bytearray(1024)
+        del small
+    peak = peaks(recording)
+    assert peak['outer'] >= BLOCK / 1024
+    assert peak['inner'] < BLOCK / 1024
+
+
+def test_inner_peaks_count_towards_the_outer_span(recording):
+    with span('outer'):
+        with span('inner'):
+            block = bytearray(BLOCK)
+            del block
+    peak = peaks(recording)
+    assert peak['inner'] >= BLOCK / 1024
+    assert peak['outer'] >= BLOCK / 1024
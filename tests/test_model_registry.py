@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from src.forecasting import FinancialInclusionForecaster
+from src.model_registry import ModelRegistry
+
+YEARS = [2025, 2026, 2027]
+
+
+@pytest.fixture(scope='module')
+def data():
+    return synthetic.observations(synthetic.dataset(n_series=40, n_years=8, n_events=5))
+
+
+@pytest.fixture(scope='module')
+def fitted(data):
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(data)
+    forecaster.fit_diffusion(data, curve='logistic')
+    return forecaster
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / 'registry'))
+
+
+def test_saved_families_serve_the_same_forecasts(fitted, registry):
+    version = registry.save(fitted, tags=('latest', 'production'))
+    assert registry.resolve('production') == version
+    families = registry.load('production')
+    pd.testing.assert_frame_equal(families['linear'].forecast(YEARS),
+                                  fitted.forecast_batch(YEARS), check_index_type=False)
+    np.testing.assert_allclose(families['logistic'].forecast(YEARS).to_numpy(),
+                               fitted.forecast_diffusion(YEARS, 'logistic').to_numpy())
+
+    analytic = fitted.forecast_intervals(YEARS)
+    widths = families['linear'].intervals(YEARS).stack().to_numpy()
+    np.testing.assert_allclose(widths, analytic['upper_bound'] - analytic['prediction'])
+
+
+def test_load_forecaster_round_trips_the_batch_state(fitted, registry):
+    registry.save(fitted)
+    loaded = registry.load_forecaster()
+    np.testing.assert_array_equal(loaded.coefficients, fitted.coefficients)
+    np.testing.assert_array_equal(loaded.batch_stats, fitted.batch_stats)
+    np.testing.assert_array_equal(loaded.series_digests, fitted.series_digests)
+    pd.testing.assert_frame_equal(loaded.forecast_intervals(YEARS), fitted.forecast_intervals(YEARS),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(loaded.diffusion['logistic']['params'],
+                                  fitted.diffusion['logistic']['params'].drop(columns='converged'),
+                                  check_index_type=False)
+
+
+def test_loaded_forecaster_bootstraps_only_after_sync(fitted, data, registry):
+    registry.save(fitted)
+    loaded = registry.load_forecaster()
+    first_wave = data[data['observation_date'] == data['observation_date'].max()].assign(
+        observation_date='2030-12-31')
+    loaded.update_batch(first_wave)
+    with pytest.raises(ValueError, match='sync_batch'):
+        loaded.forecast_intervals(YEARS, method='bootstrap', n_boot=50, n_jobs=1)
+
+    loaded = registry.load_forecaster()
+    assert len(loaded.sync_batch(data)) == 0
+    bootstrap = loaded.forecast_intervals(YEARS, method='bootstrap', n_boot=50, n_jobs=1)
+    expected = fitted.forecast_intervals(YEARS, method='bootstrap', n_boot=50, n_jobs=1)
+    pd.testing.assert_frame_equal(bootstrap, expected, check_dtype=False)
+
+
+def test_unknown_refs_and_empty_forecasters_raise(registry):
+    with pytest.raises(KeyError):
+        registry.resolve('production')
+    with pytest.raises(ValueError):
+        registry.save(FinancialInclusionForecaster())
+
+
+def test_integer_series_keys_keep_their_dtype(data, registry):
+    nodes = data.assign(node=data['indicator_code'].factorize()[0].astype(np.int64))
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(nodes, group_cols=('node',))
+    registry.save(forecaster)
+    loaded = registry.load_forecaster()
+    assert loaded.series_index.dtype == np.int64
+    pd.testing.assert_index_equal(loaded.series_index, forecaster.series_index)
+
+    wave = nodes[nodes['observation_date'] == nodes['observation_date'].max()].assign(
+        observation_date='2030-12-31')
+    loaded.update_batch(wave)
+    forecaster.update_batch(wave)
+    assert len(loaded.series_index) == len(forecaster.series_index)
+    np.testing.assert_allclose(loaded.coefficients, forecaster.coefficients)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting import CAPACITY_MARGIN
+from src.model_zoo import LinearTrend, ModelSelector, rolling_origin_score
+
+YEARS = np.arange(2004, 2025)
+
+
+def logistic(capacity, rate, midpoint):
+    return capacity / (1.0 + np.exp(-rate * (YEARS - midpoint)))
+
+
+def series_frame(series, pillars):
+    return pd.DataFrame({
+        'record_type': 'observation',
+        'indicator_code': np.repeat(list(series), len(YEARS)),
+        'pillar': np.repeat([pillars[code] for code in series], len(YEARS)),
+        'observation_date': np.tile([f'{year}-12-31' for year in YEARS], len(series)),
+        'value_numeric': np.concatenate(list(series.values())),
+    })
+
+
+@pytest.fixture
+def data():
+    return series_frame({
+        'LINEAR': 5.0 + 1.5 * (YEARS - YEARS[0]) + np.random.default_rng(3).normal(0, 1, len(YEARS)),
+        'ACCESS': logistic(100.0, 0.3, 2015),
+        # Agents per 100k adults: last observed at the midpoint of a curve
+        # saturating at twice the peak, far above 100
+        'DENSITY': logistic(300.0, 0.25, 2024),
+    }, {'LINEAR': 'usage', 'ACCESS': 'access', 'DENSITY': 'infrastructure'})
+
+
+def test_rolling_origin_score_on_a_known_series():
+    years = np.array([2020.0, 2021.0, 2022.0, 2023.0, 2024.0])
+    score, n_folds = rolling_origin_score(LinearTrend, {}, years, np.array([0.0, 1, 2, 10, 4]))
+    # Folds fit 0,1,2 (predicting 3 for 10) and 0,1,2,10 (predicting 11 for 4)
+    assert n_folds == 2
+    assert score == pytest.approx(7.0)
+    score, n_folds = rolling_origin_score(LinearTrend, {}, years[:3], np.zeros(3))
+    assert np.isnan(score) and n_folds == 0
+
+
+def test_selects_the_generating_model(data, tmp_path):
+    selector = ModelSelector(n_jobs=1, cache_path=str(tmp_path / 'zoo.json'))
+    scores = selector.select(data)
+    chosen = scores[scores['selected']].set_index('series')['model']
+    assert chosen.to_dict() == {'ACCESS': 'logistic', 'DENSITY': 'logistic', 'LINEAR': 'linear'}
+    best = scores[scores['selected']].set_index('series')['score']
+    assert best['ACCESS'] < 1e-3 and best['DENSITY'] < 1e-3
+
+    forecast = selector.forecast([2030])
+    assert forecast.loc['DENSITY', 2030] == pytest.approx(logistic(300.0, 0.25, 2024 - 6)[-1], rel=1e-4)
+    assert forecast.loc['DENSITY', 2030] > 100.0
+
+
+def test_capacity_is_derived_per_series(data):
+    scores = ModelSelector(n_jobs=1, cache_path=None).select(data)
+    logistic_rows = scores[scores['model'] == 'logistic'].set_index('series')
+    capacity = logistic_rows['params'].map(lambda params: params['capacity'])
+    peak = data.groupby('indicator_code')['value_numeric'].max()
+    assert capacity['ACCESS'] == 100.0
+    assert capacity['DENSITY'] == pytest.approx(peak['DENSITY'] * CAPACITY_MARGIN)
+    assert logistic_rows.loc['DENSITY', 'score'] is not None
+
+
+def test_cache_hits_and_invalidation(data, tmp_path):
+    cache_path = str(tmp_path / 'zoo.json')
+    first = ModelSelector(n_jobs=1, cache_path=cache_path).select(data)
+    assert not first['cached'].any()
+
+    again = ModelSelector(n_jobs=1, cache_path=cache_path).select(data)
+    assert again['cached'].all()
+    pd.testing.assert_frame_equal(again.drop(columns='cached'), first.drop(columns='cached'))
+
+    # A changed value refits only its series
+    edited = data.copy()
+    edited.loc[edited['indicator_code'] == 'LINEAR', 'value_numeric'] += 1.0
+    scores = ModelSelector(n_jobs=1, cache_path=cache_path).select(edited)
+    assert set(scores.loc[~scores['cached'], 'series']) == {'LINEAR'}
+
+    # So does a change of capacity, for the saturating models only
+    edited.loc[edited['indicator_code'] == 'LINEAR', 'pillar'] = 'infrastructure'
+    scores = ModelSelector(n_jobs=1, cache_path=cache_path).select(edited)
+    refitted = scores.loc[~scores['cached'], ['series', 'model']]
+    assert sorted(map(tuple, refitted.to_numpy())) == [('LINEAR', 'gompertz'), ('LINEAR', 'logistic')]
+
+    # And CV settings are part of the key
+    assert not ModelSelector(n_jobs=1, cache_path=cache_path, min_train=4).select(data)['cached'].any()
@@ -0,0 +1,57 @@
+import pytest
+
+from src.notebook_builder import cell_dependencies, cell_keys, cell_names
+
+
+@pytest.mark.parametrize('source, inputs, outputs', [
+    ("df = df.dropna()", {'df'}, {'df'}),
+    ("x = x + 1", {'x'}, {'x'}),
+    ("x += 1", {'x'}, {'x'}),
+    ("x = 1\nx = x + 1", set(), {'x'}),
+    ("import pandas as pd\ndf = pd.read_csv(path)", {'path'}, {'pd', 'df'}),
+    ("df['share'] = df['value'] / total", {'df', 'total'}, {'df'}),
+    ("df.loc[mask, 'x'] = 0", {'df', 'mask'}, {'df'}),
+    ("codes = [code for code in frame if code in known]", {'frame', 'known'}, {'codes'}),
+    ("def scale(values, factor=unit):\n    return values * factor * rate\n", {'unit', 'rate'}, {'scale'}),
+    ("ratio = lambda row: row / base", {'base'}, {'ratio'}),
+    ("for year in years:\n    total = total + year", {'years', 'total'}, {'year', 'total'}),
+    ("%matplotlib inline\n!pip list\nplt.plot(x)", {'plt', 'x'}, set()),
+])
+def test_cell_names(source, inputs, outputs):
+    assert cell_names(source) == (inputs, outputs)
+
+
+def test_unparseable_cells_have_no_names():
+    assert cell_names("df = (") is None
+
+
+def test_rebinding_cells_depend_on_the_previous_definition():
+    sources = [
+        "import pandas as pd",
+        "df = pd.read_csv('data.csv')",
+        "df = df.dropna()",
+        "x = 1",
+        "x = x + 1",
+        "print(df.shape, x)",
+    ]
+    assert cell_dependencies(sources) == [set(), {0}, {1}, set(), {3}, {2, 4}]
+
+
+def test_unparseable_cells_depend_on_everything():
+    assert cell_dependencies(["a = 1", "b = (", "c = 2", "print(c)"]) == [
+        set(), {0}, {1}, {1, 2}]
+
+
+def test_cell_keys_change_with_the_cell_and_its_dependents():
+    sources = ["df = load()", "df = df.dropna()", "print(df)", "other = 2"]
+    dependencies = cell_dependencies(sources)
+    keys = cell_keys(sources, dependencies, 'inputs')
+    assert len(set(keys)) == len(keys)
+    assert cell_keys(sources, dependencies, 'inputs') == keys
+
+    edited = ["df = load(fresh=True)"] + sources[1:]
+    edited_keys = cell_keys(edited, cell_dependencies(edited), 'inputs')
+    assert [a != b for a, b in zip(keys, edited_keys)] == [True, True, True, False]
+
+    assert all(a != b for a, b in zip(keys, cell_keys(sources, dependencies, 'changed data')))
+    assert cell_keys(sources, dependencies, 'inputs', kernel='other') != keys
@@ -0,0 +1,105 @@
+import asyncio
+import socket
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.artifacts import build_forecast_artifacts
+from src.query_service import QueryClient, QueryService, from_arrow, slice_artifact
+
+RECORDS = pd.DataFrame({
+    'record_type': 'observation',
+    'pillar': 'access',
+    'indicator': ['Account Ownership'] * 3 + ['Digital Payments'] * 3,
+    'indicator_code': ['ACC_OWNERSHIP'] * 3 + ['USG_DIGITAL_PAYMENT'] * 3,
+    'value_numeric': [22.0, 35.0, 46.0, 5.0, 10.0, 20.0],
+    'observation_date': ['2014-12-31', '2017-12-31', '2021-12-31'] * 2,
+    'collection_date': '2025-01-15',
+})
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    root = tmp_path_factory.mktemp('query')
+    data_path = str(root / 'unified.csv')
+    RECORDS.to_csv(data_path, index=False)
+    build_forecast_artifacts(RECORDS, out_dir=str(root / 'artifacts'))
+    with pytest.MonkeyPatch.context() as mp:
+        # The store's parquet cache lives under the working directory
+        mp.chdir(root)
+        yield QueryService(str(root / 'artifacts'), data_path)
+
+
+@pytest.fixture(scope='module')
+def client(service):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(
+        asyncio.start_server(service._serve_connection, '127.0.0.1', port), loop).result()
+    client = QueryClient(f'http://127.0.0.1:{port}')
+    yield client
+    client.close()
+    loop.call_soon_threadsafe(server.close)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def get(service, target):
+    status, content_type, body = service.handle('GET', target)
+    assert status == 200, body
+    return from_arrow(body)
+
+
+def test_absent_indicator_selects_everything_and_blank_selects_nothing(service):
+    assert set(get(service, '/history')['indicator_code']) == {'ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT'}
+    assert get(service, '/history?indicator=').empty
+    assert get(service, '/forecasts?indicator=&scenario=baseline').empty
+    assert get(service, '/observations?indicator=').empty
+
+
+def test_handle_matches_slice_artifact(service):
+    served = get(service, '/forecasts?indicator=ACC_OWNERSHIP&scenario=baseline,optimistic&start=2026')
+    expected = slice_artifact(service.artifact, 'forecasts', ['ACC_OWNERSHIP'],
+                              ['baseline', 'optimistic'], start=2026)
+    pd.testing.assert_frame_equal(served, expected, check_categorical=False)
+
+
+def test_client_sends_empty_lists_and_omits_none(client, service):
+    assert client.history(indicators=[]).empty
+    assert client.observations(indicators=[]).empty
+    assert client.forecasts(scenarios=[]).empty
+    assert len(client.history()) == len(service.artifact['history'])
+    observed = client.observations(indicators=['USG_DIGITAL_PAYMENT'], start='2015-01-01')
+    assert observed['value_numeric'].tolist() == [10.0, 20.0]
+    assert client.manifest()['indicators'] == ['ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT']
+
+
+def test_unknown_routes_and_methods(service):
+    assert service.handle('GET', '/nope')[0] == 404
+    assert service.handle('DELETE', '/history')[0] == 405
+
+
+def test_client_closes_a_connection_that_timed_out():
+    # Accepts connections but never answers
+    with socket.socket() as listener:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen()
+        client = QueryClient(f'http://127.0.0.1:{listener.getsockname()[1]}', timeout=0.2)
+        opened = []
+        connection = client._connection
+
+        def tracked_connection():
+            opened.append(connection())
+            return opened[-1]
+
+        client._connection = tracked_connection
+        with pytest.raises(TimeoutError):
+            client.manifest()
+    assert len(opened) == 1 and opened[0].sock is None
+    assert client._pool.empty()
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.reconciliation import ALL, HierarchicalForecaster, reconcile, summing_matrix
+
+LEAVES = pd.DataFrame({'region': ['A', 'A', 'B', 'B'], 'gender': ['Male', 'Female'] * 2})
+LEVELS = [(), ('region',)]
+
+
+def hierarchy_data(national=None):
+    years = [2014, 2017, 2021, 2024]
+    rng = np.random.default_rng(0)
+    data = LEAVES.loc[LEAVES.index.repeat(len(years))].reset_index(drop=True)
+    data['year'] = np.tile(years, len(LEAVES))
+    data['value_numeric'] = (10 + (data['year'] - 2014) * np.repeat([1.0, 2.0, 3.0, 4.0], len(years))
+                             + rng.normal(0, 0.5, len(data)))
+    data['adults'] = np.repeat([100.0, 300.0, 200.0, 200.0], len(years))
+    if national is not None:
+        data = pd.concat([data, pd.DataFrame({'region': ALL, 'gender': ALL, 'year': years,
+                                              'value_numeric': national})], ignore_index=True)
+    return data
+
+
+def test_summing_matrix_sums_leaves_into_every_level():
+    S, nodes = summing_matrix(LEAVES, LEVELS)
+    assert nodes['level'].tolist() == ['total', 'region', 'region'] + ['bottom'] * 4
+    assert nodes.loc[0, ['region', 'gender']].tolist() == [ALL, ALL]
+    np.testing.assert_array_equal(S.toarray(), [[1, 1, 1, 1], [1, 1, 0, 0], [0, 0, 1, 1],
+                                                [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+
+
+def test_weighted_summing_matrix_averages_percentages():
+    S, _ = summing_matrix(LEAVES, LEVELS, weights=[100, 300, 200, 200])
+    np.testing.assert_allclose(S.toarray()[:3], [[0.125, 0.375, 0.25, 0.25],
+                                                 [0.25, 0.75, 0, 0], [0, 0, 0.5, 0.5]])
+    np.testing.assert_allclose(S.sum(axis=1).A1[:3], 1.0)
+
+
+@pytest.mark.parametrize('method', ['bottom_up', 'top_down', 'mint'])
+def test_reconciled_forecasts_are_coherent(method):
+    S, _ = summing_matrix(LEAVES, LEVELS)
+    base = np.random.default_rng(1).uniform(10, 50, (S.shape[0], 3))
+    reconciled = reconcile(base, S, method, proportions=np.full(4, 0.25))
+    np.testing.assert_allclose(reconciled[:3], S[:3] @ reconciled[3:])
+    if method == 'bottom_up':
+        np.testing.assert_allclose(reconciled[3:], base[3:])
+
+
+def test_mint_matches_the_dense_projection():
+    S, _ = summing_matrix(LEAVES, LEVELS)
+    base = np.random.default_rng(2).uniform(10, 50, (S.shape[0], 2))
+    variances = np.random.default_rng(3).uniform(0.5, 2.0, S.shape[0])
+    dense = S.toarray()
+    W_inv = np.diag(1 / variances)
+    expected = dense @ np.linalg.solve(dense.T @ W_inv @ dense, dense.T @ W_inv @ base)
+    np.testing.assert_allclose(reconcile(base, S, 'mint', variances), expected)
+
+
+def test_coherent_base_forecasts_are_unchanged():
+    S, _ = summing_matrix(LEAVES, LEVELS)
+    base = S @ np.array([[10.0], [20.0], [30.0], [40.0]])
+    np.testing.assert_allclose(reconcile(base, S, 'mint'), base)
+
+
+def test_reconcile_rejects_unknown_methods_and_missing_proportions():
+    S, _ = summing_matrix(LEAVES, LEVELS)
+    base = np.ones((S.shape[0], 1))
+    with pytest.raises(ValueError):
+        reconcile(base, S, 'middle_out')
+    with pytest.raises(ValueError, match='proportions'):
+        reconcile(base, S, 'top_down')
+
+
+@pytest.mark.parametrize('method', ['bottom_up', 'top_down', 'mint'])
+def test_hierarchical_forecaster_is_coherent_with_weighted_leaves(method):
+    model = HierarchicalForecaster(['region', 'gender'], LEVELS, weight_col='adults')
+    model.fit(hierarchy_data(), time_col='year')
+    result = model.forecast([2025, 2026], method=method)
+    for year, rows in result.groupby('year'):
+        leaves = rows[rows['level'] == 'bottom']['reconciled'].to_numpy()
+        np.testing.assert_allclose(rows['reconciled'].to_numpy()[:3], model.S[:3] @ leaves)
+
+
+def test_direct_national_observations_replace_the_aggregated_total():
+    national = [14.0, 22.0, 35.0, 46.0]
+    model = HierarchicalForecaster(['region', 'gender'], LEVELS, weight_col='adults')
+    model.fit(hierarchy_data(national), time_col='year')
+    total = model.forecast([2025], method='mint')
+    slope, intercept = np.polyfit([2014, 2017, 2021, 2024], national, 1)
+    assert total.loc[0, 'base'] == pytest.approx(intercept + slope * 2025)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from benchmarks import synthetic
+from src.forecasting import FinancialInclusionForecaster
+from src.simulation import SCENARIO_QUANTILES, ScenarioSimulator, simulate_scenarios
+
+YEARS = [2025, 2026, 2027]
+
+
+@pytest.fixture(scope='module')
+def setup():
+    data = synthetic.dataset(n_series=50, n_years=10, n_events=10)
+    forecaster = FinancialInclusionForecaster()
+    forecaster.fit_batch(synthetic.observations(data))
+    model = synthetic.impact_model(data)
+    return forecaster, model, list(model.events)
+
+
+def test_chunks_do_not_depend_on_chunk_order_or_jobs(setup):
+    simulator = ScenarioSimulator(*setup, YEARS)
+    serial = simulator.simulate(600, chunk_size=200)
+    pooled = simulator.simulate(600, chunk_size=200, n_jobs=2)
+    np.testing.assert_array_equal(serial, pooled)
+
+
+def test_streamed_summary_matches_exact_quantiles(setup):
+    simulator = ScenarioSimulator(*setup, YEARS)
+    exact = simulator.summarize(simulator.simulate(3000, chunk_size=500))
+    streamed = simulator.summarize_chunks(simulator.iter_chunks(3000, chunk_size=500))
+    cols = ['p10', 'p50', 'p90']
+    spread = (exact['p90'] - exact['p10']).to_numpy()[:, None]
+    error = np.abs(exact[cols].to_numpy() - streamed[cols].to_numpy())
+    assert (error <= 0.01 * spread + 1e-6).all()
+
+
+def test_simulate_scenarios_streams_without_full_array(setup, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("simulate_scenarios should not materialize every path")
+
+    monkeypatch.setattr(ScenarioSimulator, 'simulate', fail)
+    summary = simulate_scenarios(*setup, YEARS, n_paths=1000, chunk_size=250)
+    assert list(summary.columns[-3:]) == list(SCENARIO_QUANTILES)
+    assert len(summary) == 50 * len(YEARS)
+    assert (summary['pessimistic'] <= summary['baseline']).all()
+    assert (summary['baseline'] <= summary['optimistic']).all()
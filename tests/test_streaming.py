@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.streaming import AGGREGATIONS, aggregate_yearly, iter_unified_chunks
+
+
+@pytest.fixture(scope='module')
+def records():
+    rng = np.random.default_rng(0)
+    n = 240
+    values = rng.integers(0, 400, n) / 4.0
+    values[rng.random(n) < 0.1] = np.nan
+    dates = [f'{year}-{month:02d}-28' for year, month in zip(rng.integers(2015, 2025, n),
+                                                             rng.integers(1, 13, n))]
+    dates[5] = 'not a date'
+    return pd.DataFrame({
+        'record_type': rng.choice(['observation', 'observation', 'event', 'target'], n),
+        'pillar': rng.choice(['access', 'usage', 'infrastructure'], n),
+        'indicator': 'Indicator',
+        'indicator_code': rng.choice(['ACC_OWNERSHIP', 'USG_DIGITAL_PAYMENT', 'INF_4G_COVERAGE'], n),
+        'value_numeric': values,
+        'observation_date': dates,
+    })
+
+
+@pytest.fixture(scope='module')
+def path(records, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('streaming') / 'unified.csv')
+    records.to_csv(path, index=False)
+    return path
+
+
+def single_pass(records, agg, group_cols=('indicator_code',), **filters):
+    data = records[records['record_type'] == 'observation']
+    for col, value in filters.items():
+        data = data[data[col] == value]
+    dates = pd.to_datetime(data['observation_date'], errors='coerce')
+    data = data.assign(year=dates.dt.year, value_numeric=data['value_numeric'].astype('float32'))
+    data = data[data['value_numeric'].notna() & data['year'].notna()]
+    grouped = data.groupby(list(group_cols) + ['year'])['value_numeric']
+    return pd.DataFrame({'value_numeric': grouped.agg(agg).astype(float),
+                         'n_obs': grouped.count()}).reset_index()
+
+
+@pytest.mark.parametrize('agg', AGGREGATIONS)
+def test_chunked_aggregates_match_a_single_pass(records, path, agg):
+    # 17 rows per chunk, so every series-year spans chunk boundaries
+    chunked = aggregate_yearly(path, agg=agg, group_cols=('indicator_code', 'pillar'), chunksize=17)
+    expected = single_pass(records, agg, group_cols=('indicator_code', 'pillar'))
+    pd.testing.assert_frame_equal(chunked, expected, check_dtype=False, check_exact=False)
+
+
+def test_filters_and_date_bounds(records, path):
+    chunks = list(iter_unified_chunks(path, chunksize=25, record_type='observation',
+                                      pillar=['access', 'usage'], start='2018-01-01',
+                                      end='2020-12-31'))
+    assert len(chunks) > 1
+    streamed = pd.concat(chunks)
+    dates = pd.to_datetime(records['observation_date'], errors='coerce')
+    expected = records[(records['record_type'] == 'observation')
+                       & records['pillar'].isin(['access', 'usage'])
+                       & (dates >= '2018-01-01') & (dates <= '2020-12-31')]
+    assert streamed.index.tolist() == expected.index.tolist()
+    assert streamed['observation_date'].between('2018-01-01', '2020-12-31').all()
+
+    yearly = aggregate_yearly(path, chunksize=25, indicator_code='ACC_OWNERSHIP', pillar='access')
+    pd.testing.assert_frame_equal(
+        yearly, single_pass(records, 'mean', indicator_code='ACC_OWNERSHIP', pillar='access'),
+        check_dtype=False, check_exact=False)
+
+
+def test_usecols_keep_the_filter_columns(path):
+    chunk = next(iter_unified_chunks(path, usecols=['value_numeric'], pillar='usage'))
+    assert set(chunk.columns) == {'value_numeric', 'pillar', 'observation_date'}
+
+
+def test_no_matching_rows_give_an_empty_frame(path):
+    assert list(iter_unified_chunks(path, chunksize=50, indicator_code='MISSING')) == []
+    empty = aggregate_yearly(path, chunksize=50, indicator_code='MISSING')
+    assert empty.empty
+    assert list(empty.columns) == ['indicator_code', 'year', 'value_numeric', 'n_obs']
+    with pytest.raises(ValueError, match='median'):
+        aggregate_yearly(path, agg='median')
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from dashboard.view_cache import ViewCache
+
+
+def builder(calls, value):
+    def build():
+        calls.append(value)
+        return value
+    return build
+
+
+def test_same_view_and_state_hit_the_cache():
+    cache, calls = ViewCache(), []
+    first = cache.get_or_build('trends', builder(calls, 1), scenario='Baseline',
+                               year_range=[2025, 2027], indicators=['Account Ownership'])
+    again = cache.get_or_build('trends', builder(calls, 2), scenario='Baseline',
+                               year_range=(2025, 2027), indicators=('Account Ownership',))
+    assert (first, again, calls) == (1, 1, [1])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Another view, widget state or data version is a miss
+    assert cache.get_or_build('forecasts', builder(calls, 3), scenario='Baseline',
+                              year_range=[2025, 2027], indicators=['Account Ownership']) == 3
+    assert cache.get_or_build('trends', builder(calls, 4), scenario='Optimistic',
+                              year_range=[2025, 2027], indicators=['Account Ownership']) == 4
+    cache.sync('v2')
+    assert cache.get_or_build('trends', builder(calls, 5), scenario='Baseline',
+                              year_range=[2025, 2027], indicators=['Account Ownership']) == 5
+    assert calls == [1, 3, 4, 5]
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache, calls = ViewCache(maxsize=2), []
+    cache.get_or_build('a', builder(calls, 'a'))
+    cache.get_or_build('b', builder(calls, 'b'))
+    cache.get_or_build('a', builder(calls, 'a'))
+    cache.get_or_build('c', builder(calls, 'c'))
+    # 'b' was least recently used when 'c' came in
+    cache.get_or_build('a', builder(calls, 'a'))
+    cache.get_or_build('b', builder(calls, 'b'))
+    assert calls == ['a', 'b', 'c', 'b']
+
+
+def test_sync_only_invalidates_on_a_new_version():
+    cache, calls = ViewCache(), []
+    cache.sync('v1')
+    cache.get_or_build('a', builder(calls, 1))
+    cache.sync('v1')
+    cache.get_or_build('a', builder(calls, 1))
+    assert calls == [1]
+    cache.invalidate()
+    cache.get_or_build('a', builder(calls, 1))
+    assert calls == [1, 1]
+
+
+def test_frames_are_copied_out_of_the_cache():
+    cache = ViewCache()
+    frame = cache.frame('history', lambda: pd.DataFrame({'Year': [2024], 'value': [49.0]}))
+    frame.loc[0, 'value'] = 0.0
+    assert cache.frame('history', lambda: None).loc[0, 'value'] == 49.0